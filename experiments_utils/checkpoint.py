@@ -0,0 +1,268 @@
+"""Contains incremental checkpoints of long running steps state. Only parts of the state
+changed since the previous checkpoint are written, in a background thread, so that steps
+could checkpoint often without slowing down their inner loop.
+"""
+from __future__ import annotations
+
+import hashlib
+import pickle
+import re
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import Logger
+from typing import Any, Dict, List, Set, Tuple
+
+import cloudpickle
+
+from . import conf
+from .storage.backends import StoreBackend, create_backend
+
+CHECKPOINT_PREFIX: str = '__checkpoint__'
+_MANIFEST_NAME: str = 'manifest'
+# parts are named by digests of their content
+_PART_PATTERN: re.Pattern = re.compile(r'[0-9a-f]{32}')
+
+_DICT: str = 'dict'
+_VALUE: str = 'value'
+_ARRAY: str = 'array'
+_OBJECT: str = 'object'
+
+
+def _digest(data) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _is_array(value: Any) -> bool:
+    # numpy is imported by experiment code if arrays are used at all
+    np = sys.modules.get('numpy')
+    return np is not None and isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+
+def _split_array(array, chunk_bytes: int) -> List[memoryview]:
+    data = memoryview(array.reshape(-1).view('uint8')) if array.flags.c_contiguous \
+        else memoryview(array.copy(order='C').reshape(-1).view('uint8'))
+    return [data[start:start + chunk_bytes] for start in range(0, max(len(data), 1), chunk_bytes)]
+
+
+def _join_array(chunks: List[bytes], dtype: Any, shape: Tuple[int, ...]):
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    array = np.empty(shape, dtype=dtype)
+    data = array.reshape(-1).view('uint8')
+    offset: int = 0
+    for chunk in chunks:
+        data[offset:offset + len(chunk)] = np.frombuffer(chunk, dtype='uint8')
+        offset += len(chunk)
+    return array
+
+
+class StepCheckpoint:
+    """Checkpoint of step state for current paramset, returned by `Step.checkpoint()`.
+    State could be a dict (each of its values is diffed separately), numpy array (diffed
+    in chunks of `STEP_CHECKPOINT_CHUNK_BYTES` bytes) or any other picklable value
+    (written whole when changed). Arrays are diffed in chunks also as dict values.
+
+    Checkpoint saved by the last failed run of the step is restored automatically and
+    available as `state`. It is removed when step finishes successfully.
+
+    Example:
+    ```python
+    @step()
+    def train(epochs: int):
+        checkpoint = train.checkpoint(every_seconds=60)
+        state = checkpoint.state or {'epoch': 0, 'weights': np.zeros((1000, 1000))}
+        for epoch in range(state['epoch'], epochs):
+            state['weights'] += gradient_step(state['weights'])
+            state['epoch'] = epoch + 1
+            checkpoint.save(state)
+        return state['weights']
+    ```
+    """
+
+    def __init__(
+        self,
+        store_path: str,
+        step_name: str,
+        every_seconds: float = None,
+        every_iterations: int = None,
+        logger: Logger = None
+    ) -> None:
+        """
+        Args:
+            store_path (str): paramset store directory (`_cache/{version}/{paramset}`)
+            step_name (str): step name
+            every_seconds (float, optional): minimal time between checkpoints. Defaults to None.
+            every_iterations (int, optional): number of `save()` calls between checkpoints.
+                Defaults to None. If neither is set, checkpoint is saved on every `save()` call
+                (unless previous one is still being written).
+            logger (Logger, optional): step logger. Defaults to None.
+        """
+        self.step_name: str = step_name
+        self.every_seconds: float = every_seconds
+        self.every_iterations: int = every_iterations
+        self._prefix: str = f'{CHECKPOINT_PREFIX}{step_name}__'
+        self._logger: Logger = logger
+        self._backend: StoreBackend = create_backend(store_path)
+        self._executor: ThreadPoolExecutor = None
+        self._future: Future = None
+        # parts referenced by the last written manifest
+        self._parts: Set[str] = set()
+        self._state: Any = None
+        self._restored: bool = False
+        self.iteration: int = 0
+        self._saved_iteration: int = 0
+        self._saved_time: float = time.monotonic()
+        self._restore()
+
+    @property
+    def state(self) -> Any:
+        """State restored from the checkpoint of previous run, None if there was no checkpoint"""
+        return self._state
+
+    @property
+    def restored(self) -> bool:
+        return self._restored
+
+    def _part_name(self, digest: str) -> str:
+        return f'{self._prefix}{digest}'
+
+    def _is_own_name(self, name: str) -> bool:
+        # step names may contain separator, so checkpoint of step "train" must not match
+        # variables of step "train__x" which share its prefix
+        if not name.startswith(self._prefix):
+            return False
+        suffix: str = name[len(self._prefix):]
+        return suffix == _MANIFEST_NAME or _PART_PATTERN.fullmatch(suffix) is not None
+
+    def _restore(self):
+        try:
+            manifest: dict = self._backend.load(f'{self._prefix}{_MANIFEST_NAME}')
+        except KeyError:
+            return
+        try:
+            entries: List[Tuple[Any, Any]] = [
+                (key, self._load_entry(entry)) for key, entry in manifest['entries']
+            ]
+        except KeyError as error:
+            if self._logger is not None:
+                self._logger.warning(f'Checkpoint of step "{self.step_name}" is incomplete, missing part {error}')
+            return
+        self._state = dict(entries) if manifest['kind'] == _DICT else entries[0][1]
+        self._restored = True
+        self._parts = {digest for _, entry in manifest['entries'] for digest in entry['parts']}
+        self.iteration = self._saved_iteration = manifest['iteration']
+        if self._logger is not None:
+            self._logger.info(f'Restored checkpoint of step "{self.step_name}" from iteration {self.iteration}')
+
+    def _load_entry(self, entry: dict) -> Any:
+        chunks: List[bytes] = [self._backend.load(self._part_name(digest)) for digest in entry['parts']]
+        if entry['kind'] == _ARRAY:
+            return _join_array(chunks, entry['dtype'], entry['shape'])
+        return pickle.loads(chunks[0])
+
+    def _diff_entry(self, value: Any, changed: Dict[str, bytes]) -> dict:
+        """Returns manifest entry of value, adding parts not written yet to `changed`"""
+        if _is_array(value):
+            digests: List[str] = []
+            for chunk in _split_array(value, conf.settings.STEP_CHECKPOINT_CHUNK_BYTES):
+                digest: str = _digest(chunk)
+                digests.append(digest)
+                if digest not in self._parts and digest not in changed:
+                    # copy chunk, as array may be modified before it's written
+                    changed[digest] = bytes(chunk)
+            return {'kind': _ARRAY, 'dtype': value.dtype, 'shape': value.shape, 'parts': digests}
+        data: bytes = cloudpickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        digest: str = _digest(data)
+        if digest not in self._parts:
+            changed[digest] = data
+        return {'kind': _OBJECT, 'parts': [digest]}
+
+    def _is_due(self) -> bool:
+        if self.every_iterations is None and self.every_seconds is None:
+            return True
+        if self.every_iterations is not None and self.iteration - self._saved_iteration >= self.every_iterations:
+            return True
+        return self.every_seconds is not None and time.monotonic() - self._saved_time >= self.every_seconds
+
+    def save(self, state: Any, force: bool = False) -> bool:
+        """Counts iteration and checkpoints state if it's due. Changed parts are captured
+        synchronously and written in background, so state could be modified right after
+        this call. If previous checkpoint is still being written, checkpoint is postponed
+        to the next call (unless `force` is set).
+
+        Args:
+            state (Any): current step state
+            force (bool, optional): whether to checkpoint regardless of cadence. Defaults to False.
+
+        Returns:
+            bool: whether checkpoint was made
+        """
+        self.iteration += 1
+        if not force and (not self._is_due() or self._is_writing()):
+            return False
+        self.wait()
+        changed: Dict[str, bytes] = {}
+        if isinstance(state, dict):
+            kind: str = _DICT
+            entries = [(key, self._diff_entry(value, changed)) for key, value in state.items()]
+        else:
+            kind = _VALUE
+            entries = [(None, self._diff_entry(state, changed))]
+        manifest: dict = {
+            'kind': kind,
+            'entries': entries,
+            'iteration': self.iteration,
+            'saved_ts': time.time(),
+        }
+        self._saved_iteration = self.iteration
+        self._saved_time = time.monotonic()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='step_checkpoint')
+        self._future = self._executor.submit(self._write, manifest, changed)
+        return True
+
+    def _is_writing(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def _write(self, manifest: dict, changed: Dict[str, bytes]):
+        parts: Set[str] = {digest for _, entry in manifest['entries'] for digest in entry['parts']}
+        try:
+            for digest, data in changed.items():
+                self._backend.save(self._part_name(digest), data)
+            # manifest is written last, so previous checkpoint stays valid until all parts are written
+            self._backend.save(f'{self._prefix}{_MANIFEST_NAME}', manifest)
+        except Exception as error:
+            if self._logger is not None:
+                self._logger.warning(f'Failed to write checkpoint of step "{self.step_name}": {error}')
+            return
+        for digest in self._parts - parts:
+            self._delete(self._part_name(digest))
+        self._parts = parts
+
+    def _delete(self, name: str):
+        try:
+            self._backend.delete(name)
+        except KeyError:
+            pass
+
+    def wait(self):
+        """Waits until checkpoint being written is saved"""
+        if self._future is not None:
+            self._future.result()
+            self._future = None
+
+    def clear(self):
+        """Removes checkpoint, including parts left by interrupted writes"""
+        self.wait()
+        for name in self._backend.list():
+            if self._is_own_name(name):
+                self._delete(name)
+        self._parts = set()
+
+    def close(self):
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._backend.close()
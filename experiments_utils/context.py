@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import threading
 from copy import deepcopy
 from logging import Logger
-from typing import Dict, List
+from typing import Any, Dict, List
 
 from experiments_utils.events.emitter import EventEmitter
 from experiments_utils.plugin import Plugin
 
+# paramsets running in threads of the same process have their own contexts and emitters
+_thread_local = threading.local()
+
 
 class ExperimentContext:
     """Class storing basic information about experiment run context like paramset name
@@ -36,6 +40,7 @@ class ExperimentContext:
         self.logger: Logger = deepcopy(logger)
         self._logs_handlers = logger.handlers
         self._plugins: Dict[str, Plugin] = plugins
+        self._worker_state: Any = None
 
     @property
     def name(self) -> str:
@@ -61,6 +66,33 @@ class ExperimentContext:
     def plugins(self) -> Dict[str, Plugin]:
         return self._plugins
 
+    @property
+    def worker_state(self) -> Any:
+        """Value returned by experiment `worker_setup` function in current worker"""
+        return self._worker_state
+
     @staticmethod
     def get_instance() -> ExperimentContext:
-        return ExperimentContext.__GLOBAL_CONTEXT__
+        """Returns context of paramset running in current thread or, outside of paramsets,
+        global experiment context
+        """
+        context: ExperimentContext = getattr(_thread_local, 'context', None)
+        return context if context is not None else ExperimentContext.__GLOBAL_CONTEXT__
+
+    @staticmethod
+    def set_instance(context: ExperimentContext):
+        """Sets context of paramset running in current thread"""
+        _thread_local.context = context
+        ExperimentContext.__GLOBAL_CONTEXT__ = context
+
+    @staticmethod
+    def set_event_emitter(event_emitter: EventEmitter):
+        """Sets emitter of paramset running in current thread"""
+        _thread_local.event_emitter = event_emitter
+        ExperimentContext.__EVENT_EMITTER__ = event_emitter
+
+    @staticmethod
+    def get_event_emitter() -> EventEmitter:
+        """Returns emitter of paramset running in current thread"""
+        event_emitter: EventEmitter = getattr(_thread_local, 'event_emitter', None)
+        return event_emitter if event_emitter is not None else ExperimentContext.__EVENT_EMITTER__
@@ -1,15 +1,69 @@
+import threading
 from multiprocess.queues import Queue
 from .event_types import EventTypes
 from .events import ExperimentEvent, ExperimentParamSetEvent, ExperimentStepEvent, _BaseEvent
-from typing import Union
+from typing import FrozenSet, List, Union
 
 
 class EventEmitter:
-    """Class for emitting different experiment events
+    """Class for emitting different experiment events.
+
+    Events may be buffered and sent to listeners in batches. Buffer is flushed when it
+    reaches `batch_size` events, after `flush_interval` seconds since the first buffered
+    event or when `flush` is called explicitly (e.g. on paramset end). Events emitted by
+    single emitter are always delivered in the order they were emitted.
     """
 
-    def __init__(self, event_queue: Queue) -> None:
+    def __init__(
+        self,
+        event_queue: Queue,
+        batch_size: int = 1,
+        flush_interval: float = None,
+        subscribed_event_types: FrozenSet[str] = None
+    ) -> None:
+        """
+        Args:
+            event_queue (Queue): queue to which events are sent
+            batch_size (int, optional): max number of buffered events. Defaults to 1 (no buffering).
+            flush_interval (float, optional): max time in seconds events could stay buffered.
+                Defaults to None (no time limit).
+            subscribed_event_types (FrozenSet[str], optional): types of events that should
+                be sent, other events are skipped. Defaults to None (all events are sent).
+        """
         self._event_queue: Queue = event_queue
+        self._batch_size: int = batch_size
+        self._flush_interval: float = flush_interval
+        self._subscribed_event_types: FrozenSet[str] = subscribed_event_types
+        self._buffer: List[_BaseEvent] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._flush_timer: threading.Timer = None
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state['_buffer'] = []
+        state['_lock'] = None
+        state['_flush_timer'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def is_subscribed(self, event_type: Union[str, EventTypes]) -> bool:
+        """Checks if events of given type should be emitted. Could be used to avoid
+        creating events nobody listens to.
+
+        Args:
+            event_type (Union[str, EventTypes]): event type
+
+        Returns:
+            bool: whether events of given type are sent to listeners
+        """
+        if self._subscribed_event_types is None:
+            return True
+        if isinstance(event_type, EventTypes):
+            event_type = event_type.value
+        return event_type in self._subscribed_event_types
 
     def emit_event(
         self,
@@ -21,4 +75,32 @@ class EventEmitter:
         Args:
             event (Union[ExperimentEvent, ExperimentParamSetEvent, ExperimentStepEvent]): event
         """
-        self._event_queue.put_nowait(event)
+        if not self.is_subscribed(event.event_type):
+            return
+        if self._batch_size <= 1:
+            self._event_queue.put_nowait(event)
+            return
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) >= self._batch_size:
+                self._flush()
+            elif self._flush_timer is None and self._flush_interval is not None:
+                self._flush_timer = threading.Timer(self._flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Sends all buffered events to listeners.
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if len(self._buffer) == 0:
+            return
+        # whole batch is sent as a single queue item
+        self._event_queue.put_nowait(self._buffer)
+        self._buffer = []
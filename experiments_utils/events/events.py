@@ -1,29 +1,94 @@
+import time
 from datetime import datetime
-from typing import Any
+from typing import Any, Dict, Tuple, Union
 from .event_types import EventTypes
 from .. import conf
 
+# built-in event types are stored (and pickled) as integer codes,
+# dynamically named ones (e.g. `${step_name}__STEP_START`) as strings
+_EVENT_TYPES: Tuple[str, ...] = tuple(event_type.value for event_type in EventTypes)
+_EVENT_TYPES_CODES: Dict[str, int] = {
+    event_type: code for code, event_type in enumerate(_EVENT_TYPES)
+}
+
+_last_timestamp_ns: int = 0
+_events_slots: Dict[type, Tuple[str, ...]] = {}
+
+
+def _monotonic_time_ns() -> int:
+    """Returns current epoch time in nanoseconds, guaranteed to be increasing
+    within a process even if the system clock goes backwards."""
+    global _last_timestamp_ns  # pylint: disable=global-statement
+    now: int = time.time_ns()
+    if now <= _last_timestamp_ns:
+        now = _last_timestamp_ns + 1
+    _last_timestamp_ns = now
+    return now
+
+
+def _get_event_slots(event_class: type) -> Tuple[str, ...]:
+    if event_class not in _events_slots:
+        slots: list = []
+        for base in reversed(event_class.__mro__):
+            for slot in base.__dict__.get('__slots__', ()):
+                if slot not in slots and slot != '_datetime':
+                    slots.append(slot)
+        _events_slots[event_class] = tuple(slots)
+    return _events_slots[event_class]
+
+
+def _restore_event(event_class: type, values: tuple):
+    event = event_class.__new__(event_class)
+    for slot, value in zip(_get_event_slots(event_class), values):
+        object.__setattr__(event, slot, value)
+    event._datetime = None
+    return event
+
 
 class _BaseEvent:
 
+    __slots__ = ('_event_type', '_timestamp_ns', '_datetime')
+
     def __init__(self, event_type: str) -> None:
-        self._timestamp: datetime = datetime.now(
-            tz=conf.settings.EXPERIMENT_TIMEZONE)
-        self._event_type: str = event_type
+        self._timestamp_ns: int = _monotonic_time_ns()
+        self._datetime: datetime = None
+        self._event_type: Union[int, str] = _EVENT_TYPES_CODES.get(event_type, event_type)
+
+    def __reduce__(self):
+        # pickles only slots values (without their names) to keep events compact
+        values: tuple = tuple(getattr(self, slot) for slot in _get_event_slots(self.__class__))
+        # attributes of subclasses not declaring `__slots__` are kept in their `__dict__`
+        state: dict = getattr(self, '__dict__', None)
+        if state:
+            return (_restore_event, (self.__class__, values), state)
+        return (_restore_event, (self.__class__, values))
 
     @property
     def event_type(self) -> str:
-        return self._event_type
+        event_type: Union[int, str] = self._event_type
+        return _EVENT_TYPES[event_type] if event_type.__class__ is int else event_type
+
+    @property
+    def timestamp_ns(self) -> int:
+        """Event epoch time in nanoseconds"""
+        return self._timestamp_ns
 
     @property
     def timestamp(self) -> datetime:
-        return self._timestamp
+        # timezone aware datetime is created lazily only when some listener needs it
+        if self._datetime is None:
+            self._datetime = datetime.fromtimestamp(
+                self._timestamp_ns / 1e9, tz=conf.settings.EXPERIMENT_TIMEZONE)
+        return self._datetime
 
 
 class ErrorEvent:
-    """Base class for error events
+    """Base class for error events. Classes using it must declare
+    `_exception` and `_stack_trace` slots.
     """
 
+    __slots__ = ()
+
     def __init__(self, exception: Exception, stack_trace: str) -> None:
         self._exception: Exception = exception
         self._stack_trace: str = stack_trace
@@ -41,6 +106,8 @@ class ExperimentEvent(_BaseEvent):
     """Base class for experiment events
     """
 
+    __slots__ = ('_experiment_name',)
+
     def __init__(
         self,
         event_type,
@@ -58,6 +125,8 @@ class ExperimentParamSetEvent(ExperimentEvent):
     """Base class for events connected with given experiment paramset
     """
 
+    __slots__ = ('_paramset_name',)
+
     def __init__(
         self,
         event_type: str,
@@ -76,6 +145,8 @@ class ExperimentStepEvent(ExperimentParamSetEvent):
     """Base class for events connected with given experiment step and paramset
     """
 
+    __slots__ = ('_step_name',)
+
     def __init__(
         self,
         event_type: str,
@@ -96,6 +167,8 @@ class ExperimentStepEvent(ExperimentParamSetEvent):
 
 class ExperimentStartEvent(ExperimentEvent):
 
+    __slots__ = ()
+
     def __init__(
             self,
             experiment_name: str,
@@ -106,6 +179,8 @@ class ExperimentStartEvent(ExperimentEvent):
 
 class ExperimentEndEvent(ExperimentEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -116,6 +191,8 @@ class ExperimentEndEvent(ExperimentEvent):
 
 class ExperimentSuccessEvent(ExperimentEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -126,6 +203,8 @@ class ExperimentSuccessEvent(ExperimentEvent):
 
 class ParamsetStartEvent(ExperimentParamSetEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -137,6 +216,8 @@ class ParamsetStartEvent(ExperimentParamSetEvent):
 
 class ParamsetEndEvent(ExperimentParamSetEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -149,6 +230,8 @@ class ParamsetEndEvent(ExperimentParamSetEvent):
 
 class ParamsetSuccessEvent(ExperimentParamSetEvent):
 
+    __slots__ = ('result',)
+
     def __init__(
         self,
         experiment_name: str,
@@ -163,6 +246,8 @@ class ParamsetSuccessEvent(ExperimentParamSetEvent):
 
 class ParamsetErrorEvent(ExperimentParamSetEvent, ErrorEvent):
 
+    __slots__ = ('_exception', '_stack_trace')
+
     def __init__(
         self,
         experiment_name: str,
@@ -178,6 +263,8 @@ class ParamsetErrorEvent(ExperimentParamSetEvent, ErrorEvent):
 
 class StepStartEvent(ExperimentStepEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -191,6 +278,8 @@ class StepStartEvent(ExperimentStepEvent):
 
 class StepEndEvent(ExperimentStepEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -204,6 +293,8 @@ class StepEndEvent(ExperimentStepEvent):
 
 class StepSuccessEvent(ExperimentStepEvent):
 
+    __slots__ = ()
+
     def __init__(
         self,
         experiment_name: str,
@@ -217,6 +308,8 @@ class StepSuccessEvent(ExperimentStepEvent):
 
 class StepErrorEvent(ExperimentStepEvent, ErrorEvent):
 
+    __slots__ = ('_exception', '_stack_trace')
+
     def __init__(
         self,
         experiment_name: str,
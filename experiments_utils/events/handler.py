@@ -1,16 +1,66 @@
+import asyncio
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from multiprocess.queues import Queue
 from .event_types import EventTypes
 from .events import _BaseEvent, ExperimentEndEvent, ExperimentSuccessEvent, ParamsetSuccessEvent
-from typing import Any, Callable, Dict, List, Union
+from .journal import EventJournal
+from .. import conf
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Union
+
+
+class _OffloadedListener:
+    """Listener running on the handler threads pool instead of the main events loop.
+    Events are passed to wrapped listener one by one in the order they were handled.
+    """
+
+    def __init__(self, handler: 'EventHandler', listener: Callable[[_BaseEvent], None]) -> None:
+        self._handler: EventHandler = handler
+        self._listener: Callable[[_BaseEvent], None] = listener
+        if inspect.iscoroutinefunction(listener):
+            self._listener = lambda event: asyncio.run(listener(event))
+        self._events: Deque[_BaseEvent] = deque()
+        self._lock: threading.Lock = threading.Lock()
+        self._scheduled: bool = False
+
+    def __call__(self, event: _BaseEvent):
+        with self._lock:
+            self._events.append(event)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._handler._get_listeners_executor().submit(self._drain)
+
+    def _drain(self):
+        # at most one drain per listener is scheduled at a time which preserves events order
+        while True:
+            with self._lock:
+                if len(self._events) == 0:
+                    self._scheduled = False
+                    return
+                event: _BaseEvent = self._events.popleft()
+            self._handler._call_listener(event, self._listener)
 
 
 class EventHandler:
 
+    # events needed by the handler itself, no matter if anyone listens to them
+    REQUIRED_EVENT_TYPES: FrozenSet[str] = frozenset([
+        EventTypes.EXPERIMENT_PARAMSET_END.value,
+        EventTypes.EXPERIMENT_PARAMSET_SUCCESS.value,
+        EventTypes.EXPERIMENT_PARAMSET_ERROR.value,
+    ])
+
     def __init__(self, logger: Logger) -> None:
         self._logger: Logger = logger
         self._results: Dict[str, Any] = {}
         self._event_queue: Queue = None
+        self.journal: EventJournal = None
+        self._listeners_executor: ThreadPoolExecutor = None
+        self._offloaded_listeners: Dict[Callable, _OffloadedListener] = {}
         self._event_listeners: Dict[str, List[Callable]] = {
             event_type.value: [] for event_type in EventTypes
         }
@@ -23,30 +73,72 @@ class EventHandler:
     def event_queue(self, queue: Queue):
         self._event_queue = queue
 
-    def add_event_listener(self, event_type: Union[str, EventTypes], handler: Callable[[_BaseEvent], None]):
+    def add_event_listener(
+        self,
+        event_type: Union[str, EventTypes],
+        handler: Callable[[_BaseEvent], None],
+        offload: bool = False
+    ):
         """Adds event listener
 
         Args:
             event_type (EventTypes): event type
             handler (Callable): listener handler function
+            offload (bool, optional): if True, listener will be run on a separate threads pool
+                (one event at a time, in order) so that it won't block handling other events.
+                The same function offloaded for several event types receives all of them
+                in order. Async listeners are always offloaded. Defaults to False.
         """
         if isinstance(event_type, EventTypes):
             event_type = event_type.value
         if event_type not in self._event_listeners:
             self._event_listeners[event_type] = []
+        if offload or inspect.iscoroutinefunction(handler):
+            if handler not in self._offloaded_listeners:
+                self._offloaded_listeners[handler] = _OffloadedListener(self, handler)
+            handler = self._offloaded_listeners[handler]
         self._event_listeners[event_type].append(handler)
 
-    def on_event(self, event_type: EventTypes):
+    def get_subscribed_event_types(self) -> FrozenSet[str]:
+        """Returns types of events that have any listeners or are required by the handler.
+
+        Returns:
+            FrozenSet[str]: event types or None if all events are listened to (or journaled)
+        """
+        if len(self._event_listeners.get('*', [])) > 0 or self.journal is not None:
+            return None
+        return frozenset([
+            event_type for event_type, listeners in self._event_listeners.items() if len(listeners) > 0
+        ]) | EventHandler.REQUIRED_EVENT_TYPES
+
+    def on_event(self, event_type: EventTypes, offload: bool = False):
         """Helper decorator to adding event listeners.
 
         Args:
             event_type (EventTypes): event type to listen for
+            offload (bool, optional): if True, listener will be run on a separate threads pool.
+                Defaults to False.
         """
         def wrapper(function):
-            self.add_event_listener(event_type, handler=function)
+            self.add_event_listener(event_type, handler=function, offload=offload)
             return function
         return wrapper
 
+    def _get_listeners_executor(self) -> ThreadPoolExecutor:
+        if self._listeners_executor is None:
+            self._listeners_executor = ThreadPoolExecutor(
+                max_workers=conf.settings.EVENTS_LISTENERS_THREADS,
+                thread_name_prefix='events_listener'
+            )
+        return self._listeners_executor
+
+    def wait_for_offloaded_listeners(self):
+        """Blocks until all offloaded listeners handle already received events.
+        """
+        if self._listeners_executor is not None:
+            self._listeners_executor.shutdown(wait=True)
+            self._listeners_executor = None
+
     def _call_listener(self, event: _BaseEvent, listener: Callable):
         try:
             listener(event)
@@ -56,6 +148,8 @@ class EventHandler:
             self._logger.exception(error, stack_info=True)
 
     def _handle_event(self, event: _BaseEvent = []):
+        if self.journal is not None:
+            self.journal.write(event)
         if event.event_type == EventTypes.EXPERIMENT_PARAMSET_SUCCESS.value:
             event: ParamsetSuccessEvent = event
             self._results[event.paramset_name] = event.result
@@ -69,13 +163,23 @@ class EventHandler:
         was_error: bool = False
         experiment_name: str = None
         while finished_paramsets_counter < paramsets_count:
-            event: _BaseEvent = self._event_queue.get()
-            experiment_name = event.experiment_name
-            self._handle_event(event)
-            if event.event_type == EventTypes.EXPERIMENT_PARAMSET_END.value:
-                finished_paramsets_counter += 1
-            if event.event_type == EventTypes.EXPERIMENT_PARAMSET_ERROR.value:
-                was_error = True
+            item: Union[_BaseEvent, List[_BaseEvent]] = self._event_queue.get()
+            # emitters may send buffered events as a single batch
+            events: List[_BaseEvent] = item if isinstance(item, list) else [item]
+            for event in events:
+                experiment_name = event.experiment_name
+                self._handle_event(event)
+                if event.event_type == EventTypes.EXPERIMENT_PARAMSET_END.value:
+                    finished_paramsets_counter += 1
+                if event.event_type == EventTypes.EXPERIMENT_PARAMSET_ERROR.value:
+                    was_error = True
+        # handle events left in the queue, e.g. experiment start events when there were no paramsets to run
+        while not self._event_queue.empty():
+            item = self._event_queue.get_nowait()
+            for event in (item if isinstance(item, list) else [item]):
+                experiment_name = event.experiment_name
+                self._handle_event(event)
         if not was_error:
             self._handle_event(ExperimentSuccessEvent(experiment_name))
         self._handle_event(ExperimentEndEvent(experiment_name))
+        self.wait_for_offloaded_listeners()
@@ -0,0 +1,252 @@
+"""Contains append-only journal persisting all experiment events
+"""
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+from typing import Callable, Dict, Iterator, List, Union
+
+import cloudpickle
+
+from .event_types import EventTypes
+from .events import _BaseEvent
+
+
+DATA_FILE_NAME: str = 'events.journal'
+INDEX_FILE_NAME: str = 'events.index'
+NAMES_FILE_NAME: str = 'events.names'
+META_FILE_NAME: str = 'journal.json'
+
+# index record: data offset, data length, timestamp (ns), paramset id, step id, event type id
+_INDEX_RECORD: struct.Struct = struct.Struct('<QIqIII')
+
+
+class EventJournal:
+    """Append-only binary journal of experiment events. Each event is pickled to the
+    journal data file, while its offset together with paramset, step and event type
+    are written to a fixed-size records index, allowing to read only events of given
+    paramset or step without unpickling the whole journal.
+
+    Journal is written by experiment event handler when `EVENTS_JOURNAL_ENABLED`
+    setting is on and could be read later with `JournalReader`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        experiment_name: str,
+        experiment_version: str,
+        paramsets_names: List[str],
+        steps_names: List[str],
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._directory: str = directory
+        with open(os.path.join(directory, META_FILE_NAME), 'w', encoding='utf-8') as file:
+            json.dump({
+                'experiment_name': experiment_name,
+                'experiment_version': experiment_version,
+                'paramsets_names': paramsets_names,
+                'steps_names': steps_names,
+            }, file)
+        self._data_file = open(os.path.join(directory, DATA_FILE_NAME), 'ab')
+        self._index_file = open(os.path.join(directory, INDEX_FILE_NAME), 'ab')
+        self._names_file = open(os.path.join(directory, NAMES_FILE_NAME), 'a', encoding='utf-8')
+        self._offset: int = self._data_file.tell()
+        self._names_ids: Dict[str, int] = {
+            name: name_id for name_id, name in enumerate(_read_names(directory), start=1)
+        }
+
+    def _get_name_id(self, name: str) -> int:
+        if name is None:
+            return 0
+        if name not in self._names_ids:
+            self._names_ids[name] = len(self._names_ids) + 1
+            self._names_file.write(f'{json.dumps(name)}\n')
+        return self._names_ids[name]
+
+    def write(self, event: _BaseEvent):
+        """Appends event to the journal.
+
+        Args:
+            event (_BaseEvent): event
+        """
+        payload: bytes = cloudpickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        self._data_file.write(payload)
+        self._index_file.write(_INDEX_RECORD.pack(
+            self._offset,
+            len(payload),
+            event.timestamp_ns,
+            self._get_name_id(getattr(event, 'paramset_name', None)),
+            self._get_name_id(getattr(event, 'step_name', None)),
+            self._get_name_id(event.event_type),
+        ))
+        self._offset += len(payload)
+        if event.event_type == EventTypes.EXPERIMENT_PARAMSET_END.value:
+            self.flush()
+
+    def flush(self):
+        # names are flushed first so that index never references unknown names
+        self._names_file.flush()
+        self._data_file.flush()
+        self._index_file.flush()
+
+    def close(self):
+        self.flush()
+        self._names_file.close()
+        self._data_file.close()
+        self._index_file.close()
+
+
+def _read_names(directory: str) -> List[str]:
+    names_file_path: str = os.path.join(directory, NAMES_FILE_NAME)
+    if not os.path.exists(names_file_path):
+        return []
+    with open(names_file_path, 'r', encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def _map_file(file_path: str) -> Union[mmap.mmap, bytes]:
+    if os.path.getsize(file_path) == 0:
+        return b''
+    with open(file_path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class JournalReader:
+    """Reads events journal written during experiment run. Journal files are memory-mapped
+    and events are unpickled lazily, only when they match given filters.
+
+    Example:
+    ```python
+    from experiments_utils.events.journal import JournalReader
+
+    journal = JournalReader('./logs/17.10.2022_12.00.00v1.0.0/events')
+    for event in journal.events(paramset_name='iris.MyModel', step_name='train'):
+        print(event.event_type, event.timestamp)
+
+    state = journal.rebuild_state()
+    print(state.failed_paramsets)
+    ```
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._directory: str = directory
+        with open(os.path.join(directory, META_FILE_NAME), 'r', encoding='utf-8') as file:
+            self._meta: dict = json.load(file)
+        self._names: List[str] = _read_names(directory)
+        self._names_ids: Dict[str, int] = {
+            name: name_id for name_id, name in enumerate(self._names, start=1)
+        }
+        self._data = _map_file(os.path.join(directory, DATA_FILE_NAME))
+        self._index = _map_file(os.path.join(directory, INDEX_FILE_NAME))
+        # index may end with partially written record if experiment process was killed
+        self._records_count: int = len(self._index) // _INDEX_RECORD.size
+
+    @property
+    def experiment_name(self) -> str:
+        return self._meta['experiment_name']
+
+    @property
+    def experiment_version(self) -> str:
+        return self._meta['experiment_version']
+
+    @property
+    def paramsets_names(self) -> List[str]:
+        return self._meta['paramsets_names']
+
+    @property
+    def steps_names(self) -> List[str]:
+        return self._meta['steps_names']
+
+    def __len__(self) -> int:
+        return self._records_count
+
+    def _iter_records(self) -> Iterator[tuple]:
+        return _INDEX_RECORD.iter_unpack(
+            memoryview(self._index)[:self._records_count * _INDEX_RECORD.size]
+        )
+
+    def _resolve_filter(self, name: Union[str, EventTypes]) -> int:
+        if name is None:
+            return None
+        if isinstance(name, EventTypes):
+            name = name.value
+        # -1 never matches, so filtering by unknown name yields no events
+        return self._names_ids.get(name, -1)
+
+    def events(
+        self,
+        paramset_name: str = None,
+        step_name: str = None,
+        event_type: Union[str, EventTypes] = None,
+    ) -> Iterator[_BaseEvent]:
+        """Iterates over journal events in the order they were handled.
+
+        Args:
+            paramset_name (str, optional): return only events of given paramset. Defaults to None.
+            step_name (str, optional): return only events of given step. Defaults to None.
+            event_type (Union[str, EventTypes], optional): return only events of given type. Defaults to None.
+
+        Yields:
+            Iterator[_BaseEvent]: events
+        """
+        paramset_id: int = self._resolve_filter(paramset_name)
+        step_id: int = self._resolve_filter(step_name)
+        event_type_id: int = self._resolve_filter(event_type)
+        for offset, length, _, record_paramset_id, record_step_id, record_event_type_id in self._iter_records():
+            if paramset_id is not None and record_paramset_id != paramset_id:
+                continue
+            if step_id is not None and record_step_id != step_id:
+                continue
+            if event_type_id is not None and record_event_type_id != event_type_id:
+                continue
+            yield pickle.loads(self._data[offset:offset + length])
+
+    def replay(self, listener: Union[Callable[[_BaseEvent], None], object], **filters):
+        """Feeds journal events to given listener function or event handler.
+
+        Args:
+            listener (Union[Callable[[_BaseEvent], None], EventHandler]): listener function
+                or EventHandler instance (events are then dispatched to all its listeners)
+            filters: optional `events` method filters
+        """
+        handle: Callable[[_BaseEvent], None] = getattr(listener, '_handle_event', listener)
+        for event in self.events(**filters):
+            handle(event)
+
+    def rebuild_state(self):
+        """Rebuilds experiment state from journal events.
+
+        Returns:
+            ExperimentState: experiment state at the moment of the last journaled event
+        """
+        from ..state import (  # pylint: disable=import-outside-toplevel
+            ExperimentState, ExperimentStateManager)
+        from .handler import \
+            EventHandler  # pylint: disable=import-outside-toplevel
+
+        state = ExperimentState(
+            self.experiment_name,
+            self.experiment_version,
+            self.paramsets_names,
+            steps_names=self.steps_names
+        )
+        handler = EventHandler(logging.getLogger('journal'))
+        ExperimentStateManager(state).bootstrap(handler)
+        self.replay(handler)
+        return state
+
+    def close(self):
+        for mapped in (self._data, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+    def __enter__(self) -> JournalReader:
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
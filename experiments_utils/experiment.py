@@ -5,9 +5,8 @@ import logging
 import os
 from datetime import datetime
 from logging import Logger
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple, Union
 
-from multiprocess import Manager
 from multiprocess.queues import Queue
 
 from experiments_utils import conf
@@ -17,13 +16,17 @@ from experiments_utils.events.emitter import EventEmitter
 from experiments_utils.events.events import (ExperimentEndEvent,
                                              ExperimentStartEvent)
 from experiments_utils.events.handler import EventHandler
+from experiments_utils.events.journal import EventJournal
+from experiments_utils.ledger import RunLedger
 from experiments_utils.logs import (configure_experiment_logger,
                                     configure_logging, debugger_is_active,
                                     run_from_ipython)
 from experiments_utils.plugin import Plugin
+from experiments_utils.pool import WorkerPool
 from experiments_utils.remote_logging import (RemoteExperimentMonitor,
                                               RemoteLogsHandler)
 from experiments_utils.runner import Runner
+from experiments_utils.scheduling import CostEstimator, ScheduleModes
 from experiments_utils.state import ExperimentState, ExperimentStateManager
 
 
@@ -43,13 +46,21 @@ class Experiment:
         paramsets: List[Tuple[str, Dict[str, Any]]] = None,
         _file_: str = None,
         n_jobs: int = 4,
-        version: str = None
+        version: str = None,
+        schedule: Union[str, ScheduleModes] = ScheduleModes.DEFAULT,
+        cost_estimator: Union[CostEstimator, Callable[[str, Dict[str, Any]], float]] = None,
+        pool: WorkerPool = None,
+        resume: bool = False
     ) -> None:
         self.name: str = name
         self.paramsets: List[Tuple[str, Dict[str, Any]]] = paramsets
 
         self.n_jobs: int = n_jobs
         self.version: str = version
+        self.schedule: ScheduleModes = ScheduleModes(schedule)
+        self.cost_estimator: Union[CostEstimator, Callable[[str, Dict[str, Any]], float]] = cost_estimator
+        self.pool: WorkerPool = pool
+        self.resume: bool = resume
 
         self.results: Dict[str, Any]
 
@@ -60,6 +71,7 @@ class Experiment:
         self._file_: str = _file_
         self.dir_path: str = self._resolve_active_dir()
         self.function: Callable = function
+        self._worker_setup: Callable[[], Any] = None
 
         self.logs_dir: str = None
         self._logger: Logger = logging.getLogger(self.name)
@@ -67,6 +79,8 @@ class Experiment:
         self._logger.setLevel(logging.DEBUG)
         self._remote_monitor: RemoteExperimentMonitor = None
         self.state = None
+        self._state_manager: ExperimentStateManager = None
+        self._ledger: RunLedger = None
         self.plugins: Dict = {}
 
     @property
@@ -81,6 +95,38 @@ class Experiment:
                 f'Failed to add multiple plugins with same name: "{plugin.name}"'
             )
 
+    def worker_setup(self, function: Callable[[], Any]):
+        """Decorator registering function called once in each worker before it runs
+        its first paramset. Value returned by it is shared by all paramsets executed
+        by given worker and is available as `ExperimentContext.worker_state`.
+
+        Example:
+        ```python
+        @experiment(name='My Experiment', paramsets=PARAMSETS)
+        def my_experiment(dataset_name: str, model):
+            datasets = ExperimentContext.get_instance().worker_state
+            ...
+
+        @my_experiment.worker_setup
+        def load_datasets():
+            return {name: pd.read_csv(f'./datasets/{name}.csv') for name in DATASETS}
+        ```
+
+        Args:
+            function (Callable[[], Any]): setup function
+        """
+        self._worker_setup = function
+        return function
+
+    def attach_pool(self, pool: WorkerPool):
+        """Attaches long-lived workers pool which will be reused by all subsequent
+        experiment runs instead of creating a new one on each run.
+
+        Args:
+            pool (WorkerPool): workers pool
+        """
+        self.pool = pool
+
     def _resolve_active_dir(self) -> str:
         if run_from_ipython():
             # when running from ipython __file__ inspect stact won't return correct path
@@ -90,22 +136,27 @@ class Experiment:
             self. _file_ = inspect.stack()[2][1]
         return os.path.dirname(os.path.realpath(self._file_))
 
-    def on_event(self, event_type: EventTypes):
+    def on_event(self, event_type: EventTypes, offload: bool = False):
         """Helper decorator to adding event listeners.
 
         Args:
             event_type (EventTypes): event type to listen for
+            offload (bool, optional): if True, listener will be run on a separate threads pool
+                so that slow listeners (e.g. doing network calls) won't block handling other
+                events. Each listener still receives events one by one in order. Defaults to False.
         """
-        return self._event_handler.on_event(event_type)
+        return self._event_handler.on_event(event_type, offload=offload)
 
-    def add_event_listener(self, event_type: EventTypes, handler: Callable):
+    def add_event_listener(self, event_type: EventTypes, handler: Callable, offload: bool = False):
         """Adds event listener
 
         Args:
             event_type (EventTypes): event type
             handler (Callable): listener handler function
+            offload (bool, optional): if True, listener will be run on a separate threads pool.
+                Defaults to False.
         """
-        return self._event_handler.add_event_listener(event_type, handler)
+        return self._event_handler.add_event_listener(event_type, handler, offload=offload)
 
     def _initilize_experiment_logger(self):
         from experiments_utils import \
@@ -135,9 +186,18 @@ class Experiment:
                 'Forwarding experiment logs to remote server: ' +
                 f'"{settings.REMOTE_LOGGING_URL}" run_id = {self._remote_monitor._run_id}')
 
-    def run(self, paramsets: List[Tuple[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    def run(self, paramsets: List[Tuple[str, Dict[str, Any]]] = None, resume: bool = None) -> Dict[str, Any]:
         """Runs experiment
 
+        Args:
+            paramsets (List[Tuple[str, Dict[str, Any]]], optional): paramsets to run experiment with.
+                Default are paramsets passed to the decorator.
+            resume (bool, optional): if True, paramsets which already completed successfully in
+                previous runs of the same experiment version are skipped and their results are
+                loaded from cache. Only runs which were resumed themselves (or all runs if
+                `EXPERIMENT_RUN_LEDGER` setting is enabled) record finished paramsets.
+                Default is value passed to the decorator.
+
         Returns:
             Dict[str, Any]: Experiment results returned from each calling of experiment function group by dictionary
                 where paramset names are keys.
@@ -174,19 +234,30 @@ Alternatively:
                 ''')
         if paramsets is not None:
             self.paramsets = paramsets
+        if resume is None:
+            resume = self.resume
         self.state = ExperimentState(
             self.name, 
             self.version, 
             list(map(lambda e: e[0], self.paramsets))
         )
-        state_manager = ExperimentStateManager(self.state)
-        state_manager.bootstrap(experiment=self)
+        if self._state_manager is None:
+            self._state_manager = ExperimentStateManager(self.state)
+            self._state_manager.bootstrap(experiment=self)
+        else:
+            # experiment may be run multiple times (e.g. from notebook), state listeners
+            # are registered only once and just switched to the new state
+            self._state_manager._state = self.state  # pylint: disable=protected-access
+        self._event_handler._results = {}  # pylint: disable=protected-access
 
         from experiments_utils import \
             settings  # pylint: disable=import-outside-toplevel
         conf.settings = settings
         logging.basicConfig(level=self._logger.level)
         self._initilize_experiment_logger()
+        if self._ledger is None and (resume or conf.settings.EXPERIMENT_RUN_LEDGER):
+            self._ledger = RunLedger(self.dir_path, self.version, logger=self._logger)
+            self._ledger.bootstrap(experiment=self)
 
         ExperimentContext.__GLOBAL_CONTEXT__ = ExperimentContext(
             name=self.name,
@@ -198,9 +269,18 @@ Alternatively:
             logger=self._logger
         )
 
-        event_queue: Queue = Manager().Queue()
+        pool: WorkerPool = self.pool if self.pool is not None else WorkerPool(self.n_jobs)
+        event_queue: Queue = pool.manager.Queue()
         self._event_handler.event_queue = event_queue
         self._event_emitter = EventEmitter(event_queue=event_queue)
+        if conf.settings.EVENTS_JOURNAL_ENABLED and self.logs_dir is not None:
+            self._event_handler.journal = EventJournal(
+                f'{self.logs_dir}/events',
+                experiment_name=self.name,
+                experiment_version=self.version,
+                paramsets_names=self.state.paramsets_names,
+                steps_names=self.state.steps_names
+            )
 
         self._initialize_remote_logger()
 
@@ -214,7 +294,7 @@ Alternatively:
         try:
             self._logger.debug(
                 f'Starting experiment "{self.name}" v{self.version} (n_paramsets: {len(self.paramsets)})')
-            runner.run(experiment=self)
+            runner.run(experiment=self, pool=pool, resume=resume)
         except KeyboardInterrupt:
             if self._remote_monitor is not None:
                 self._remote_monitor._mark_experiment_as_killed()  # pylint: disable=protected-access
@@ -223,6 +303,11 @@ Alternatively:
             self.results = self._event_handler._results  # pylint: disable=protected-access
             if self._remote_monitor is not None:
                 self._remote_monitor.terminate()
+            if pool is not self.pool:
+                pool.close()
+            if self._event_handler.journal is not None:
+                self._event_handler.journal.close()
+                self._event_handler.journal = None
             ExperimentContext.__GLOBAL_CONTEXT__ = None
         return self.results
 
@@ -236,6 +321,10 @@ def experiment(
     n_jobs: int = 4,
     version: str = None,
     plugins: List[Plugin] = [],
+    schedule: Union[str, ScheduleModes] = ScheduleModes.DEFAULT,
+    cost_estimator: Union[CostEstimator, Callable[[str, Dict[str, Any]], float]] = None,
+    pool: WorkerPool = None,
+    resume: bool = False,
 ):
     """Decorator for experiment functions
 
@@ -245,6 +334,15 @@ def experiment(
         _file_ (str) optional __file__ variable from experiment main file. It will be automatically detected.
         max_threads (int) max number of threard, Default 8
         version (str) version string, Default is None
+        schedule (Union[str, ScheduleModes]) paramsets scheduling mode, Default is ScheduleModes.DEFAULT
+        cost_estimator (Union[CostEstimator, Callable[[str, Dict[str, Any]], float]]) paramsets cost
+            estimator used by ScheduleModes.LONGEST_FIRST mode. It could be either CostEstimator instance
+            or function returning cost for given paramset name and params. Default are execution times
+            recorded during earlier runs.
+        pool (WorkerPool) long-lived workers pool reused between experiment runs. By default
+            each run creates its own pool of n_jobs workers.
+        resume (bool) whether to skip paramsets already completed successfully in previous runs
+            of the same experiment version, Default is False
     """
     def wrapper(function):
         experiment_instance = Experiment(
@@ -253,6 +351,10 @@ def experiment(
             _file_=_file_,
             n_jobs=n_jobs,
             version=version,
+            schedule=schedule,
+            cost_estimator=cost_estimator,
+            pool=pool,
+            resume=resume,
 
             function=function
         )
@@ -0,0 +1,207 @@
+"""Contains helper utilities for sharing large arrays and dataframes between workers
+without copying them into each paramset
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from multiprocess.shared_memory import SharedMemory
+
+SHARED_MEMORY: str = 'shared_memory'
+MEMMAP: str = 'memmap'
+
+# arrays already attached in current process, so that each worker maps given
+# segment only once no matter how many paramsets use it
+_attached_arrays: Dict[str, Tuple[Any, np.ndarray]] = {}
+
+
+class SharedArray:
+    """Lightweight handle of numpy array published with `SharedData.share`. Pickling it
+    copies only array metadata, so it could be passed inside paramsets. Array itself is
+    reconstructed in workers as a read-only view with `get` method.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        dtype: np.dtype,
+        shm_name: str = None,
+        file_path: str = None
+    ) -> None:
+        self.shape: Tuple[int, ...] = shape
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.shm_name: str = shm_name
+        self.file_path: str = file_path
+
+    @property
+    def _key(self) -> str:
+        return self.shm_name if self.shm_name is not None else self.file_path
+
+    def get(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: read-only view of the shared array
+        """
+        if self._key in _attached_arrays:
+            return _attached_arrays[self._key][1]
+        if self.shm_name is not None:
+            shm = SharedMemory(name=self.shm_name, create=False)
+            array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        else:
+            shm = None
+            array = np.load(self.file_path, mmap_mode='r')
+        array.flags.writeable = False
+        _attached_arrays[self._key] = (shm, array)
+        return array
+
+    def __repr__(self) -> str:
+        return f'SharedArray(shape={self.shape}, dtype={self.dtype})'
+
+
+class SharedDataFrame:
+    """Lightweight handle of pandas DataFrame published with `SharedData.share`. Numeric
+    columns (and index) are shared as `SharedArray`, other columns are pickled together
+    with the handle.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[Any, Union[SharedArray, pd.Series]],
+        index: Union[SharedArray, pd.Index],
+        index_name: Any = None
+    ) -> None:
+        self.columns: Dict[Any, Union[SharedArray, pd.Series]] = columns
+        self.index: Union[SharedArray, pd.Index] = index
+        self.index_name: Any = index_name
+
+    def get(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: dataframe which numeric columns are read-only views of shared arrays
+        """
+        index = self.index.get() if isinstance(self.index, SharedArray) else self.index
+        index = pd.Index(index, name=self.index_name, copy=False)
+        return pd.DataFrame({
+            name: (
+                column.get() if isinstance(column, SharedArray) else column.array
+            ) for name, column in self.columns.items()
+        }, index=index, copy=False)
+
+    def __repr__(self) -> str:
+        return f'SharedDataFrame(columns={list(self.columns.keys())})'
+
+
+class SharedData:
+    """Publishes numpy arrays and pandas DataFrames once, either in shared memory or in
+    memory-mapped files, and returns lightweight handles to them. Handles could be passed
+    in paramsets instead of the data itself, so that workers do not hold private copies.
+    Published data is released on `close` (or when leaving `with` block).
+
+    Example:
+    ```python
+    from experiments_utils.helpers.shared_memory import SharedData, SharedDataFrame
+
+    @experiment(name='My Experiment')
+    def main(dataset: SharedDataFrame, model_name: str):
+        df: pd.DataFrame = dataset.get()
+        ...
+
+    if __name__ == '__main__':
+        with SharedData() as shared:
+            datasets = {name: shared.share(pd.read_csv(f'./datasets/{name}.csv')) for name in DATASETS}
+            main([
+                (f'{name}.{model_name}', {'dataset': datasets[name], 'model_name': model_name})
+                for name in DATASETS for model_name in MODELS
+            ])
+    ```
+    """
+
+    def __init__(self, backend: str = SHARED_MEMORY, directory: str = None) -> None:
+        """
+        Args:
+            backend (str, optional): either "shared_memory" or "memmap". Defaults to "shared_memory".
+            directory (str, optional): directory for memory-mapped files, used only with "memmap"
+                backend. Default is a new temporary directory.
+        """
+        if backend not in (SHARED_MEMORY, MEMMAP):
+            raise ValueError(f'Unknown shared data backend: "{backend}"')
+        self.backend: str = backend
+        self._directory: str = directory
+        self._temporary_directory: bool = directory is None
+        self._segments: List[SharedMemory] = []
+        self._files: List[str] = []
+
+    def share(self, value: Union[np.ndarray, pd.DataFrame]) -> Union[SharedArray, SharedDataFrame]:
+        """Publishes array or dataframe.
+
+        Args:
+            value (Union[np.ndarray, pd.DataFrame]): array or dataframe to share
+
+        Returns:
+            Union[SharedArray, SharedDataFrame]: handle to shared data
+        """
+        if isinstance(value, pd.DataFrame):
+            return self._share_dataframe(value)
+        if isinstance(value, np.ndarray):
+            return self._share_array(value)
+        raise TypeError(f'Only numpy arrays and pandas DataFrames could be shared, got: {type(value)}')
+
+    def _share_array(self, array: np.ndarray) -> SharedArray:
+        if array.dtype.hasobject:
+            raise TypeError('Arrays of python objects could not be shared')
+        if self.backend == MEMMAP:
+            if self._directory is None:
+                self._directory = tempfile.mkdtemp(prefix='experiments_utils_shared_')
+            os.makedirs(self._directory, exist_ok=True)
+            file_path: str = os.path.join(self._directory, f'{uuid.uuid4().hex}.npy')
+            np.save(file_path, array)
+            self._files.append(file_path)
+            return SharedArray(array.shape, array.dtype, file_path=file_path)
+        shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared_array[...] = array
+        del shared_array
+        self._segments.append(shm)
+        return SharedArray(array.shape, array.dtype, shm_name=shm.name)
+
+    def _share_dataframe(self, df: pd.DataFrame) -> SharedDataFrame:
+        def share_or_keep(values: Union[pd.Series, pd.Index]):
+            if isinstance(values, pd.RangeIndex):
+                return values
+            if isinstance(values.dtype, np.dtype) and not values.dtype.hasobject:
+                return self._share_array(values.to_numpy())
+            return values
+
+        return SharedDataFrame(
+            columns={name: share_or_keep(df[name]) for name in df.columns},
+            index=share_or_keep(df.index),
+            index_name=df.index.name
+        )
+
+    def close(self):
+        """Releases all published data. Handles must not be used afterwards.
+        """
+        for shm in self._segments:
+            _attached_arrays.pop(shm.name, None)
+            shm.close()
+            shm.unlink()
+        for file_path in self._files:
+            _attached_arrays.pop(file_path, None)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        self._segments = []
+        self._files = []
+        if self._temporary_directory and self._directory is not None:
+            os.rmdir(self._directory)
+            self._directory = None
+
+    def __enter__(self) -> SharedData:
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
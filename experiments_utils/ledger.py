@@ -0,0 +1,161 @@
+"""Contains durable ledger of paramsets runs allowing to resume interrupted experiments
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, List
+
+from . import conf
+from .events import EventTypes
+from .events.events import ParamsetErrorEvent, ParamsetSuccessEvent
+from .state import ExperimentState, ParamSetState, States
+from .storage.backends import StoreBackend, create_backend
+from .store import get_cache_dir
+
+
+class RunLedger:
+    """Append-only log of finished paramsets of given experiment version. It is stored in
+    `_cache/{version}/_ledger.jsonl` file and written incrementally as paramsets finish,
+    while results of successful paramsets are saved as `__result__` variable of their
+    stores. Only the last entry of each paramset
+    is taken into account, so a paramset which succeeded once and failed on rerun is not
+    considered completed anymore. Paramsets which results could not be pickled are recorded
+    as completed without result and are restored with None result.
+    """
+
+    FILE_NAME: str = '_ledger.jsonl'
+    RESULT_VARIABLE_NAME: str = '__result__'
+
+    def __init__(self, current_dir: str, version: str, logger: Logger = None) -> None:
+        self._version_dir_path: str = f'{get_cache_dir(current_dir)}/{version}'
+        self._file_path: str = f'{self._version_dir_path}/{RunLedger.FILE_NAME}'
+        self._logger: Logger = logger if logger is not None else logging.getLogger(__name__)
+
+    def _get_store_backend(self, paramset_name: str) -> StoreBackend:
+        return create_backend(f'{self._version_dir_path}/{paramset_name}')
+
+    def _append(self, entry: dict):
+        os.makedirs(self._version_dir_path, exist_ok=True)
+        with open(self._file_path, 'a', encoding='utf-8') as file:
+            file.write(f'{json.dumps(entry)}\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _record(self, paramset_state: ParamSetState, state: States, finished: datetime, has_result: bool = True):
+        self._append({
+            'paramset_name': paramset_state.name,
+            'state': state.value,
+            'started_ts': paramset_state.started.timestamp() if paramset_state.started is not None else None,
+            'finished_ts': finished.timestamp(),
+            'has_result': has_result,
+        })
+
+    def record_success(self, paramset_state: ParamSetState, event: ParamsetSuccessEvent):
+        """Saves paramset result and marks paramset as completed.
+
+        Args:
+            paramset_state (ParamSetState): paramset state
+            event (ParamsetSuccessEvent): paramset success event
+        """
+        backend: StoreBackend = self._get_store_backend(event.paramset_name)
+        has_result: bool = True
+        try:
+            backend.save(RunLedger.RESULT_VARIABLE_NAME, event.result)
+        except (pickle.PicklingError, TypeError, AttributeError) as ex:
+            self._logger.warning(
+                f'Result of paramset "{event.paramset_name}" could not be pickled, '
+                f'it is recorded as completed without result: {ex}')
+            has_result = False
+        finally:
+            backend.close()
+        # entry is appended only after result is saved, so completed paramset has its result
+        # unless entry says otherwise
+        self._record(paramset_state, States.SUCCESSFUL, event.timestamp, has_result=has_result)
+
+    def record_error(self, paramset_state: ParamSetState, event: ParamsetErrorEvent):
+        self._record(paramset_state, States.FAILED, event.timestamp)
+
+    def load(self) -> Dict[str, dict]:
+        """
+        Returns:
+            Dict[str, dict]: last ledger entry of each paramset
+        """
+        if not os.path.exists(self._file_path):
+            return {}
+        entries: Dict[str, dict] = {}
+        with open(self._file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry: dict = json.loads(line)
+                except json.JSONDecodeError:
+                    # last line may be partially written if experiment process was killed
+                    continue
+                entries[entry['paramset_name']] = entry
+        return entries
+
+    def completed_paramsets(self) -> Dict[str, dict]:
+        """
+        Returns:
+            Dict[str, dict]: ledger entries of paramsets completed successfully
+        """
+        completed: Dict[str, dict] = {}
+        for name, entry in self.load().items():
+            if entry['state'] != States.SUCCESSFUL.value:
+                continue
+            if not entry.get('has_result', True):
+                completed[name] = entry
+                continue
+            backend: StoreBackend = self._get_store_backend(name)
+            try:
+                if backend.exists(RunLedger.RESULT_VARIABLE_NAME):
+                    completed[name] = entry
+            finally:
+                backend.close()
+        return completed
+
+    def load_result(self, paramset_name: str) -> Any:
+        backend: StoreBackend = self._get_store_backend(paramset_name)
+        try:
+            return backend.load(RunLedger.RESULT_VARIABLE_NAME)
+        finally:
+            backend.close()
+
+    def restore(self, state: ExperimentState, paramsets_names: List[str]) -> Dict[str, Any]:
+        """Marks given paramsets as successful in experiment state according to their
+        ledger entries and loads their results.
+
+        Args:
+            state (ExperimentState): experiment state
+            paramsets_names (List[str]): names of completed paramsets
+
+        Returns:
+            Dict[str, Any]: results of given paramsets
+        """
+        entries: Dict[str, dict] = self.load()
+        results: Dict[str, Any] = {}
+        for paramset_name in paramsets_names:
+            entry: dict = entries[paramset_name]
+            paramset_state: ParamSetState = state.get_paramset_state(paramset_name)
+            if entry['started_ts'] is not None:
+                paramset_state._started = datetime.fromtimestamp(
+                    entry['started_ts'], tz=conf.settings.EXPERIMENT_TIMEZONE)
+            paramset_state._finished = datetime.fromtimestamp(
+                entry['finished_ts'], tz=conf.settings.EXPERIMENT_TIMEZONE)
+            paramset_state._state = States.SUCCESSFUL
+            state._finished_paramsets.append(paramset_name)
+            results[paramset_name] = self.load_result(paramset_name) if entry.get('has_result', True) else None
+        return results
+
+    def bootstrap(self, experiment):
+        @experiment.on_event(EventTypes.EXPERIMENT_PARAMSET_SUCCESS)
+        def _(event: ParamsetSuccessEvent):
+            self.record_success(experiment.state.get_paramset_state(event.paramset_name), event)
+
+        @experiment.on_event(EventTypes.EXPERIMENT_PARAMSET_ERROR)
+        def _(event: ParamsetErrorEvent):
+            self.record_error(experiment.state.get_paramset_state(event.paramset_name), event)
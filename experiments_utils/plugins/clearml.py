@@ -32,7 +32,7 @@ class ClearMLPlugin(Plugin):
 
     def experiment_initialize(self, experiment: Experiment):
 
-        @experiment.on_event(EventTypes.STEP_START)
+        @experiment.on_event(EventTypes.STEP_START, offload=True)
         def _(event: StepStartEvent):
             paramset_task = Task.get_task(
                 task_name=event.paramset_name, project_name=self.project_name
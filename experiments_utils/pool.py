@@ -0,0 +1,165 @@
+"""Contains long-lived pool of workers executing experiment paramsets
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List
+
+from multiprocess import Manager
+from multiprocess.pool import Pool
+from multiprocess.util import Finalize
+
+from .logs import run_from_ipython
+from .results.tables import flush_tables
+
+# thread local storage is separate for each pool thread and, as pool processes
+# run tasks in their main thread, also for each pool process
+_worker_local = threading.local()
+
+
+def get_worker_state(key: str, setup: Callable[[], Any]) -> Any:
+    """Returns value returned by setup function in current worker. Setup function
+    is called only on the first call for given key in each worker.
+
+    Args:
+        key (str): key identifying setup function
+        setup (Callable[[], Any]): setup function
+
+    Returns:
+        Any: value returned by setup function
+    """
+    states: Dict[str, Any] = getattr(_worker_local, 'states', None)
+    if states is None:
+        states = _worker_local.states = {}
+    if key not in states:
+        states[key] = setup()
+    return states[key]
+
+
+def _initialize_worker(initializers: List[Callable[[], None]]):
+    # atexit handlers are not called in worker processes, unlike multiprocessing finalizers
+    Finalize(None, flush_tables, exitpriority=10)
+    for initializer in initializers:
+        initializer()
+
+
+class _FuturesResult:
+
+    def __init__(self, futures: List[Future]) -> None:
+        self._futures: List[Future] = futures
+
+    def wait(self, timeout: float = None):
+        wait(self._futures, timeout=timeout)
+
+
+class WorkerPool:
+    """Pool of worker processes (or threads when running from Interactive Interpreter)
+    executing experiment paramsets. By default every experiment run creates and
+    terminates its own pool. A pool created explicitly can be attached to one or
+    more experiments and is then reused between their runs, so workers startup,
+    imports and event queue manager are paid only once.
+
+    Example:
+    ```python
+    from experiments_utils.pool import WorkerPool
+
+    pool = WorkerPool(n_jobs=8, initializers=[import_heavy_modules])
+
+    @experiment(name='My Experiment', paramsets=PARAMSETS, pool=pool)
+    def main(dataset_name: str, model):
+        ...
+
+    main()
+    main(OTHER_PARAMSETS)  # reuses already running workers
+    pool.close()
+    ```
+    """
+
+    def __init__(
+        self,
+        n_jobs: int = 4,
+        initializers: List[Callable[[], None]] = None,
+        use_threads: bool = None
+    ) -> None:
+        """
+        Args:
+            n_jobs (int, optional): number of workers. Defaults to 4.
+            initializers (List[Callable[[], None]], optional): functions called once in
+                each worker right after its start. Defaults to None.
+            use_threads (bool, optional): whether to use threads instead of processes.
+                Default is to use threads only when running from Interactive Interpreter.
+        """
+        self.n_jobs: int = n_jobs
+        self._initializers: List[Callable[[], None]] = list(initializers or [])
+        self._use_threads: bool = run_from_ipython() if use_threads is None else use_threads
+        self._pool: Any = None
+        self._manager: Any = None
+
+    @property
+    def use_threads(self) -> bool:
+        return self._use_threads
+
+    @property
+    def manager(self):
+        """Manager process shared by all runs using this pool"""
+        if self._manager is None:
+            self._manager = Manager()
+        return self._manager
+
+    def start(self):
+        """Starts workers. It's called automatically on first use of the pool.
+        """
+        if self._pool is not None:
+            return
+        if self._use_threads:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_initialize_worker,
+                initargs=(self._initializers,)
+            )
+        else:
+            self._pool = Pool(
+                self.n_jobs,
+                initializer=_initialize_worker,
+                initargs=(self._initializers,)
+            )
+
+    def map_async(self, function: Callable, iterable: Iterable, chunksize: int = None):
+        """Schedules calling function for each item of iterable without waiting
+        for results.
+
+        Args:
+            function (Callable): function to call
+            iterable (Iterable): function arguments
+            chunksize (int, optional): number of items sent to worker as a single task.
+                Ignored when using threads. Defaults to None.
+
+        Returns:
+            object with `wait()` method blocking until all items are processed
+        """
+        self.start()
+        if self._use_threads:
+            return _FuturesResult([self._pool.submit(function, item) for item in iterable])
+        return self._pool.map_async(function, iterable, chunksize=chunksize)
+
+    def close(self):
+        """Terminates workers and manager process.
+        """
+        if self._pool is not None:
+            if self._use_threads:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._pool.terminate()
+                self._pool.join()
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def __enter__(self) -> WorkerPool:
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
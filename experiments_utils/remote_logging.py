@@ -2,7 +2,7 @@ from ctypes import Union
 import logging
 import traceback
 from datetime import datetime
-from typing import Any, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
 from .state import ExperimentState, ParamSetState
 from .events.event_types import EventTypes
@@ -153,34 +153,45 @@ class RemoteExperimentMonitor:
     def bootstrap(self, experiment):
         self._experiment_state: ExperimentState = experiment.state
 
-        @experiment.on_event(EventTypes.EXPERIMENT_START)
-        def _(event: ExperimentStartEvent):
+        def on_experiment_start(event: ExperimentStartEvent):
             self._create_experiment()
 
-        @experiment.on_event(EventTypes.EXPERIMENT_PARAMSET_START)
-        def _(event: ParamsetEndEvent):
+        def on_paramset_start(event: ParamsetEndEvent):
             self._mark_experiment_as_started(
                 paramset_name=event.paramset_name)
 
-        @experiment.on_event(EventTypes.EXPERIMENT_PARAMSET_SUCCESS)
-        def _(event: ParamsetEndEvent):
+        def on_paramset_success(event: ParamsetEndEvent):
             self._mark_experiment_as_finished(
                 paramset_name=event.paramset_name)
 
-        @experiment.on_event(EventTypes.EXPERIMENT_PARAMSET_ERROR)
-        def _(event: ParamsetErrorEvent):
+        def on_paramset_error(event: ParamsetErrorEvent):
             self._mark_experiment_run_as_with_errors(
                 paramset_name=event.paramset_name,
                 error_message=str(event.exception),
                 stack_trace=event.stack_trace
             )
 
-        @experiment.on_event(EventTypes.STEP_END)
-        def _(event: StepEndEvent):
+        def on_step_end(event: StepEndEvent):
             self._log_step(
                 config_name=event.paramset_name
             )
 
+        listeners: Dict[str, Callable] = {
+            EventTypes.EXPERIMENT_START.value: on_experiment_start,
+            EventTypes.EXPERIMENT_PARAMSET_START.value: on_paramset_start,
+            EventTypes.EXPERIMENT_PARAMSET_SUCCESS.value: on_paramset_success,
+            EventTypes.EXPERIMENT_PARAMSET_ERROR.value: on_paramset_error,
+            EventTypes.STEP_END.value: on_step_end,
+        }
+
+        def dispatch(event):
+            listeners[event.event_type](event)
+
+        # requests to remote server are made off the events loop, a single offloaded listener
+        # for all event types keeps them in order (e.g. paramset is started before it's finished)
+        for event_type in listeners:
+            experiment.add_event_listener(event_type, dispatch, offload=True)
+
     def run(self):
         self._process.start()
 
@@ -0,0 +1,235 @@
+"""Contains storage formats of result tables. Binary formats keep columns dtypes
+(categoricals, nullable integers, timestamps) which are lost when table is saved as CSV.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_object_dtype
+
+CSV: str = 'csv'
+PARQUET: str = 'parquet'
+FEATHER: str = 'feather'
+NPZ: str = 'npz'
+AUTO: str = 'auto'
+
+
+class TableFormat:
+    """Base class for table file formats"""
+
+    name: str = None
+    extension: str = None
+    # whether rows could be appended to existing file without rewriting it
+    appendable: bool = False
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        raise NotImplementedError()
+
+    def write(self, df: pd.DataFrame, file_path: str):
+        raise NotImplementedError()
+
+    def read_dtypes(self, file_path: str) -> Dict[Any, Any]:
+        """Returns dtypes of file columns, formats storing schema read only the schema"""
+        return self.read(file_path).dtypes.to_dict()
+
+    def read_columns(self, file_path: str) -> List[str]:
+        """Returns names of file columns without reading its rows"""
+        return [str(column) for column in self.read_dtypes(file_path)]
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class CsvFormat(TableFormat):
+
+    name: str = CSV
+    extension: str = '.csv'
+    appendable: bool = True
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        try:
+            return pd.read_csv(file_path)
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame([])
+
+    def write(self, df: pd.DataFrame, file_path: str):
+        df.to_csv(file_path, index=False)
+
+    def read_columns(self, file_path: str) -> List[str]:
+        try:
+            return [str(column) for column in pd.read_csv(file_path, nrows=0).columns]
+        except pd.errors.EmptyDataError:
+            return []
+
+
+class ParquetFormat(TableFormat):
+    """Apache Parquet file, requires `pyarrow` package"""
+
+    name: str = PARQUET
+    extension: str = '.parquet'
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        return pd.read_parquet(file_path)
+
+    def write(self, df: pd.DataFrame, file_path: str):
+        df.to_parquet(file_path, index=False)
+
+    def read_dtypes(self, file_path: str) -> Dict[Any, Any]:
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        return pq.read_schema(file_path).empty_table().to_pandas().dtypes.to_dict()
+
+
+class FeatherFormat(TableFormat):
+    """Apache Arrow IPC (Feather) file, requires `pyarrow` package"""
+
+    name: str = FEATHER
+    extension: str = '.feather'
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        return pd.read_feather(file_path)
+
+    def write(self, df: pd.DataFrame, file_path: str):
+        df.reset_index(drop=True).to_feather(file_path)
+
+    def read_dtypes(self, file_path: str) -> Dict[Any, Any]:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        with pa.memory_map(file_path) as source:
+            return pa.ipc.open_file(source).schema.empty_table().to_pandas().dtypes.to_dict()
+
+
+def _to_numpy_strings(values: np.ndarray) -> np.ndarray:
+    """Converts object array of strings to fixed width unicode array, which is saved
+    without pickling.
+    """
+    if len(values) > 0 and all(isinstance(value, str) for value in values):
+        return values.astype(str)
+    return values
+
+
+class NpzFormat(TableFormat):
+    """Numpy `.npz` archive with array for each column, requires only numpy. Columns
+    of Python objects (other than strings) are pickled.
+    """
+
+    name: str = NPZ
+    extension: str = '.npz'
+
+    def write(self, df: pd.DataFrame, file_path: str):
+        arrays: Dict[str, np.ndarray] = {}
+        columns_meta: List[dict] = []
+        for i, column in enumerate(df.columns):
+            key: str = f'c{i}'
+            series: pd.Series = df.iloc[:, i]
+            meta: Dict[str, Any] = {'name': column, 'dtype': str(series.dtype)}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                meta.update(kind='category', ordered=bool(series.cat.ordered))
+                arrays[key] = series.cat.codes.to_numpy()
+                arrays[f'{key}_categories'] = _to_numpy_strings(series.cat.categories.to_numpy(dtype=object))
+            elif isinstance(series.dtype, pd.DatetimeTZDtype):
+                meta.update(kind='datetimetz', tz=str(series.dt.tz))
+                arrays[key] = series.dt.tz_convert(None).to_numpy()
+            elif isinstance(series.dtype, np.dtype) and not is_object_dtype(series.dtype):
+                meta.update(kind='numpy')
+                arrays[key] = series.to_numpy()
+            else:
+                # extension dtypes (nullable integers, strings...) and Python objects
+                mask: np.ndarray = series.isna().to_numpy()
+                numpy_dtype = getattr(series.dtype, 'numpy_dtype', None)
+                if numpy_dtype is not None and numpy_dtype != np.dtype(object):
+                    values: np.ndarray = series.to_numpy(dtype=numpy_dtype, na_value=numpy_dtype.type(0))
+                else:
+                    values = _to_numpy_strings(series.to_numpy(dtype=object, na_value=''))
+                meta.update(kind='object' if is_object_dtype(series.dtype) else 'masked')
+                arrays[key] = values
+                arrays[f'{key}_mask'] = mask
+            columns_meta.append(meta)
+        arrays['__meta__'] = np.array(json.dumps({'columns': columns_meta, 'rows': len(df)}))
+        # np.savez appends ".npz" to paths with other extension, so temporary file keeps it
+        tmp_file_path: str = f'{file_path[:-len(self.extension)]}.tmp{self.extension}'
+        np.savez(tmp_file_path, **arrays)
+        os.replace(tmp_file_path, file_path)
+
+    def read_dtypes(self, file_path: str) -> Dict[Any, Any]:
+        # archive members are loaded only when accessed
+        with np.load(file_path, allow_pickle=True) as archive:
+            meta: dict = json.loads(str(archive['__meta__']))
+        dtypes: Dict[Any, Any] = {}
+        for column_meta in meta['columns']:
+            try:
+                dtypes[column_meta['name']] = pd.api.types.pandas_dtype(column_meta['dtype'])
+            except TypeError:
+                dtypes[column_meta['name']] = np.dtype(object)
+        return dtypes
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        with np.load(file_path, allow_pickle=True) as archive:
+            meta: dict = json.loads(str(archive['__meta__']))
+            columns: Dict[Any, pd.Series] = {}
+            for i, column_meta in enumerate(meta['columns']):
+                key: str = f'c{i}'
+                kind: str = column_meta['kind']
+                if kind == 'category':
+                    series = pd.Series(pd.Categorical.from_codes(
+                        archive[key],
+                        categories=archive[f'{key}_categories'],
+                        ordered=column_meta['ordered']
+                    ))
+                elif kind == 'datetimetz':
+                    series = pd.Series(archive[key]).dt.tz_localize('UTC').dt.tz_convert(column_meta['tz'])
+                elif kind == 'numpy':
+                    series = pd.Series(archive[key])
+                else:
+                    values: np.ndarray = archive[key]
+                    mask: np.ndarray = archive[f'{key}_mask']
+                    if kind == 'object':
+                        values = values.astype(object)
+                        values[mask] = np.nan
+                        series = pd.Series(values, dtype=object)
+                    else:
+                        series = pd.Series(values).astype(column_meta['dtype']).mask(mask)
+                columns[column_meta['name']] = series
+        df = pd.DataFrame(columns, columns=[column_meta['name'] for column_meta in meta['columns']])
+        if len(df.columns) == 0:
+            df = pd.DataFrame(index=range(meta['rows']))
+        return df
+
+
+FORMATS: Dict[str, type] = {
+    CSV: CsvFormat,
+    PARQUET: ParquetFormat,
+    FEATHER: FeatherFormat,
+    NPZ: NpzFormat,
+}
+
+
+def get_format(table_format: Union[str, TableFormat]) -> TableFormat:
+    """
+    Args:
+        table_format (Union[str, TableFormat]): format name ("csv", "parquet", "feather", "npz"
+            or "auto" - parquet if `pyarrow` is installed, npz otherwise) or format instance
+
+    Returns:
+        TableFormat: table format
+    """
+    if isinstance(table_format, TableFormat):
+        return table_format
+    if table_format == AUTO:
+        table_format = PARQUET if importlib.util.find_spec('pyarrow') is not None else NPZ
+    if table_format not in FORMATS:
+        raise ValueError(f'Unknown table storage format: "{table_format}"')
+    return FORMATS[table_format]()
+
+
+def get_format_by_extension(file_path: str) -> TableFormat:
+    extension: str = os.path.splitext(file_path)[1]
+    for format_class in FORMATS.values():
+        if format_class.extension == extension:
+            return format_class()
+    raise ValueError(f'Unknown table file extension: "{extension}"')
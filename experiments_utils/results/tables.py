@@ -1,22 +1,56 @@
 from __future__ import annotations
 
+import atexit
+import csv
+import itertools
 import logging
 import os
+import socket
 import sys
+import threading
+import time
+from collections import Counter
 from glob import glob
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from pandas.api.types import is_numeric_dtype
 
+from .formats import CSV, TableFormat, get_format, get_format_by_extension
+
 
 class Tables:
 
     _directory: str = None
+    _append_batch_size: int = 1
+    _format: TableFormat = get_format(CSV)
+    _multi_writer: bool = False
 
     @staticmethod
-    def configure(directory: str) -> Table:
+    def configure(
+        directory: str,
+        append_batch_size: int = 1,
+        storage_format: Union[str, TableFormat] = CSV,
+        multi_writer: bool = False
+    ) -> Table:
+        """
+        Args:
+            directory (str): directory containing tables files
+            append_batch_size (int, optional): number of rows appended with `Table.append`
+                buffered in memory before they are written to table file. Buffered rows are
+                also written when experiment paramset finishes. Defaults to 1.
+            storage_format (Union[str, TableFormat], optional): tables files format: "csv",
+                "parquet", "feather" (both require `pyarrow` package), "npz" or "auto" (parquet
+                if `pyarrow` is installed, npz otherwise). Binary formats keep columns dtypes
+                and are much faster to load, but appended rows are written by rewriting
+                whole file, so larger `append_batch_size` should be used. Defaults to "csv".
+            multi_writer (bool, optional): if True, each batch of appended rows is written
+                to its own shard file (`{table}.shards/{hostname}-{pid}-{time}.csv`), so paramsets
+                running in parallel workers could append to the same table without locking.
+                Shards are merged when table is loaded and could be merged into table file
+                with `Table.compact`. Defaults to False.
+        """
         if not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
         elif not os.path.isdir(directory):
@@ -24,18 +58,24 @@ class Tables:
         elif len(os.listdir(directory)) != 0:
             logging.warn(f'Given tables directory: "{directory}" is not empty')
         Tables._directory = directory
+        Tables._append_batch_size = append_batch_size
+        Tables._format = get_format(storage_format)
+        Tables._multi_writer = multi_writer
 
     @staticmethod
     def get(*path) -> Table:
         path: List[str] = list(path)
-        path[-1] = f"{path[-1]}.csv"
+        path[-1] = f"{path[-1]}{Tables._format.extension}"
         table_file_path: str = os.path.join(Tables._directory, *path)
         return Table(table_file_path, False)
 
     @staticmethod
     def query(*path, as_pandas: pd.DataFrame = False) -> List[Table]:
+        """Returns tables matching given glob pattern. Tables are loaded on first access,
+        so they could be aggregated one at a time with `mean_aggregate_tables`.
+        """
         path: List[str] = list(path)
-        path[-1] = f"{path[-1]}.csv"
+        path[-1] = f"{path[-1]}{Tables._format.extension}"
         results_paths: List[str] = []
         pattern = os.path.join(Tables._directory, *path)
         results_paths += glob(pattern)
@@ -46,6 +86,11 @@ class Tables:
 
 
 class Table:
+    """Result table. Its data is loaded from file on first access and kept column-wise as
+    DataFrame, rows appended with `append` are merged into it lazily when the table is read.
+    Accessing `rows` switches table to list of dicts representation, which is converted back
+    on next read or save.
+    """
 
     def __init__(self, file_path: str, _called_explicilty: bool = True) -> None:
         if _called_explicilty:
@@ -55,36 +100,424 @@ class Table:
                 'using "get" or "query" method'
             )
         self._file_path: str = file_path
-        self.name: str = os.path.basename(self._file_path).replace(".csv", "")
-        self.rows: List[dict] = []
+        self._format: TableFormat = get_format_by_extension(file_path)
+        self.name: str = os.path.splitext(os.path.basename(self._file_path))[0]
+        self._df: pd.DataFrame = pd.DataFrame([])
+        # appended rows not merged into `_df` yet
+        self._unmerged_rows: List[dict] = []
+        # rows returned by `rows` property, which may be modified in place
+        self._rows: List[dict] = None
+        # dtypes of columns loaded from file or set with `set_df`, restored in `as_pandas`
+        self._dtypes: Dict[str, Any] = {}
+        # columns of table file header, None if header was not written yet
+        self._columns: List[str] = None
+        # appended rows not written to table file yet
+        self._pending_rows: List[dict] = []
+        self.append_batch_size: int = Tables._append_batch_size
+        self.multi_writer: bool = Tables._multi_writer
+        self._shards_dir: str = f'{os.path.splitext(self._file_path)[0]}.shards'
+        # shards whose rows are part of this table, removed when it's saved
+        self._merged_shards: List[str] = []
+        self._loaded: bool = True
+        # serializes appending and writing rows by threads sharing the table
+        self._lock: threading.RLock = threading.RLock()
         # create empty placeholder file
         if not os.path.exists(self._file_path):
             os.makedirs(os.path.dirname(self._file_path), exist_ok=True)
-            pd.DataFrame([]).to_csv(self._file_path, index=False)
+            self._write_atomic(pd.DataFrame([]), self._file_path)
         else:
+            self._loaded = False
+
+    def _get_shards_paths(self) -> List[str]:
+        # files being written have names starting with dot, so they are not matched
+        return sorted(glob(os.path.join(self._shards_dir, f'*{self._format.extension}')))
+
+    def _read_merged(self, shards_paths: List[str]) -> pd.DataFrame:
+        """Reads table file merged with given shards"""
+        frames: List[pd.DataFrame] = [self._format.read(self._file_path)]
+        frames += [self._format.read(shard_path) for shard_path in shards_paths]
+        frames = [frame for frame in frames if len(frame.columns) > 0]
+        if len(frames) == 0:
+            return pd.DataFrame([])
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def _write_atomic(self, df: pd.DataFrame, file_path: str):
+        directory, file_name = os.path.split(file_path)
+        # temporary file is unique, as the same file may be written by multiple processes
+        tmp_file_path: str = os.path.join(directory, f'.{os.getpid()}-{next(_shards_counter)}.{file_name}')
+        self._format.write(df, tmp_file_path)
+        os.replace(tmp_file_path, file_path)
+
+    def _hide_shards(self, shards_paths: List[str]) -> List[str]:
+        """Renames shards, so that they are not read anymore. Returns paths of shards which
+        were not removed in the meantime.
+        """
+        hidden_shards_paths: List[str] = []
+        for shard_path in shards_paths:
+            directory, file_name = os.path.split(shard_path)
+            hidden_shard_path: str = os.path.join(directory, f'.{file_name}.compacted')
+            try:
+                os.replace(shard_path, hidden_shard_path)
+            except FileNotFoundError:
+                continue
+            hidden_shards_paths.append(hidden_shard_path)
+        return hidden_shards_paths
+
+    def _ensure_loaded(self):
+        if not self._loaded:
             self._load()
 
+    def _flush_instances(self):
+        """Writes rows buffered by all instances of the same table, including this one"""
+        for table in _get_pending_tables():
+            if table._file_path == self._file_path:
+                table.flush()
+
+    def _read_files(self) -> Tuple[pd.DataFrame, List[str]]:
+        """Reads table file, in multi-writer mode merged with shards. Returns also paths
+        of merged shards.
+        """
+        if not self.multi_writer:
+            return self._format.read(self._file_path), []
+        while True:
+            shards_paths: List[str] = self._get_shards_paths()
+            try:
+                return self._read_merged(shards_paths), shards_paths
+            except FileNotFoundError:
+                # shards were compacted into table file after they were listed
+                continue
+
+    def _read_columns(self) -> List[str]:
+        """Reads columns of table file or, in multi-writer mode if it has no columns yet,
+        of its first shard, without reading their rows
+        """
+        columns: List[str] = self._format.read_columns(self._file_path)
+        if len(columns) > 0 or not self.multi_writer:
+            return columns
+        for shard_path in self._get_shards_paths():
+            try:
+                return self._format.read_columns(shard_path)
+            except FileNotFoundError:
+                # shard was compacted into table file after it was listed
+                return self._format.read_columns(self._file_path)
+        return []
+
     def _load(self):
-        try:
-            df: pd.DataFrame = pd.read_csv(self._file_path)
-            self.rows = df.to_dict("records")
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame([])
+        self._loaded = True
+        self._flush_instances()
+        df, self._merged_shards = self._read_files()
+        if len(df.columns) == 0:
+            return
+        self._df = df
+        self._dtypes = df.dtypes.to_dict()
+        self._columns = [str(column) for column in df.columns]
 
     def save(self):
-        self.as_pandas().to_csv(self._file_path, index=False)
+        """Rewrites whole table file with current rows. In multi-writer mode shards merged
+        into this table are removed, shards written by other writers after it was loaded
+        are kept and merged when table is loaded next time.
+        """
+        df: pd.DataFrame = self.as_pandas()
+        if self.multi_writer:
+            hidden_shards_paths: List[str] = self._hide_shards(self._merged_shards)
+            self._write_atomic(df, self._file_path)
+            for shard_path in hidden_shards_paths:
+                os.remove(shard_path)
+            self._merged_shards = []
+        else:
+            self._format.write(df, self._file_path)
+        self._columns = [str(column) for column in df.columns] if len(df.columns) > 0 else None
+        self._pending_rows = []
+
+    @property
+    def rows(self) -> List[dict]:
+        """Table rows as list of dicts. Changes made to returned list are visible in table
+        until it's read with `as_pandas` or saved, then it's converted back to columns.
+        """
+        if self._rows is None:
+            self._rows = self._consolidate().to_dict("records")
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows: List[dict]):
+        self._ensure_loaded()
+        self._rows = rows
+        self._unmerged_rows = []
+
+    def _restore_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Restores columns dtypes lost when rows were merged, unless it would change any
+        value (e.g. float appended to integer column), then column keeps widened dtype.
+        """
+        for column, dtype in self._dtypes.items():
+            if column not in df.columns or df[column].dtype == dtype:
+                continue
+            series: pd.Series = df[column]
+            candidates: List[Any] = [dtype]
+            if isinstance(dtype, np.dtype) and isinstance(series.dtype, np.dtype):
+                candidates.append(np.result_type(dtype, series.dtype))
+            for candidate in candidates:
+                if candidate == series.dtype:
+                    break
+                if isinstance(candidate, pd.CategoricalDtype) \
+                        and not series.dropna().isin(candidate.categories).all():
+                    # values missing in categories would be lost
+                    continue
+                try:
+                    restored: pd.Series = series.astype(candidate)
+                except (TypeError, ValueError, OverflowError):
+                    # appended values are not compatible with column dtype
+                    continue
+                if _is_lossless(series, restored):
+                    df[column] = restored
+                    break
+        return df
+
+    def _consolidate(self) -> pd.DataFrame:
+        """Merges rows modified or appended since last read into table columns"""
+        self._ensure_loaded()
+        if self._rows is not None:
+            self._df = self._restore_dtypes(pd.DataFrame(self._rows))
+            self._rows = None
+        elif len(self._unmerged_rows) > 0:
+            appended_df: pd.DataFrame = pd.DataFrame(self._unmerged_rows)
+            if len(self._df.columns) > 0:
+                appended_df = pd.concat([self._df, appended_df], ignore_index=True)
+            self._df = self._restore_dtypes(appended_df)
+        self._unmerged_rows = []
+        return self._df
 
     def set_df(self, df: pd.DataFrame):
-        self.rows = df.to_dict("records")
+        if not self._loaded:
+            # table content is replaced, so it's not read
+            self._loaded = True
+            self._flush_instances()
+            self._merged_shards = self._get_shards_paths() if self.multi_writer else []
+        self._df = df.reset_index(drop=True)
+        self._rows = None
+        self._unmerged_rows = []
+        self._dtypes = df.dtypes.to_dict()
         self.save()
 
+    def append(self, rows: Union[dict, List[dict]], flush: bool = None):
+        """Appends rows to the table. Only new rows are written to the end of table file,
+        in batches of `append_batch_size` rows, and only its header is read if the table
+        wasn't loaded before. Table header is written with the first batch
+        and rows of later batches must not have any other columns (missing ones are left empty).
+
+        Example:
+        ```python
+        table = Tables.get('iris', 'folds')
+        for fold in range(10):
+            table.append({'fold': fold, 'accuracy': evaluate(fold)})
+        table.flush()
+        ```
+
+        Args:
+            rows (Union[dict, List[dict]]): row or list of rows
+            flush (bool, optional): whether to write buffered rows regardless of batch size.
+                Defaults to None (rows are written once batch is full).
+
+        Raises:
+            ValueError: if rows have columns not present in table file
+        """
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        if not self._loaded and (self._format.appendable or self.multi_writer):
+            # rows are only written to the end of file (or to new shard), so it's not loaded
+            # until it's read and appended rows are read from file then
+            if self._columns is None and len(self._pending_rows) == 0:
+                # header may be written by other instances of the table first
+                self._flush_instances()
+                self._columns = self._read_columns() or None
+        else:
+            self._ensure_loaded()
+        with self._lock:
+            self._check_columns(rows)
+            if self._loaded and self._rows is not None:
+                self._rows.extend(rows)
+            elif self._loaded:
+                self._unmerged_rows.extend(rows)
+            if len(self._pending_rows) == 0 and len(rows) > 0:
+                _set_pending(self, True)
+            self._pending_rows.extend(rows)
+            if flush or (flush is None and len(self._pending_rows) >= self.append_batch_size):
+                self.flush()
+
+    def _check_columns(self, rows: List[dict]):
+        columns: List[str] = self._columns
+        if columns is None:
+            # header will be written with the first batch
+            return
+        known_columns = set(columns)
+        for row in rows:
+            unknown_columns: List[str] = [str(column) for column in row if str(column) not in known_columns]
+            if len(unknown_columns) > 0:
+                raise ValueError(
+                    f'Columns {unknown_columns} are not present in table "{self.name}" '
+                    f'having columns {columns}. Use "set_df" to change table columns'
+                )
+
+    @staticmethod
+    def _get_new_columns(rows: List[dict]) -> List[str]:
+        columns: Dict[str, None] = {}
+        for row in rows:
+            columns.update((str(column), None) for column in row)
+        return list(columns)
+
+    def flush(self):
+        """Writes rows appended since last flush to table file"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if len(self._pending_rows) == 0:
+            return
+        if self.multi_writer:
+            self._flush_shard()
+            return
+        if not self._format.appendable:
+            self.save()
+            _set_pending(self, False)
+            return
+        write_header: bool = self._columns is None
+        if write_header:
+            self._columns = self._get_new_columns(self._pending_rows)
+        # placeholder file of empty table is overwritten together with header
+        with open(self._file_path, 'w' if write_header else 'a', newline='', encoding='utf-8') as file:
+            self._write_csv_rows(file, write_header)
+        self._pending_rows = []
+        _set_pending(self, False)
+
+    def _write_csv_rows(self, file, write_header: bool):
+        writer = csv.DictWriter(file, fieldnames=self._columns, restval='', lineterminator=os.linesep)
+        if write_header:
+            writer.writeheader()
+        writer.writerows({str(column): value for column, value in row.items()} for row in self._pending_rows)
+
+    def _flush_shard(self):
+        os.makedirs(self._shards_dir, exist_ok=True)
+        if self._columns is None:
+            self._columns = self._get_new_columns(self._pending_rows)
+        # each batch is written to new shard, which is never modified, so it could be
+        # compacted at any time
+        shard_name: str = f'{socket.gethostname()}-{os.getpid()}-{time.time_ns():020d}-{next(_shards_counter)}'
+        shard_path: str = os.path.join(self._shards_dir, f'{shard_name}{self._format.extension}')
+        if self._format.appendable:
+            tmp_shard_path: str = os.path.join(self._shards_dir, f'.{shard_name}{self._format.extension}')
+            with open(tmp_shard_path, 'w', newline='', encoding='utf-8') as file:
+                self._write_csv_rows(file, write_header=True)
+            os.replace(tmp_shard_path, shard_path)
+        else:
+            self._write_atomic(self._restore_dtypes(pd.DataFrame(self._pending_rows)), shard_path)
+        self._merged_shards.append(shard_path)
+        self._pending_rows = []
+        _set_pending(self, False)
+
+    def compact(self):
+        """Rewrites table file from all rows, normalizing values formatting. Appending never
+        rewrites the file, so it's done only when requested.
+
+        In multi-writer mode table file is merged with all shards written so far, which are
+        removed afterwards. Shards are never modified after they are written and rows of
+        other writers are merged from files rather than taken from memory, so it's safe
+        to compact while they are running (rows they haven't flushed yet are written to
+        new shards). Table should be compacted (or saved) by one process at a time.
+        """
+        if not self.multi_writer:
+            self.save()
+            _set_pending(self, False)
+            return
+        self.flush()
+        shards_paths: List[str] = self._hide_shards(self._get_shards_paths())
+        df: pd.DataFrame = self._read_merged(shards_paths)
+        self._write_atomic(df, self._file_path)
+        for shard_path in shards_paths:
+            os.remove(shard_path)
+        self._merged_shards = []
+        self._loaded = True
+        if len(df.columns) > 0:
+            self._dtypes = {**df.dtypes.to_dict(), **self._dtypes}
+            self._df = self._restore_dtypes(df)
+            self._columns = [str(column) for column in df.columns]
+        self._rows = None
+        self._unmerged_rows = []
+
     def as_pandas(self) -> pd.DataFrame:
-        df: pd.DataFrame = pd.DataFrame(self.rows)
-        return df
+        """Returns shallow copy of table columns, data is never copied on read. With pandas
+        copy-on-write (always enabled since pandas 3.0) data is copied when modified, on older
+        pandas without copy-on-write returned frame must not be modified in place (use
+        `as_pandas().copy()` to modify it).
+        """
+        return self._consolidate().copy(deep=False)
 
     def as_numpy(self) -> np.ndarray:
         return self.as_pandas().to_numpy()
 
+    def _read_dtypes(self) -> List[Dict[Any, Any]]:
+        """Returns dtypes of loaded table columns or, if table is not loaded, of columns
+        of table file and each of its shards, reading only their schemas if possible.
+        """
+        if self._loaded:
+            return [self._consolidate().dtypes.to_dict()]
+        self._flush_instances()
+        files_paths: List[str] = [self._file_path] + (self._get_shards_paths() if self.multi_writer else [])
+        files_dtypes: List[Dict[Any, Any]] = []
+        for file_path in files_paths:
+            try:
+                files_dtypes.append(self._format.read_dtypes(file_path))
+            except FileNotFoundError:
+                # shard was compacted into table file after it was listed
+                continue
+        return [dtypes for dtypes in files_dtypes if len(dtypes) > 0]
+
+    def _read(self) -> pd.DataFrame:
+        """Returns table columns, without keeping them in memory if table is not loaded"""
+        if self._loaded:
+            return self.as_pandas()
+        self._flush_instances()
+        return self._read_files()[0]
+
+
+# tables are referenced until their rows are written, so rows of discarded instances aren't lost
+_tables_with_pending_rows: set = set()
+# guards set of tables with pending rows, which are appended and flushed by multiple threads
+_pending_tables_lock: threading.Lock = threading.Lock()
+# distinguishes files written by threads of current process at the same time
+_shards_counter: Iterator[int] = itertools.count()
+
+
+@atexit.register
+def flush_tables():
+    """Writes rows buffered by all tables of current process. It's called after each
+    paramset, when worker exits and at interpreter exit.
+    """
+    for table in _get_pending_tables():
+        table.flush()
+
+
+def _get_pending_tables() -> List[Table]:
+    with _pending_tables_lock:
+        return list(_tables_with_pending_rows)
+
+
+def _set_pending(table: Table, pending: bool):
+    with _pending_tables_lock:
+        if pending:
+            _tables_with_pending_rows.add(table)
+        else:
+            _tables_with_pending_rows.discard(table)
+
+
+def _is_lossless(series: pd.Series, restored: pd.Series) -> bool:
+    """Checks whether values of series are not changed by dtype cast"""
+    mask: np.ndarray = series.isna().to_numpy()
+    if not np.array_equal(mask, restored.isna().to_numpy()):
+        return False
+    try:
+        return bool(np.all(
+            series[~mask].to_numpy(dtype=object) == restored[~mask].to_numpy(dtype=object)))
+    except (TypeError, ValueError):
+        return False
+
 
 def concat_tables(tables: List[Table], result: Table):
     """Concatenate tables
@@ -98,7 +531,7 @@ def concat_tables(tables: List[Table], result: Table):
 
 
 def mean_aggregate_tables(
-    tables: List[Table],
+    tables: Iterable[Union[Table, str]],
     result: Table,
     cv_fold_column: str = None,
     add_std_columns: bool = False,
@@ -106,36 +539,125 @@ def mean_aggregate_tables(
     """Mean aggregate tables. For nominal columns, mode value is used as aggregated
     value
 
+    Tables are aggregated one at a time without concatenating them, keeping only running
+    sums and variances of numerical columns and values counts of nominal ones. Tables not
+    loaded yet (e.g. returned by `Tables.query`) or given by file paths are read twice,
+    first their columns dtypes and then their rows, and are not kept in memory.
+
     Args:
-        tables (List[Table]): tables
+        tables (Iterable[Union[Table, str]]): tables or paths of tables files
         result (Table): result table for storing aggregated data
         cv_fold_column (str, optional): optional name of the cv fold column to drop
             during aggregation. Defaults to None.
         add_std_columns (bool, optional): If true, it will add columns containing std
         for each numerical column named "${COLUMN_NAME} (std)". Defaults to False.
     """
-    df: pd.DataFrame = pd.concat([table.as_pandas() for table in tables])
-    result.set_df(df)
+    tables: List[Table] = [
+        Table(table, False) if isinstance(table, str) else table for table in tables
+    ]
+    # columns of tables concatenation, numerical unless any table has other dtype
+    columns: Dict[Any, _ColumnAggregator] = {}
+    files_columns: List[set] = []
+    for table in tables:
+        for dtypes in table._read_dtypes():
+            for column, dtype in dtypes.items():
+                if column not in columns:
+                    columns[column] = _ColumnAggregator()
+                columns[column].add_dtype(dtype)
+            files_columns.append(set(dtypes))
+    for column, aggregator in columns.items():
+        aggregator.finish_dtypes(all(column in file_columns for file_columns in files_columns))
 
-    df: pd.DataFrame = pd.concat([table.as_pandas() for table in tables])
-    df = df.reset_index(drop=True)
-
-    aggregate_dict = dict(
-        [
-            (
-                (col, "mean")
-                if is_numeric_dtype(df[col])
-                else (col, lambda col: col.mode()[0])
-            )
-            for col in df.columns
-        ]
-    )
-    if cv_fold_column:
-        del aggregate_dict[cv_fold_column]
-    agg_df = pd.DataFrame(df.aggregate(aggregate_dict)).T.reset_index(drop=True)
+    for table in tables:
+        df: pd.DataFrame = table._read()
+        for column in df.columns:
+            # columns of shards written after dtypes were read are skipped
+            if column in columns:
+                columns[column].update(df[column])
+        # frame is released before next table is read
+        del df
+
+    aggregated: Dict[Any, Any] = {
+        column: aggregator.aggregate() for column, aggregator in columns.items()
+        if column != cv_fold_column
+    }
+    agg_df = pd.DataFrame(pd.Series(aggregated)).T.reset_index(drop=True)
 
     if add_std_columns:
-        for numeric_col in df.select_dtypes(include=[np.number]):
-            agg_df[f"{str(numeric_col)} (std)"] = df[numeric_col].std()
+        for column, aggregator in columns.items():
+            if aggregator.kind == _ColumnAggregator.NUMBER:
+                agg_df[f"{str(column)} (std)"] = aggregator.std()
 
     result.set_df(agg_df)
+
+
+class _ColumnAggregator:
+    """Streaming aggregation of single column: mean and variance (Chan's parallel
+    variant of Welford's algorithm) of numerical columns or mode of nominal ones.
+    """
+
+    NUMBER: str = 'number'
+    BOOL: str = 'bool'
+    NOMINAL: str = 'nominal'
+
+    def __init__(self) -> None:
+        self._dtypes_kinds: set = set()
+        self.kind: str = None
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.values_counts: Counter = Counter()
+
+    def add_dtype(self, dtype: Any):
+        if not is_numeric_dtype(dtype):
+            self._dtypes_kinds.add(_ColumnAggregator.NOMINAL)
+        elif pd.api.types.is_bool_dtype(dtype):
+            self._dtypes_kinds.add(_ColumnAggregator.BOOL)
+        else:
+            self._dtypes_kinds.add(_ColumnAggregator.NUMBER)
+
+    def finish_dtypes(self, in_all_tables: bool):
+        """Determines column kind the same way as dtype of concatenated tables would be"""
+        if self._dtypes_kinds == {_ColumnAggregator.NUMBER}:
+            self.kind = _ColumnAggregator.NUMBER
+        elif self._dtypes_kinds == {_ColumnAggregator.BOOL} and in_all_tables:
+            self.kind = _ColumnAggregator.BOOL
+        else:
+            # bools mixed with other values or missing values are concatenated as objects
+            self.kind = _ColumnAggregator.NOMINAL
+
+    def update(self, series: pd.Series):
+        if self.kind == _ColumnAggregator.NOMINAL:
+            self.values_counts.update(series.value_counts(dropna=True).to_dict())
+            return
+        values: np.ndarray = series.to_numpy(dtype=float, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        count: int = len(values)
+        if count == 0:
+            return
+        values_sum: float = values.sum()
+        mean: float = values_sum / count
+        m2: float = ((values - mean) ** 2).sum()
+        delta: float = mean - self.mean
+        total_count: int = self.count + count
+        self.mean += delta * count / total_count
+        self.m2 += m2 + delta ** 2 * self.count * count / total_count
+        self.count = total_count
+        self.sum += values_sum
+
+    def aggregate(self) -> Any:
+        if self.kind != _ColumnAggregator.NOMINAL:
+            return self.sum / self.count if self.count > 0 else np.nan
+        if len(self.values_counts) == 0:
+            return np.nan
+        max_count: int = max(self.values_counts.values())
+        modes: List[Any] = [value for value, count in self.values_counts.items() if count == max_count]
+        try:
+            # the smallest of equally frequent values, like `pd.Series.mode()[0]`
+            return min(modes)
+        except TypeError:
+            return modes[0]
+
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
@@ -2,20 +2,22 @@ import copy
 import logging
 import sys
 import traceback
-from concurrent.futures import ThreadPoolExecutor
 from logging import Logger, basicConfig
-from time import sleep
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple, Type
 
-from multiprocess.pool import Pool
 from multiprocess.queues import Queue
 
 from . import conf
 from .context import ExperimentContext
+from .events import EventTypes
 from .events.emitter import EventEmitter
 from .events.events import *
-from .logs import run_from_ipython
+from .pool import WorkerPool, get_worker_state
 from .remote_logging import RemoteExperimentMonitor, RemoteLogsHandler
+from .results.tables import flush_tables
+from .scheduling import ParamsetsTimings, ScheduleModes, schedule_paramsets
+from .storage.write_behind import flush_stores
+from .store import close_stores, get_cache_dir, get_store_path
 
 
 class Runner:
@@ -76,7 +78,39 @@ class Runner:
                 )
                 plugin.logger.error(error, stack_info=True)
 
-    def run(self, experiment):
+    @staticmethod
+    def _emit_paramset_events(
+        event_emitter: EventEmitter,
+        event_class: Type[ExperimentParamSetEvent],
+        event_types: List[str],
+        *args,
+        **kwargs
+    ):
+        """Emits paramset event of each given type, skipping those nobody listens to.
+        """
+        for event_type in event_types:
+            if event_emitter.is_subscribed(event_type):
+                event_emitter.emit_event(event_class(*args, event_type=event_type, **kwargs))
+
+    def _skip_completed_paramsets(
+        self,
+        experiment,
+        paramsets: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Restores state and results of paramsets completed in previous runs and
+        returns remaining ones.
+        """
+        completed: Dict[str, dict] = experiment._ledger.completed_paramsets()
+        completed_names: List[str] = [name for name, _ in paramsets if name in completed]
+        if len(completed_names) == 0:
+            return paramsets
+        self._logger.info(
+            f'Resuming experiment, skipping {len(completed_names)} already completed paramsets')
+        experiment._event_handler._results.update(
+            experiment._ledger.restore(experiment.state, completed_names))
+        return [(name, params) for name, params in paramsets if name not in completed]
+
+    def run(self, experiment, pool: WorkerPool, resume: bool = False):
         self._name: str = experiment.name
         self._version: str = experiment.version
         self._paramsets_names: str = list(map(lambda e: e[0], experiment.paramsets))
@@ -85,9 +119,17 @@ class Runner:
         self._event_queue: Queue = experiment._event_handler.event_queue
         self._event_queue: Queue = experiment._event_handler.event_queue
         self._function: Callable = experiment.function
+        worker_setup: Callable[[], Any] = experiment._worker_setup
+        worker_setup_key: str = f'{self._name}:{self._version}'
         remote_logs_queue: Queue = experiment._remote_monitor.logs_queue if experiment._remote_monitor is not None else None
 
+        paramsets: List[Tuple[str, Dict[str, Any]]] = experiment.paramsets
+        if resume:
+            paramsets = self._skip_completed_paramsets(experiment, paramsets)
+
         self._initialize_plugins_for_experiment(experiment)
+        # plugins may add their own listeners, so subscriptions are resolved after their initialization
+        subscribed_event_types: FrozenSet[str] = experiment._event_handler.get_subscribed_event_types()
 
         def inner_wrapper(arg: Tuple[Dict[str, dict], Callable, ExperimentContext, EventEmitter]):
             conf.settings = self._settings
@@ -96,9 +138,12 @@ class Runner:
             context: ExperimentContext = arg[2]
             event_emitter: EventEmitter = arg[3]
 
-            ExperimentContext.__GLOBAL_CONTEXT__ = context
-            ExperimentContext.__EVENT_EMITTER__ = event_emitter
+            ExperimentContext.set_instance(context)
+            ExperimentContext.set_event_emitter(event_emitter)
 
+            # workers may be reused between paramsets, close handlers of the previous one
+            for handler in context.logger.handlers:
+                handler.close()
             context.logger.handlers = []
             remote_logger = None
             formatter = logging.Formatter(conf.settings.LOGS_FORMAT)
@@ -114,65 +159,71 @@ class Runner:
                 remote_handler.setFormatter(formatter)
                 context.logger.addHandler(remote_handler)
             basicConfig(level=context.logger.level)
+            start_time = datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE)
             try:
-                sleep(0.2)
+                if worker_setup is not None:
+                    context._worker_state = get_worker_state(worker_setup_key, worker_setup)
                 self._initialize_plugins_for_paramset(
                     context, experiment_params
                 )
-                console_handler = logging.StreamHandler(sys.stdout)
-                console_handler.setFormatter(
-                    logging.Formatter(conf.settings.LOGS_FORMAT))
-                self._logger.addHandler(console_handler)
+                if not any(getattr(handler, 'stream', None) is sys.stdout for handler in self._logger.handlers):
+                    console_handler = logging.StreamHandler(sys.stdout)
+                    console_handler.setFormatter(
+                        logging.Formatter(conf.settings.LOGS_FORMAT))
+                    self._logger.addHandler(console_handler)
                 self._logger.info(
                     f'Starting experiment for paramset: "{context.paramset_name}"')
-                event_emitter.emit_event(ParamsetStartEvent(
-                    self._name, context.paramset_name))
-                event_emitter.emit_event(ParamsetStartEvent(
-                    self._name,
-                    context.paramset_name,
-                    event_type=f'{context.paramset_name}__PARAMSET_START'
-                ))
+                self._emit_paramset_events(
+                    event_emitter,
+                    ParamsetStartEvent,
+                    [EventTypes.EXPERIMENT_PARAMSET_START.value, f'{context.paramset_name}__PARAMSET_START'],
+                    self._name, context.paramset_name
+                )
                 start_time = datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE)
 
                 result: Any = experiment_function(*experiment_params.values())
+                # paramset is finished only when all its store variables and tables rows are saved
+                flush_stores(get_store_path(context))
+                flush_tables()
 
                 self._logger.info(
                     f'Finished experiment for paramset: "{context.paramset_name}". Took: {datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE) - start_time}')
                 self._finish_plugins_for_paramset(context)
-                event_emitter.emit_event(ParamsetSuccessEvent(
-                    self._name,
-                    context.paramset_name,
-                    event_type=f'{context.paramset_name}__PARAMSET_SUCCESS',
-                    result=result
-                ))
-                event_emitter.emit_event(ParamsetSuccessEvent(
-                    self._name, context.paramset_name, result=result))
+                self._emit_paramset_events(
+                    event_emitter,
+                    ParamsetSuccessEvent,
+                    [f'{context.paramset_name}__PARAMSET_SUCCESS', EventTypes.EXPERIMENT_PARAMSET_SUCCESS.value],
+                    self._name, context.paramset_name, result=result
+                )
             except Exception as exception:
                 self._logger.info(
                     f'Exception during experiment for paramset: "{context.paramset_name}". Took: {datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE) - start_time}')
                 stack_trace: str = traceback.format_exc()
                 context.logger.error(exception, exc_info=True)
+                try:
+                    flush_stores(get_store_path(context))
+                    flush_tables()
+                except Exception as flush_error:
+                    context.logger.error(flush_error, exc_info=True)
                 self._finish_plugins_for_paramset(context, error=exception)
-                event_emitter.emit_event(ParamsetErrorEvent(
-                    self._name,
-                    exception,
-                    stack_trace,
-                    context.paramset_name,
-                    event_type=f'{context.paramset_name}__PARAMSET_ERROR'
-                ))
-                event_emitter.emit_event(ParamsetErrorEvent(
-                    self._name, exception, stack_trace, context.paramset_name))
+                self._emit_paramset_events(
+                    event_emitter,
+                    ParamsetErrorEvent,
+                    [f'{context.paramset_name}__PARAMSET_ERROR', EventTypes.EXPERIMENT_PARAMSET_ERROR.value],
+                    self._name, exception, stack_trace, context.paramset_name
+                )
             finally:
                 if remote_logger is not None:
                     remote_logger.flush()
                     remote_logger.terminate()
-                event_emitter.emit_event(ParamsetEndEvent(
-                    self._name,
-                    context.paramset_name,
-                    event_type=f'{context.paramset_name}__PARAMSET_END'
-                ))
-                event_emitter.emit_event(ParamsetEndEvent(
-                    self._name, context.paramset_name))
+                close_stores(get_store_path(context))
+                self._emit_paramset_events(
+                    event_emitter,
+                    ParamsetEndEvent,
+                    [f'{context.paramset_name}__PARAMSET_END', EventTypes.EXPERIMENT_PARAMSET_END.value],
+                    self._name, context.paramset_name
+                )
+                event_emitter.flush()
 
         params_sets: List[Tuple[Dict[str, dict], Callable, ExperimentContext, EventEmitter]] = [
             (
@@ -190,24 +241,36 @@ class Runner:
                         key: plugin.clone() for key, plugin in experiment.plugins.items()
                     }
                 ),
-                EventEmitter(self._event_queue)
-            ) for paramset_name, paramset in experiment.paramsets
+                EventEmitter(
+                    self._event_queue,
+                    batch_size=conf.settings.EVENTS_BATCH_SIZE,
+                    flush_interval=conf.settings.EVENTS_FLUSH_INTERVAL,
+                    subscribed_event_types=subscribed_event_types
+                )
+            ) for paramset_name, paramset in schedule_paramsets(experiment, paramsets)
         ]
         experiment_start_time = datetime.now(
             tz=conf.settings.EXPERIMENT_TIMEZONE)
 
-        if run_from_ipython():
-            pool = ThreadPoolExecutor(max_workers=experiment.n_jobs)
+        if pool.use_threads:
             experiment._logger.warning(
                 'Running from Interactive Interpreter which is not supporting multiprocessing, will use threading instead.')
-            setattr(pool, 'map_async', pool.map)
-        else:
-            pool = Pool(experiment.n_jobs)
-
-        with pool as executor:
-            executor.map_async(inner_wrapper, params_sets)
-            experiment._event_handler.start_listening_for_events(
-                len(params_sets))
+
+        # when paramsets are ordered by cost, each of them is dispatched as a separate task
+        # so that workers pick up next paramset as soon as they finish previous one
+        chunksize: int = 1 if experiment.schedule == ScheduleModes.LONGEST_FIRST else None
+        async_result = pool.map_async(inner_wrapper, params_sets, chunksize=chunksize)
+        experiment._event_handler.start_listening_for_events(
+            len(params_sets))
+        async_result.wait()
+        ParamsetsTimings(self._dir_path).record(experiment.state)
+        if conf.settings.CACHE_QUOTA_BYTES is not None:
+            from .storage.cache_gc import \
+                CacheManager  # pylint: disable=import-outside-toplevel
+            removed: List[dict] = CacheManager(get_cache_dir(self._dir_path)).prune(
+                protected_versions=[self._version])
+            if len(removed) > 0:
+                self._logger.info(f'Removed {len(removed)} paramsets stores from cache to fit into quota')
         self._finish_plugins_for_experiment(experiment)
         self._logger.info(
             f'Finished whole experiment "{self._name}". Took: {datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE) - experiment_start_time}')
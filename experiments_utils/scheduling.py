@@ -0,0 +1,194 @@
+"""Contains utilities for ordering paramsets before dispatching them to workers
+"""
+from __future__ import annotations
+
+import json
+import os
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from .state import ExperimentState, States
+from .store import get_cache_dir
+
+
+class ScheduleModes(Enum):
+    """Enum containing available paramsets scheduling modes
+
+    `DEFAULT` - paramsets are dispatched in the order they were given
+    `LONGEST_FIRST` - paramsets are dispatched starting from the most expensive one
+        (according to experiment cost estimator), each paramset as a separate task
+    """
+    DEFAULT: str = 'DEFAULT'
+    LONGEST_FIRST: str = 'LONGEST_FIRST'
+
+
+class CostEstimator:
+    """Base class for paramsets cost estimators used by `LONGEST_FIRST` scheduling mode.
+    Returned costs are only compared with each other so they may be expressed in any unit.
+    """
+
+    def setup(self, experiment):
+        ...
+
+    def estimate(self, paramset_name: str, params: Dict[str, Any]) -> float:
+        ...
+
+
+class _FunctionCostEstimator(CostEstimator):
+
+    def __init__(self, function: Callable[[str, Dict[str, Any]], float]) -> None:
+        self._function: Callable[[str, Dict[str, Any]], float] = function
+
+    def estimate(self, paramset_name: str, params: Dict[str, Any]) -> float:
+        return self._function(paramset_name, params)
+
+
+class DatasetComplexityCostEstimator(CostEstimator):
+    """Estimates paramset cost based on the complexity of the dataset it uses.
+
+    Example:
+    ```python
+    from experiments_utils.scheduling import DatasetComplexityCostEstimator, ScheduleModes
+
+    @experiment(
+        name='My Experiment',
+        paramsets=PARAMSETS,
+        schedule=ScheduleModes.LONGEST_FIRST,
+        cost_estimator=DatasetComplexityCostEstimator(
+            'dataset_name',
+            lambda name: pd.read_csv(f'./datasets/{name}.csv')
+        )
+    )
+    def main(dataset_name: str, model):
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        dataset_param: str,
+        dataset_accessor: Callable[[str], Any]
+    ) -> None:
+        """
+        Args:
+            dataset_param (str): name of the paramset parameter containing dataset name
+            dataset_accessor (Callable[[str], Any]): function returning dataset (pandas
+                DataFrame or numpy array) for given dataset name
+        """
+        self.dataset_param: str = dataset_param
+        self.dataset_accessor: Callable[[str], Any] = dataset_accessor
+        self._complexities: Dict[str, int] = {}
+
+    def setup(self, experiment):
+        from .helpers.datasets import \
+            sort_dataset_by_complexity  # pylint: disable=import-outside-toplevel
+        datasets_names: List[str] = list(dict.fromkeys([
+            params[self.dataset_param] for _, params in experiment.paramsets
+        ]))
+        self._complexities = {
+            dataset['name']: dataset['complexity'] for dataset in sort_dataset_by_complexity(
+                datasets_names, self.dataset_accessor
+            )
+        }
+
+    def estimate(self, paramset_name: str, params: Dict[str, Any]) -> float:
+        return self._complexities[params[self.dataset_param]]
+
+
+class TimingsCostEstimator(CostEstimator):
+    """Estimates paramset cost as its execution time recorded during earlier experiment runs.
+    Paramsets that were never run successfully are estimated using the fallback estimator
+    or, if it's not given, are treated as the most expensive ones.
+    """
+
+    def __init__(self, fallback: Union[CostEstimator, Callable[[str, Dict[str, Any]], float]] = None) -> None:
+        """
+        Args:
+            fallback (Union[CostEstimator, Callable[[str, Dict[str, Any]], float]], optional): estimator
+                used for paramsets with no recorded timings. Defaults to None.
+        """
+        self.fallback: CostEstimator = resolve_cost_estimator(fallback) if fallback is not None else None
+        self._timings: Dict[str, float] = {}
+
+    def setup(self, experiment):
+        self._timings = ParamsetsTimings(experiment.dir_path).load()
+        if self.fallback is not None:
+            self.fallback.setup(experiment)
+
+    def estimate(self, paramset_name: str, params: Dict[str, Any]) -> float:
+        if paramset_name in self._timings:
+            return self._timings[paramset_name]
+        if self.fallback is not None:
+            return self.fallback.estimate(paramset_name, params)
+        return float('inf')
+
+
+class ParamsetsTimings:
+    """Class for reading and recording paramsets execution times between experiment runs.
+    Timings are stored in the `_timings.json` file inside experiment cache directory.
+    """
+
+    FILE_NAME: str = '_timings.json'
+
+    def __init__(self, current_dir: str) -> None:
+        self._file_path: str = f'{get_cache_dir(current_dir)}/{ParamsetsTimings.FILE_NAME}'
+
+    def load(self) -> Dict[str, float]:
+        if not os.path.exists(self._file_path):
+            return {}
+        with open(self._file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def record(self, state: ExperimentState):
+        """Records execution times of all successfully finished paramsets from given
+        experiment state.
+
+        Args:
+            state (ExperimentState): experiment state
+        """
+        timings: Dict[str, float] = self.load()
+        for paramset_name in state.paramsets_names:
+            paramset_state = state.get_paramset_state(paramset_name)
+            if paramset_state.state != States.SUCCESSFUL or paramset_state.started is None:
+                continue
+            timings[paramset_name] = (paramset_state.finished - paramset_state.started).total_seconds()
+        os.makedirs(os.path.dirname(self._file_path), exist_ok=True)
+        tmp_file_path: str = f'{self._file_path}.tmp'
+        with open(tmp_file_path, 'w', encoding='utf-8') as file:
+            json.dump(timings, file)
+        os.replace(tmp_file_path, self._file_path)
+
+
+def resolve_cost_estimator(
+    cost_estimator: Union[CostEstimator, Callable[[str, Dict[str, Any]], float]]
+) -> CostEstimator:
+    if cost_estimator is None:
+        return TimingsCostEstimator()
+    if isinstance(cost_estimator, CostEstimator):
+        return cost_estimator
+    return _FunctionCostEstimator(cost_estimator)
+
+
+def schedule_paramsets(
+    experiment,
+    paramsets: List[Tuple[str, Dict[str, Any]]],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Orders paramsets according to experiment scheduling mode.
+
+    Args:
+        experiment (Experiment): experiment
+        paramsets (List[Tuple[str, Dict[str, Any]]]): paramsets to order
+
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: ordered paramsets
+    """
+    if experiment.schedule == ScheduleModes.DEFAULT:
+        return paramsets
+    cost_estimator: CostEstimator = resolve_cost_estimator(experiment.cost_estimator)
+    cost_estimator.setup(experiment)
+    costs: Dict[str, float] = {
+        paramset_name: cost_estimator.estimate(paramset_name, params)
+        for paramset_name, params in paramsets
+    }
+    # sorting is stable so paramsets with equal costs keep their original order
+    return sorted(paramsets, key=lambda e: costs[e[0]], reverse=True)
@@ -1,6 +1,6 @@
 """File containg settings. All of them could be over overwritten.
 """
-from typing import Tuple
+from typing import List, Tuple
 import pytz
 dir_path: str = None
 
@@ -9,9 +9,26 @@ EXPERIMENT_TIMEZONE: str = pytz.timezone('Europe/Warsaw')
 
 EXPERIMENT_BASE_LOGGING_DIR: str = None  # default is './logs'
 EXPERIMENT_CACHE_DIR: str = None  # default is './_cache'
+EXPERIMENT_RUN_LEDGER: bool = False  # if enabled finished paramsets are recorded in "_cache/{version}/_ledger.jsonl" by every run, not only by resumed ones
+STORE_BACKEND: str = 'pickle'  # "pickle" (file per variable), "sqlite" (single database file per paramset) or "blobs" (deduplicated files shared by all versions)
+STORE_SQLITE_TIMEOUT: float = 60.0  # seconds to wait for database lock
+STORE_CODEC: str = 'none'  # compression of pickled variables: "none", "gzip", "lzma", "lz4" or "zstd"
+STORE_CACHE_MAX_BYTES: int = None  # max estimated size of variables kept in memory by each store, None means no limit
+STORE_WRITE_BEHIND: bool = False  # if enabled store variables are saved in background thread
+STORE_WRITE_BEHIND_MAX_PENDING: int = 16  # max number of variables waiting to be saved before assignment blocks
+STORE_MEMMAP_MIN_BYTES: int = None  # if set (e.g. 1024 * 1024), arrays of at least that size are saved as .npy files loaded back as read-only memory maps
+STEP_CHECKPOINT_CHUNK_BYTES: int = 4 * 1024 * 1024  # size of arrays chunks diffed by step checkpoints
+CACHE_USAGE_TRACKING: bool = False  # if enabled store operations are logged to "_cache/_usage" directory, so cache garbage collection could evict least recently used paramsets; otherwise it relies on files modification times and scans whole cache tree on each inspection or prune
+CACHE_QUOTA_BYTES: int = None  # if set, least recently used paramsets stores are removed after each experiment run to fit cache into quota; usage tracking is then always enabled
+CACHE_PINNED_VERSIONS: List[str] = []  # versions never removed by cache garbage collection
 
 THREADS_LIMIT: int = 8
 
+EVENTS_BATCH_SIZE: int = 64  # max number of events buffered in worker before sending them
+EVENTS_FLUSH_INTERVAL: float = 1.0  # seconds
+EVENTS_LISTENERS_THREADS: int = 4  # threads running offloaded event listeners
+EVENTS_JOURNAL_ENABLED: bool = False  # if enabled all events are written to "events" directory inside logs directory
+
 
 LOGS_FORMAT = '[%(levelname)s] %(asctime)s %(message)s'
 
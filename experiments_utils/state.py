@@ -68,11 +68,11 @@ class ParamSetState:
     """Class allowing to read experiment paramset execution state.
     """
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, steps_names: List[str] = None) -> None:
         self._name: str = name
         self._started: datetime = None
         self._finished: datetime = None
-        self._steps_names: List[str] = list(
+        self._steps_names: List[str] = steps_names if steps_names is not None else list(
             map(lambda s: s.name, Step.get_all_registered_steps()))
         self._steps_state: Dict[str, StepState] = {
             name: StepState(name) for name in self._steps_names
@@ -139,7 +139,8 @@ class ExperimentState:
         self,
         experiment_name: str,
         experiment_version: str,
-        paramsets_names: List[str]
+        paramsets_names: List[str],
+        steps_names: List[str] = None
     ) -> None:
         self._experiment_name: str = experiment_name
         self._experiment_version: str = experiment_version
@@ -149,10 +150,10 @@ class ExperimentState:
         self._state: States = States.NONE
         self._errors: List[Exception] = []
         self._errors_stack_traces: List[str] = []
-        self._steps_names: List[str] = list(
+        self._steps_names: List[str] = steps_names if steps_names is not None else list(
             map(lambda s: s.name, Step.get_all_registered_steps()))
         self._paramsets_state: Dict[str, ParamSetState] = {
-            name: ParamSetState(name) for name in paramsets_names
+            name: ParamSetState(name, self._steps_names) for name in paramsets_names
         }
         self._running_paramsets: List[str] = []
         self._failed_paramsets: List[str] = []
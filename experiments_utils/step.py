@@ -1,13 +1,61 @@
 from __future__ import annotations
 from logging import Logger
-from typing import Callable, List
+from typing import Any, Callable, Dict, List, Type
 from datetime import datetime
+import hashlib
+import inspect
+import pickle
 import traceback
+import cloudpickle
 from .logs import get_step_logger
 from . import conf
 from .context import ExperimentContext
+from .store import Store, get_cache_dir
+from .checkpoint import StepCheckpoint
 from .events.emitter import EventEmitter
-from .events import StepStartEvent, StepEndEvent, StepErrorEvent, StepSuccessEvent
+from .events import EventTypes, ExperimentStepEvent, StepStartEvent, StepEndEvent, StepErrorEvent, StepSuccessEvent
+
+
+class _HashWriter:
+    """File-like object feeding written bytes to hash, so that pickled values
+    are hashed without keeping their whole pickle in memory.
+    """
+
+    def __init__(self) -> None:
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return len(data)
+
+
+class _SortedSet(tuple):
+    """Sorted elements of set, pickled differently than a tuple of the same elements"""
+
+
+def _canonicalize(value: Any) -> Any:
+    """Replaces sets in (possibly nested) lists, tuples and dicts with lists of their elements
+    in sorted order. Order of sets of strings depends on strings hashes, which are randomized
+    per process, so their plain pickles would differ between runs.
+    """
+    if value.__class__ in (set, frozenset):
+        elements: List[Any] = [_canonicalize(element) for element in value]
+        return value.__class__.__name__, _SortedSet(sorted(
+            elements, key=lambda element: cloudpickle.dumps(element, protocol=pickle.HIGHEST_PROTOCOL)))
+    if value.__class__ in (list, tuple):
+        return value.__class__(_canonicalize(element) for element in value)
+    if value.__class__ is dict:
+        return {key: _canonicalize(element) for key, element in value.items()}
+    return value
+
+
+def _get_function_fingerprint(function: Callable) -> bytes:
+    try:
+        return inspect.getsource(function).encode('utf-8')
+    except (OSError, TypeError):
+        # source is not available e.g. for functions defined in interactive interpreter
+        code = function.__code__
+        return code.co_code + repr(code.co_consts).encode('utf-8')
 
 
 class Step:
@@ -20,119 +68,182 @@ class Step:
     def get_all_registered_steps() -> List[Step]:
         return Step.__registered_steps__
 
-    def __init__(self, function: Callable, name: str) -> None:
+    def __init__(self, function: Callable, name: str, cache: bool = False) -> None:
         """Constructor. NOTE: Its recomended to use @step function decorator rather
         than using this constructor.
         Args:
             function (Callable): step function to wrap
             name (str): step name - used for logging
+            cache (bool, optional): whether to cache step results. Defaults to False.
         """
         self.function: Callable = function
         self.name: str = name
+        self.cache: bool = cache
+        self._function_fingerprint: bytes = _get_function_fingerprint(function) if cache else None
         self.experiment_name: str = None
         self.paramset_name: str = None
         self.logger: Logger = None
         self._experiment_logger: Logger = None
+        # checkpoints of running step by paramsets names
+        self._checkpoints: Dict[str, StepCheckpoint] = {}
 
     def run(self, *args, **kwargs):
         """Run step function"""
-        context: ExperimentContext = ExperimentContext.__GLOBAL_CONTEXT__
-        event_emitter: EventEmitter = ExperimentContext.__EVENT_EMITTER__
-        self.experiment_name = context.name
-        self.paramset_name = context.paramset_name
-        self.logger = get_step_logger(self.name, self.paramset_name)
-        self._experiment_logger = context.logger
-
-        event_emitter.emit_event(StepStartEvent(
-            self.experiment_name,
-            self.paramset_name,
-            self.name
-        ))
-        event_emitter.emit_event(StepStartEvent(
-            self.experiment_name,
-            self.paramset_name,
-            self.name,
-            event_type=f'{self.name}__STEP_START'
-        ))
+        context: ExperimentContext = ExperimentContext.get_instance()
+        event_emitter: EventEmitter = ExperimentContext.get_event_emitter()
+        # step may be run by paramsets in multiple threads, so their state is kept locally
+        experiment_name: str = context.name
+        paramset_name: str = context.paramset_name
+        logger: Logger = get_step_logger(self.name, paramset_name)
+        experiment_logger: Logger = context.logger
+        self.experiment_name = experiment_name
+        self.paramset_name = paramset_name
+        self.logger = logger
+        self._experiment_logger = experiment_logger
+
+        self._emit_events(
+            event_emitter, StepStartEvent, EventTypes.STEP_START,
+            experiment_name, paramset_name, self.name
+        )
         try:
             start_time = datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE)
-            self.logger.info(f'Started step "{self.name}" for paramset "{self.paramset_name}"')
-            self._experiment_logger.info(f'Started step "{self.name}" for paramset "{self.paramset_name}"')
+            logger.info(f'Started step "{self.name}" for paramset "{paramset_name}"')
+            experiment_logger.info(f'Started step "{self.name}" for paramset "{paramset_name}"')
             
-            result = self.function(*args, **kwargs)
+            result = self._run_cached(*args, **kwargs) if self.cache else self.function(*args, **kwargs)
+            self._close_checkpoint(paramset_name, clear=True)
             
             now = datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE)
-            self.logger.info(f'Finished step "{self.name}" for paramset "{self.paramset_name}". Took: {now - start_time}')
-            self._experiment_logger.info(f'Finished step "{self.name}" for paramset "{self.paramset_name}". Took: {now - start_time}')
+            logger.info(f'Finished step "{self.name}" for paramset "{paramset_name}". Took: {now - start_time}')
+            experiment_logger.info(f'Finished step "{self.name}" for paramset "{paramset_name}". Took: {now - start_time}')
             
-            event_emitter.emit_event(StepSuccessEvent(
-                self.experiment_name,
-                self.paramset_name,
-                self.name
-            ))
-            event_emitter.emit_event(StepSuccessEvent(
-                self.experiment_name,
-                self.paramset_name,
-                self.name,
-                event_type=f'{self.name}__STEP_SUCCESS'
-            ))
+            self._emit_events(
+                event_emitter, StepSuccessEvent, EventTypes.STEP_SUCCESS,
+                experiment_name, paramset_name, self.name
+            )
         except Exception as error:
             now = datetime.now(tz=conf.settings.EXPERIMENT_TIMEZONE)
-            self._experiment_logger.info(f'Exception during step "{self.name}" for paramset "{self.paramset_name}". Took: {now - start_time}')
-            self.logger.info(f'Exception during step "{self.name}" for paramset "{self.paramset_name}". Took: {now - start_time}')
+            experiment_logger.info(f'Exception during step "{self.name}" for paramset "{paramset_name}". Took: {now - start_time}')
+            logger.info(f'Exception during step "{self.name}" for paramset "{paramset_name}". Took: {now - start_time}')
 
-            self.logger.error(error, exc_info=True)
+            logger.error(error, exc_info=True)
+            self._close_checkpoint(paramset_name, clear=False)
             stack_trace: str = traceback.format_exc()
-            event_emitter.emit_event(StepErrorEvent(
-                self.experiment_name,
-                error,
-                stack_trace,
-                self.paramset_name,
-                self.name
-            ))
-            event_emitter.emit_event(StepErrorEvent(
-                self.experiment_name,
-                error,
-                stack_trace,
-                self.paramset_name,
-                self.name,
-                event_type=f'{self.name}__STEP_ERROR'
-            ))
-            event_emitter.emit_event(StepEndEvent(
-                self.experiment_name,
-                self.paramset_name,
-                self.name
-            ))
-            event_emitter.emit_event(StepEndEvent(
-                self.experiment_name,
-                self.paramset_name,
-                self.name,
-                event_type=f'{self.name}__STEP_END'
-            ))
+            self._emit_events(
+                event_emitter, StepErrorEvent, EventTypes.STEP_ERROR,
+                experiment_name, error, stack_trace, paramset_name, self.name
+            )
+            self._emit_events(
+                event_emitter, StepEndEvent, EventTypes.STEP_END,
+                experiment_name, paramset_name, self.name
+            )
             raise error
-        event_emitter.emit_event(StepEndEvent(
-            self.experiment_name,
-            self.paramset_name,
-            self.name
-        ))
-        event_emitter.emit_event(StepEndEvent(
-            self.experiment_name,
-            self.paramset_name,
-            self.name,
-            event_type=f'{self.name}__STEP_END'
-        ))
+        self._emit_events(
+            event_emitter, StepEndEvent, EventTypes.STEP_END,
+            experiment_name, paramset_name, self.name
+        )
         return result
 
+    def checkpoint(self, every_seconds: float = None, every_iterations: int = None) -> StepCheckpoint:
+        """Returns checkpoint of this step for current paramset. It can only be called while
+        the step is running. Checkpoint left by previous failed run of the step is restored
+        and available as `state` of returned checkpoint. See `StepCheckpoint` for example.
+
+        Args:
+            every_seconds (float, optional): minimal time between checkpoints. Defaults to None.
+            every_iterations (int, optional): number of `save()` calls between checkpoints.
+                Defaults to None (checkpoint on every `save()` call).
+
+        Returns:
+            StepCheckpoint: step checkpoint
+        """
+        context: ExperimentContext = ExperimentContext.get_instance()
+        checkpoint: StepCheckpoint = self._checkpoints.get(context.paramset_name)
+        if checkpoint is None:
+            checkpoint = self._checkpoints[context.paramset_name] = StepCheckpoint(
+                f'{get_cache_dir(context.current_dir)}/{context.version}/{context.paramset_name}',
+                self.name,
+                every_seconds=every_seconds,
+                every_iterations=every_iterations,
+                logger=self.logger
+            )
+        else:
+            checkpoint.every_seconds = every_seconds
+            checkpoint.every_iterations = every_iterations
+        return checkpoint
+
+    def _close_checkpoint(self, paramset_name: str, clear: bool):
+        """Waits for checkpoint being written. Checkpoint is removed after step succeeded,
+        otherwise it's kept to be restored by the next run.
+        """
+        checkpoint: StepCheckpoint = self._checkpoints.pop(paramset_name, None)
+        if checkpoint is None:
+            return
+        try:
+            if clear:
+                checkpoint.clear()
+        finally:
+            checkpoint.close()
+
+    def _get_cache_key(self, *args, **kwargs) -> str:
+        """Returns name under which step result is stored for given arguments or None
+        if arguments could not be pickled.
+        """
+        writer = _HashWriter()
+        writer.write(self._function_fingerprint)
+        try:
+            cloudpickle.dump(_canonicalize((args, kwargs)), writer, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            self.logger.warning(f'Failed to fingerprint arguments of step "{self.name}", its result won\'t be cached: {error}')
+            return None
+        return f'__step__{self.name}__{writer.hash.hexdigest()}'
+
+    def _run_cached(self, *args, **kwargs) -> Any:
+        cache_key: str = self._get_cache_key(*args, **kwargs)
+        if cache_key is None:
+            return self.function(*args, **kwargs)
+        store = Store()
+        try:
+            result: Any = getattr(store, cache_key)
+            self.logger.info(f'Using cached result of step "{self.name}" for paramset "{self.paramset_name}"')
+            return result
+        except NameError:
+            pass
+        result: Any = self.function(*args, **kwargs)
+        setattr(store, cache_key, result)
+        return result
+
+    def _emit_events(
+        self,
+        event_emitter: EventEmitter,
+        event_class: Type[ExperimentStepEvent],
+        event_type: EventTypes,
+        *args
+    ):
+        """Emits both generic event and step specific one (`{step_name}__{event_type}`),
+        skipping those nobody listens to.
+        """
+        for event_type_name in (event_type.value, f'{self.name}__{event_type.value}'):
+            if event_emitter.is_subscribed(event_type_name):
+                event_emitter.emit_event(event_class(*args, event_type=event_type_name))
+
     __call__ = run
 
 
 def step(
-    name: str = None
+    name: str = None,
+    cache: bool = False
 ):
     """Decorator for experiment step functions
 
     Args:
         name (str, optional): Optional step name. Defaults is step function name.
+        cache (bool, optional): If True, step result is stored in paramset cache and reused
+            by later calls with identical arguments, as long as step function source
+            is not changed. Arguments must be picklable. Sets are fingerprinted
+            regardless of their elements order, but other objects which pickle differently
+            in each process (e.g. iterating over sets of strings in custom `__reduce__`)
+            will miss the cache in later runs. Defaults to False.
     """
     def wrapper(funct: Callable):
         # if step name is not given take function name
@@ -141,7 +252,8 @@ def step(
             _name = funct.__name__
         step = Step(
             name=_name,
-            function=funct
+            function=funct,
+            cache=cache
         )
         Step.__registered_steps__.append(step)
         return step
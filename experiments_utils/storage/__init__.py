@@ -0,0 +1,3 @@
+"""Contains storage backends used by experiments store
+"""
+from .backends import StoreBackend, PickleFilesBackend, BlobsBackend, SQLiteBackend, create_backend
@@ -0,0 +1,154 @@
+"""Contains helpers storing numpy arrays and numeric pandas DataFrames in raw `.npy`
+files, which are loaded back as read-only memory-mapped views. Processes loading the
+same variable share its pages through OS page cache instead of each holding a copy.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import sys
+from typing import IO, Any
+
+import cloudpickle
+
+from .. import conf
+
+ARRAY_EXTENSION: str = '.npy'
+FRAME_EXTENSION: str = '.npframe'
+_FRAME_META_FILE_NAME: str = '__meta__.pickle'
+_FRAME_INDEX_FILE_NAME: str = '__index__.npy'
+
+
+def _is_plain_dtype(dtype: Any) -> bool:
+    np = sys.modules['numpy']
+    return isinstance(dtype, np.dtype) and not dtype.hasobject
+
+
+def _is_mappable_array(value: Any) -> bool:
+    # numpy is not imported by this module, if it's not imported at all value can't be an array
+    np = sys.modules.get('numpy')
+    return np is not None and type(value) in (np.ndarray, np.memmap) and _is_plain_dtype(value.dtype)
+
+
+def _is_mappable_frame(value: Any) -> bool:
+    pd = sys.modules.get('pandas')
+    return (
+        pd is not None and type(value) is pd.DataFrame and
+        value.columns.is_unique and
+        all(_is_plain_dtype(dtype) for dtype in value.dtypes)
+    )
+
+
+def get_mapped_extension(value: Any) -> str:
+    """Returns extension under which given value should be saved or None if value
+    should be pickled.
+
+    Args:
+        value (Any): value
+
+    Returns:
+        str: extension
+    """
+    min_bytes: int = conf.settings.STORE_MEMMAP_MIN_BYTES
+    if min_bytes is None:
+        return None
+    if _is_mappable_array(value):
+        return ARRAY_EXTENSION if value.nbytes >= max(min_bytes, 1) else None
+    if _is_mappable_frame(value):
+        nbytes: int = int(value.memory_usage(index=False, deep=False).sum())
+        return FRAME_EXTENSION if nbytes >= max(min_bytes, 1) else None
+    return None
+
+
+def save_array(file: IO[bytes], array: Any):
+    np = sys.modules['numpy']
+    np.save(file, array, allow_pickle=False)
+
+
+def _save_array(file_path: str, array: Any):
+    with open(file_path, 'wb') as file:
+        save_array(file, array)
+
+
+def _load_array(file_path: str) -> Any:
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    try:
+        return np.load(file_path, mmap_mode='r', allow_pickle=False)
+    except ValueError:
+        # zero-size arrays could not be memory-mapped
+        array = np.load(file_path, allow_pickle=False)
+        array.flags.writeable = False
+        return array
+
+
+def save_mapped(file_path: str, value: Any):
+    """Atomically saves array (as `.npy` file) or dataframe (as directory containing
+    `.npy` file per column).
+
+    Args:
+        file_path (str): destination path with extension returned by `get_mapped_extension`
+        value (Any): array or dataframe
+    """
+    tmp_path: str = f'{file_path}.tmp'
+    if file_path.endswith(ARRAY_EXTENSION):
+        _save_array(tmp_path, value)
+        os.replace(tmp_path, file_path)
+        return
+    pd = sys.modules['pandas']
+    np = sys.modules['numpy']
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+    index: Any = value.index
+    index_mapped: bool = not isinstance(index, pd.RangeIndex) and _is_plain_dtype(index.dtype)
+    if index_mapped:
+        _save_array(f'{tmp_path}/{_FRAME_INDEX_FILE_NAME}', index.to_numpy())
+    for i, column in enumerate(value.columns):
+        _save_array(f'{tmp_path}/{i}{ARRAY_EXTENSION}', np.ascontiguousarray(value[column].to_numpy()))
+    with open(f'{tmp_path}/{_FRAME_META_FILE_NAME}', 'wb') as file:
+        cloudpickle.dump({
+            'columns': value.columns,
+            'index': None if index_mapped else index,
+            'index_name': index.name,
+        }, file, protocol=pickle.HIGHEST_PROTOCOL)
+    # directory could not be replaced with a single rename when it already exists
+    old_path: str = f'{file_path}.old'
+    if os.path.exists(file_path):
+        os.replace(file_path, old_path)
+    os.replace(tmp_path, file_path)
+    if os.path.exists(old_path):
+        shutil.rmtree(old_path)
+
+
+def load_mapped(file_path: str) -> Any:
+    """Loads array or dataframe saved with `save_mapped`. Arrays (and dataframe columns)
+    are read-only memory-mapped views.
+
+    Args:
+        file_path (str): path of saved value
+
+    Returns:
+        Any: array or dataframe
+    """
+    if file_path.endswith(ARRAY_EXTENSION):
+        return _load_array(file_path)
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    with open(f'{file_path}/{_FRAME_META_FILE_NAME}', 'rb') as file:
+        meta: dict = pickle.load(file)
+    index: Any = meta['index']
+    if index is None:
+        index = pd.Index(_load_array(f'{file_path}/{_FRAME_INDEX_FILE_NAME}'), name=meta['index_name'], copy=False)
+    columns: Any = meta['columns']
+    df = pd.DataFrame({
+        i: _load_array(f'{file_path}/{i}{ARRAY_EXTENSION}') for i in range(len(columns))
+    }, index=index, copy=False)
+    df.columns = columns
+    return df
+
+
+def remove_mapped(file_path: str):
+    if os.path.isdir(file_path):
+        shutil.rmtree(file_path)
+    else:
+        os.remove(file_path)
@@ -0,0 +1,383 @@
+"""Contains backends persisting `Store` variables of single paramset
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from .. import conf
+from . import codecs, usage
+from .arrays import (ARRAY_EXTENSION, FRAME_EXTENSION, get_mapped_extension,
+                     load_mapped, remove_mapped, save_array, save_mapped)
+from .blobs import (REF_EXTENSION, get_blob_path, get_blobs_dir, read_ref,
+                    write_blob, write_ref)
+from .codecs import NONE, Codec, get_codec
+
+PICKLE: str = 'pickle'
+SQLITE: str = 'sqlite'
+BLOBS: str = 'blobs'
+
+
+class StoreBackend:
+    """Base class for store backends. Backend keeps all variables of single paramset
+    stored in given directory. Missing variables raise `KeyError`.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): paramset cache directory
+        """
+        self.path: str = path
+        # None means codec set with `STORE_CODEC` setting
+        self.codec: Codec = None
+        self.variable_codecs: Dict[str, Codec] = {}
+
+    def get_codec(self, name: str) -> Codec:
+        """
+        Args:
+            name (str): variable name
+
+        Returns:
+            Codec: codec used for saving given variable
+        """
+        if name in self.variable_codecs:
+            return self.variable_codecs[name]
+        return self.codec if self.codec is not None else get_codec(None)
+
+    def save(self, name: str, value: Any):
+        raise NotImplementedError()
+
+    def load(self, name: str) -> Any:
+        raise NotImplementedError()
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError()
+
+    def list(self) -> List[str]:
+        raise NotImplementedError()
+
+    def delete(self, name: str):
+        raise NotImplementedError()
+
+    @contextmanager
+    def transaction(self) -> Iterator[StoreBackend]:
+        """Groups multiple writes, so that they are persisted together or not at all
+        (if exception is raised inside `with` block). Backends which could not commit
+        writes atomically persist them at the end of the block.
+        """
+        raise NotImplementedError()
+
+    @property
+    def in_transaction(self) -> bool:
+        return False
+
+    def close(self):
+        ...
+
+
+class PickleFilesBackend(StoreBackend):
+    """Stores each variable in a separate `{name}.pickle` file. If `STORE_MEMMAP_MIN_BYTES`
+    setting is set, large numpy arrays and numeric DataFrames are stored in raw `.npy` files
+    instead and loaded back as read-only memory-mapped views. Files are replaced
+    atomically and names of existing variables are read with a single directory listing,
+    instead of checking each file separately. Listing is refreshed whenever variable is
+    missing from it, so variables saved by other processes are still found. References to
+    content-addressed blobs written by `BlobsBackend` are read as well.
+    """
+
+    EXTENSION: str = '.pickle'
+    EXTENSIONS: Tuple[str, ...] = (EXTENSION, ARRAY_EXTENSION, FRAME_EXTENSION, REF_EXTENSION)
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        # variable name -> extension of its file
+        self._names: Dict[str, str] = None
+        self._directory_created: bool = False
+        self._pending: Dict[str, Any] = None
+
+    def _get_file_path(self, name: str, extension: str = EXTENSION) -> str:
+        return f'{self.path}/{name}{extension}'
+
+    def _get_names(self, refresh: bool = False) -> Dict[str, str]:
+        if self._names is None or refresh:
+            self._names = {}
+            if os.path.isdir(self.path):
+                for file_name in os.listdir(self.path):
+                    for extension in PickleFilesBackend.EXTENSIONS:
+                        if file_name.endswith(extension):
+                            self._names[file_name[:-len(extension)]] = extension
+                            break
+        return self._names
+
+    def _write_file(self, name: str, value: Any, codec: Codec) -> str:
+        """Writes variable file and returns its extension"""
+        # memory-mapped files could not be compressed
+        extension: str = (get_mapped_extension(value) if codec.name == NONE else None) or \
+            PickleFilesBackend.EXTENSION
+        file_path: str = self._get_file_path(name, extension)
+        if extension == PickleFilesBackend.EXTENSION:
+            tmp_file_path: str = f'{file_path}.tmp'
+            with open(tmp_file_path, 'wb') as file:
+                codecs.dump(value, file, codec)
+            os.replace(tmp_file_path, file_path)
+        else:
+            save_mapped(file_path, value)
+        return extension
+
+    def _write(self, name: str, value: Any):
+        if not self._directory_created:
+            os.makedirs(self.path, exist_ok=True)
+            self._directory_created = True
+        extension: str = self._write_file(name, value, self.get_codec(name))
+        usage.record(self.path, name, usage.WRITE, self._get_size(name, extension))
+        previous_extension: str = self._get_names().get(name)
+        if previous_extension is not None and previous_extension != extension:
+            self._remove(name, previous_extension)
+        self._get_names()[name] = extension
+
+    def _get_size(self, name: str, extension: str) -> int:
+        file_path: str = self._get_file_path(name, extension)
+        if extension == REF_EXTENSION:
+            return os.path.getsize(get_blob_path(get_blobs_dir(self.path), read_ref(file_path)))
+        if os.path.isdir(file_path):
+            return sum(entry.stat().st_size for entry in os.scandir(file_path))
+        return os.path.getsize(file_path)
+
+    def _read(self, name: str, extension: str) -> Any:
+        file_path: str = self._get_file_path(name, extension)
+        if extension == REF_EXTENSION:
+            file_path = get_blob_path(get_blobs_dir(self.path), read_ref(file_path))
+            if file_path.endswith(ARRAY_EXTENSION):
+                return load_mapped(file_path)
+            extension = PickleFilesBackend.EXTENSION
+        if extension == PickleFilesBackend.EXTENSION:
+            with open(file_path, 'rb') as file:
+                return codecs.load(file)
+        return load_mapped(file_path)
+
+    def _remove(self, name: str, extension: str):
+        file_path: str = self._get_file_path(name, extension)
+        if extension in (PickleFilesBackend.EXTENSION, REF_EXTENSION):
+            # referenced blob may be used by other stores, it's removed by cache garbage collection
+            os.remove(file_path)
+        else:
+            remove_mapped(file_path)
+
+    def save(self, name: str, value: Any):
+        if self._pending is not None:
+            self._pending[name] = value
+            return
+        self._write(name, value)
+
+    def load(self, name: str) -> Any:
+        if self._pending is not None and name in self._pending:
+            return self._pending[name]
+        known_extension: str = self._get_names().get(name)
+        if known_extension is not None:
+            try:
+                value: Any = self._read(name, known_extension)
+                usage.record(self.path, name, usage.READ)
+                return value
+            except FileNotFoundError:
+                pass
+        # variable may have been saved, replaced or deleted by other process after names were listed
+        known_extension = self._get_names(refresh=True).get(name)
+        if known_extension is None:
+            raise KeyError(name)
+        try:
+            value = self._read(name, known_extension)
+        except FileNotFoundError:
+            raise KeyError(name) from None
+        usage.record(self.path, name, usage.READ)
+        return value
+
+    def exists(self, name: str) -> bool:
+        if self._pending is not None and name in self._pending:
+            return True
+        # variable may have been saved by other process after names were listed
+        return name in self._get_names() or name in self._get_names(refresh=True)
+
+    def list(self) -> List[str]:
+        names: Set[str] = set(self._get_names(refresh=True))
+        if self._pending is not None:
+            names.update(self._pending.keys())
+        return sorted(names)
+
+    def delete(self, name: str):
+        if self._pending is not None:
+            self._pending.pop(name, None)
+        extension: str = self._get_names().get(name, PickleFilesBackend.EXTENSION)
+        try:
+            self._remove(name, extension)
+        except FileNotFoundError:
+            raise KeyError(name) from None
+        self._get_names().pop(name, None)
+        usage.record(self.path, name, usage.DELETE)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._pending is not None
+
+    @contextmanager
+    def transaction(self) -> Iterator[PickleFilesBackend]:
+        # files could not be replaced all at once, so writes are held back until the
+        # end of the block, each of them is still atomic, but crash while they are
+        # written leaves only some of them persisted
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = {}
+        try:
+            yield self
+            pending, self._pending = self._pending, None
+            for name, value in pending.items():
+                self._write(name, value)
+        finally:
+            self._pending = None
+
+
+class BlobsBackend(PickleFilesBackend):
+    """Stores variables as content-addressed blobs in `_cache/_blobs` directory shared by
+    all paramsets and versions, while paramset directory contains only `{name}.ref` files
+    referencing them. Identical values (e.g. the same dataset stored by multiple paramsets,
+    or unchanged variable in new experiment version) are written only once.
+    """
+
+    def _write_file(self, name: str, value: Any, codec: Codec) -> str:
+        blobs_dir: str = get_blobs_dir(self.path)
+        if codec.name == NONE and get_mapped_extension(value) == ARRAY_EXTENSION:
+            key: str = write_blob(blobs_dir, lambda file: save_array(file, value), suffix=ARRAY_EXTENSION)
+        else:
+            key: str = write_blob(blobs_dir, lambda file: codecs.dump(value, file, codec))
+        write_ref(self._get_file_path(name, REF_EXTENSION), key)
+        return REF_EXTENSION
+
+
+class SQLiteBackend(StoreBackend):
+    """Stores all variables of paramset in a single `store.sqlite` database file. Connection
+    is shared with write-behind thread, so its use is serialized with a lock, which is held
+    for the whole transaction.
+    """
+
+    FILE_NAME: str = 'store.sqlite'
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._connection: sqlite3.Connection = None
+        self._transaction_depth: int = 0
+        self._lock: threading.RLock = threading.RLock()
+
+    @property
+    def file_path(self) -> str:
+        return f'{self.path}/{SQLiteBackend.FILE_NAME}'
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.path, exist_ok=True)
+            # transactions are managed explicitly
+            self._connection = sqlite3.connect(
+                self.file_path,
+                isolation_level=None,
+                check_same_thread=False,
+                timeout=conf.settings.STORE_SQLITE_TIMEOUT
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS variables (name TEXT PRIMARY KEY, value BLOB NOT NULL)'
+            )
+        return self._connection
+
+    def save(self, name: str, value: Any):
+        payload: bytes = codecs.dumps(value, self.get_codec(name))
+        with self._lock:
+            self._get_connection().execute(
+                'INSERT OR REPLACE INTO variables (name, value) VALUES (?, ?)', (name, payload)
+            )
+        usage.record(self.path, name, usage.WRITE, len(payload))
+
+    def load(self, name: str) -> Any:
+        with self._lock:
+            row = self._get_connection().execute(
+                'SELECT value FROM variables WHERE name = ?', (name,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(name)
+        usage.record(self.path, name, usage.READ)
+        return codecs.loads(row[0])
+
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            return self._get_connection().execute(
+                'SELECT 1 FROM variables WHERE name = ?', (name,)
+            ).fetchone() is not None
+
+    def list(self) -> List[str]:
+        with self._lock:
+            return [
+                row[0] for row in self._get_connection().execute('SELECT name FROM variables ORDER BY name')
+            ]
+
+    def delete(self, name: str):
+        with self._lock:
+            cursor = self._get_connection().execute('DELETE FROM variables WHERE name = ?', (name,))
+            if cursor.rowcount == 0:
+                raise KeyError(name)
+        usage.record(self.path, name, usage.DELETE)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction_depth > 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[SQLiteBackend]:
+        # other threads must not write into transaction of this one
+        with self._lock:
+            connection: sqlite3.Connection = self._get_connection()
+            if self._transaction_depth == 0:
+                connection.execute('BEGIN IMMEDIATE')
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    connection.execute('ROLLBACK')
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                connection.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+BACKENDS: Dict[str, type] = {
+    PICKLE: PickleFilesBackend,
+    BLOBS: BlobsBackend,
+    SQLITE: SQLiteBackend,
+}
+
+
+def create_backend(path: str) -> StoreBackend:
+    """Creates backend for given paramset cache directory. Backend is selected with
+    `STORE_BACKEND` setting, except for directories already containing SQLite store
+    which are always read with SQLite backend.
+
+    Args:
+        path (str): paramset cache directory
+
+    Returns:
+        StoreBackend: store backend
+    """
+    if os.path.exists(f'{path}/{SQLiteBackend.FILE_NAME}'):
+        return SQLiteBackend(path)
+    backend_name: str = conf.settings.STORE_BACKEND
+    if backend_name not in BACKENDS:
+        raise ValueError(f'Unknown store backend: "{backend_name}"')
+    return BACKENDS[backend_name](path)
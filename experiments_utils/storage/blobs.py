@@ -0,0 +1,82 @@
+"""Contains content-addressed blobs storage shared by stores of all paramsets and versions
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from typing import IO, Any, Callable
+
+BLOBS_DIR_NAME: str = '_blobs'
+REF_EXTENSION: str = '.ref'
+
+
+class _HashingWriter:
+    """File-like object writing data to file and computing its hash on the fly"""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        self._file: IO[bytes] = file
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+
+def get_blobs_dir(store_path: str) -> str:
+    """
+    Args:
+        store_path (str): paramset store directory (`_cache/{version}/{paramset}`)
+
+    Returns:
+        str: blobs directory shared by all versions (`_cache/_blobs`)
+    """
+    return f'{os.path.dirname(os.path.dirname(store_path))}/{BLOBS_DIR_NAME}'
+
+
+def get_blob_path(blobs_dir: str, key: str) -> str:
+    return f'{blobs_dir}/{key[:2]}/{key}'
+
+
+def write_blob(blobs_dir: str, write: Callable[[IO[bytes]], Any], suffix: str = '') -> str:
+    """Writes blob, unless blob with identical content already exists.
+
+    Args:
+        blobs_dir (str): blobs directory
+        write (Callable[[IO[bytes]], Any]): function writing blob content to given file
+        suffix (str, optional): blob file name suffix (e.g. ".npy"). Defaults to ''.
+
+    Returns:
+        str: blob key
+    """
+    os.makedirs(blobs_dir, exist_ok=True)
+    tmp_file_path: str = f'{blobs_dir}/{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_file_path, 'wb') as file:
+            writer = _HashingWriter(file)
+            write(writer)
+        key: str = f'{writer.hash.hexdigest()}{suffix}'
+        blob_path: str = get_blob_path(blobs_dir, key)
+        if os.path.exists(blob_path):
+            return key
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(tmp_file_path, blob_path)
+        return key
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+
+def write_ref(ref_path: str, key: str):
+    tmp_ref_path: str = f'{ref_path}.tmp'
+    with open(tmp_ref_path, 'w', encoding='utf-8') as file:
+        file.write(key)
+    os.replace(tmp_ref_path, ref_path)
+
+
+def read_ref(ref_path: str) -> str:
+    with open(ref_path, 'r', encoding='utf-8') as file:
+        return file.read().strip()
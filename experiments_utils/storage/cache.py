@@ -0,0 +1,130 @@
+"""Contains in-memory cache of store variables limited by their estimated size
+"""
+from __future__ import annotations
+
+import pickle
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import cloudpickle
+
+_MISSING = object()
+_RAISE = object()
+
+
+class _SizeCounter:
+    """File-like object counting written bytes without keeping them"""
+
+    def __init__(self) -> None:
+        self.size: int = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return len(data)
+
+
+def estimate_size(value: Any) -> int:
+    """Estimates memory used by given value. Numpy arrays and pandas objects report
+    their buffers size, other values are measured by their pickled length.
+
+    Args:
+        value (Any): value
+
+    Returns:
+        int: estimated size in bytes
+    """
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(value, np.memmap):
+        # memory-mapped arrays are backed by files and their pages could be reclaimed by OS
+        return 0
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    nbytes: Any = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    counter = _SizeCounter()
+    try:
+        cloudpickle.dump(value, counter, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return sys.getsizeof(value)
+    return counter.size
+
+
+class VariablesCache:
+    """Cache of store variables. When `max_bytes` is given, least recently used variables
+    are evicted once estimated size of cached values exceeds it, and values larger than
+    the whole budget are not cached at all. Evicted variables are loaded again from store
+    backend on next access.
+    """
+
+    def __init__(self, max_bytes: int = None) -> None:
+        """
+        Args:
+            max_bytes (int, optional): max estimated size of cached values. Defaults to None (no limit).
+        """
+        self.max_bytes: int = max_bytes
+        self._values: OrderedDict[str, Tuple[Any, int]] = OrderedDict()
+        self.size_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def get(self, name: str, default: Any = _RAISE) -> Any:
+        if name not in self._values:
+            self.misses += 1
+            if default is _RAISE:
+                raise KeyError(name)
+            return default
+        self.hits += 1
+        self._values.move_to_end(name)
+        return self._values[name][0]
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __setitem__(self, name: str, value: Any):
+        self.pop(name, None)
+        if self.max_bytes is None:
+            self._values[name] = (value, 0)
+            return
+        size: int = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._values[name] = (value, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._values.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, name: str, default: Any = None) -> Any:
+        if name not in self._values:
+            return default
+        value, size = self._values.pop(name)
+        self.size_bytes -= size
+        return value
+
+    def snapshot(self) -> OrderedDict:
+        return OrderedDict(self._values)
+
+    def restore(self, snapshot: OrderedDict):
+        self._values = OrderedDict(snapshot)
+        self.size_bytes = sum(size for _, size in self._values.values())
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: cache hits, misses, evictions, number of cached variables and their estimated size
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'variables': len(self._values),
+            'size_bytes': self.size_bytes,
+        }
@@ -0,0 +1,401 @@
+"""Contains cache usage inspection and garbage collection of paramsets stores.
+
+Cache usage could be inspected and pruned from command line:
+```
+python -m experiments_utils.storage.cache_gc ./_cache usage
+python -m experiments_utils.storage.cache_gc ./_cache prune --quota 50G --policy lru --dry-run
+python -m experiments_utils.storage.cache_gc ./_cache pin 1.0.0
+```
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Set, Tuple
+
+from .. import conf
+from .arrays import FRAME_EXTENSION
+from .backends import PickleFilesBackend, SQLiteBackend
+from .blobs import BLOBS_DIR_NAME, REF_EXTENSION, get_blob_path, read_ref
+from .usage import (DELETE, LOG_EXTENSION, READ, USAGE_DIR_NAME, WRITE, get_usage_dir,
+                    is_tracking_enabled)
+
+LRU: str = 'lru'
+AGE: str = 'age'
+
+_INDEX_FILE_NAME: str = 'index.json'
+_PINNED_FILE_NAME: str = 'pinned.json'
+_LOCK_FILE_NAME: str = '.lock'
+_LOCK_TIMEOUT: float = 600.0  # seconds after which lock is considered stale
+_LOG_RETENTION: float = 24 * 60 * 60  # seconds after which fully consolidated logs are removed
+
+# variable entry: size in bytes, creation time, last access time
+_SIZE, _CREATED, _LAST_ACCESS = range(3)
+
+
+def _parse_size(value: str) -> int:
+    units: Dict[str, int] = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    value = value.strip().upper().rstrip('B')
+    if value[-1:] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}TB'
+
+
+class CacheManager:
+    """Inspects and limits size of experiments cache directory. If `CACHE_USAGE_TRACKING`
+    setting is enabled (or `CACHE_QUOTA_BYTES` is set), store operations are logged by each
+    process and consolidated incrementally into usage index, so whole cache tree is scanned
+    only when index is created or on explicit rescan. Otherwise whole cache tree, including
+    each sqlite store, is scanned on each inspection or prune, which is slow for large caches,
+    and variables files modification times are used as their last access times.
+
+    Paramsets stores are the unit of eviction: least recently used (`lru` policy) or oldest
+    (`age` policy) paramsets are removed until cache fits into quota. Pinned versions are
+    never removed.
+
+    Example:
+    ```python
+    from experiments_utils.storage.cache_gc import CacheManager
+
+    manager = CacheManager('./_cache')
+    manager.pin('1.0.0')
+    removed = manager.prune(quota_bytes=50 * 1024 ** 3)
+    ```
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        """
+        Args:
+            cache_dir (str): cache directory (`_cache`)
+        """
+        self.cache_dir: str = cache_dir
+        self._usage_dir: str = get_usage_dir(cache_dir)
+        self._index_path: str = os.path.join(self._usage_dir, _INDEX_FILE_NAME)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        os.makedirs(self._usage_dir, exist_ok=True)
+        lock_path: str = os.path.join(self._usage_dir, _LOCK_FILE_NAME)
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > _LOCK_TIMEOUT:
+                        os.remove(lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            os.remove(lock_path)
+
+    def _iter_paramsets_dirs(self) -> Iterator[Tuple[str, str, str]]:
+        if not os.path.isdir(self.cache_dir):
+            return
+        for version_entry in os.scandir(self.cache_dir):
+            if not version_entry.is_dir() or version_entry.name in (BLOBS_DIR_NAME, USAGE_DIR_NAME):
+                continue
+            for paramset_entry in os.scandir(version_entry.path):
+                if paramset_entry.is_dir():
+                    yield version_entry.name, paramset_entry.name, paramset_entry.path
+
+    def _scan_paramset(self, path: str) -> Dict[str, list]:
+        variables: Dict[str, list] = {}
+        for entry in os.scandir(path):
+            stat = entry.stat()
+            if entry.name == SQLiteBackend.FILE_NAME:
+                connection = sqlite3.connect(entry.path)
+                try:
+                    for name, size in connection.execute('SELECT name, length(value) FROM variables'):
+                        variables[name] = [size, stat.st_mtime, stat.st_mtime]
+                finally:
+                    connection.close()
+                continue
+            for extension in PickleFilesBackend.EXTENSIONS:
+                if not entry.name.endswith(extension):
+                    continue
+                if extension == REF_EXTENSION:
+                    size: int = os.path.getsize(get_blob_path(
+                        os.path.join(self.cache_dir, BLOBS_DIR_NAME), read_ref(entry.path)))
+                elif extension == FRAME_EXTENSION:
+                    size = sum(file_entry.stat().st_size for file_entry in os.scandir(entry.path))
+                else:
+                    size = stat.st_size
+                variables[entry.name[:-len(extension)]] = [size, stat.st_mtime, stat.st_mtime]
+                break
+        return variables
+
+    def _scan(self) -> dict:
+        index: dict = {'offsets': {}, 'variables': {}, 'tracked': is_tracking_enabled()}
+        # logs written before the scan are already reflected by files on disk
+        if os.path.isdir(self._usage_dir):
+            for entry in os.scandir(self._usage_dir):
+                if entry.name.endswith(LOG_EXTENSION):
+                    index['offsets'][entry.name] = entry.stat().st_size
+        for version, paramset_name, path in self._iter_paramsets_dirs():
+            index['variables'].setdefault(version, {})[paramset_name] = self._scan_paramset(path)
+        return index
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self._index_path):
+            return self._scan()
+        with open(self._index_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _save_index(self, index: dict):
+        tmp_index_path: str = f'{self._index_path}.tmp'
+        with open(tmp_index_path, 'w', encoding='utf-8') as file:
+            json.dump(index, file)
+        os.replace(tmp_index_path, self._index_path)
+
+    def _apply_logs(self, index: dict):
+        offsets: Dict[str, int] = index['offsets']
+        variables: Dict[str, Dict[str, Dict[str, list]]] = index['variables']
+        for entry in os.scandir(self._usage_dir):
+            if not entry.name.endswith(LOG_EXTENSION):
+                continue
+            offset: int = offsets.get(entry.name, 0)
+            with open(entry.path, 'rb') as file:
+                file.seek(offset)
+                while True:
+                    line: bytes = file.readline()
+                    # last line may be still written by its process
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    operation, version, paramset_name, name, size, timestamp = json.loads(line)
+                    paramset: Dict[str, list] = variables.setdefault(version, {}).setdefault(paramset_name, {})
+                    if operation == WRITE:
+                        created: float = paramset[name][_CREATED] if name in paramset else timestamp
+                        paramset[name] = [size, created, timestamp]
+                    elif operation == READ:
+                        if name in paramset:
+                            paramset[name][_LAST_ACCESS] = timestamp
+                    elif operation == DELETE:
+                        paramset.pop(name, None)
+            offsets[entry.name] = offset
+            if offset == entry.stat().st_size and time.time() - entry.stat().st_mtime > _LOG_RETENTION:
+                try:
+                    os.remove(entry.path)
+                    offsets.pop(entry.name)
+                except OSError:
+                    # log may be still opened by its process
+                    pass
+
+    def consolidate(self, rescan: bool = False) -> dict:
+        """Applies new usage logs entries to usage index.
+
+        Args:
+            rescan (bool, optional): if True, index is rebuilt by scanning whole cache tree. Defaults to False.
+
+        Returns:
+            dict: usage index
+        """
+        with self._lock():
+            index: dict = None if rescan or not is_tracking_enabled() else self._load_index()
+            # index isn't updated by store operations, or it was built when they were not logged
+            if index is None or not index.get('tracked', False):
+                index = self._scan()
+            self._apply_logs(index)
+            self._save_index(index)
+        return index
+
+    def pinned_versions(self) -> Set[str]:
+        """
+        Returns:
+            Set[str]: versions pinned with `pin` method or `CACHE_PINNED_VERSIONS` setting
+        """
+        pinned: Set[str] = set(map(str, conf.settings.CACHE_PINNED_VERSIONS)) if conf.settings is not None else set()
+        return pinned | self._load_pinned()
+
+    def _load_pinned(self) -> Set[str]:
+        pinned_path: str = os.path.join(self._usage_dir, _PINNED_FILE_NAME)
+        if not os.path.exists(pinned_path):
+            return set()
+        with open(pinned_path, 'r', encoding='utf-8') as file:
+            return set(json.load(file))
+
+    def _save_pinned(self, versions: Set[str]):
+        os.makedirs(self._usage_dir, exist_ok=True)
+        with open(os.path.join(self._usage_dir, _PINNED_FILE_NAME), 'w', encoding='utf-8') as file:
+            json.dump(sorted(versions), file)
+
+    def pin(self, version: str):
+        """Protects version from being removed by garbage collection."""
+        with self._lock():
+            self._save_pinned(self._load_pinned() | {str(version)})
+
+    def unpin(self, version: str):
+        with self._lock():
+            self._save_pinned(self._load_pinned() - {str(version)})
+
+    def usage(self) -> List[dict]:
+        """
+        Returns:
+            List[dict]: version, paramset name, number of variables, size in bytes, creation and
+                last access time of each paramset store
+        """
+        index: dict = self.consolidate()
+        pinned: Set[str] = self.pinned_versions()
+        rows: List[dict] = []
+        for version, paramsets in index['variables'].items():
+            for paramset_name, variables in paramsets.items():
+                if len(variables) == 0:
+                    continue
+                rows.append({
+                    'version': version,
+                    'paramset_name': paramset_name,
+                    'variables': len(variables),
+                    'size_bytes': sum(entry[_SIZE] or 0 for entry in variables.values()),
+                    'created': min(entry[_CREATED] for entry in variables.values()),
+                    'last_access': max(entry[_LAST_ACCESS] for entry in variables.values()),
+                    'pinned': version in pinned,
+                })
+        return rows
+
+    def prune(
+        self,
+        quota_bytes: int = None,
+        max_age_days: float = None,
+        policy: str = LRU,
+        protected_versions: List[str] = None,
+        dry_run: bool = False,
+    ) -> List[dict]:
+        """Removes paramsets stores older than `max_age_days` and then, if cache is still larger
+        than `quota_bytes`, next paramsets stores in eviction order until it fits into quota.
+
+        Args:
+            quota_bytes (int, optional): max cache size. Default is `CACHE_QUOTA_BYTES` setting.
+            max_age_days (float, optional): max age of paramsets stores (since their last access
+                for "lru" policy or creation for "age" policy). Defaults to None.
+            policy (str, optional): eviction order: "lru" (least recently used first) or "age"
+                (oldest first). Defaults to "lru".
+            protected_versions (List[str], optional): versions protected in addition to pinned ones.
+                Defaults to None.
+            dry_run (bool, optional): if True, paramsets stores are only reported but not removed.
+                Defaults to False.
+
+        Returns:
+            List[dict]: removed (or to be removed on dry run) paramsets, as returned by `usage` method
+        """
+        if policy not in (LRU, AGE):
+            raise ValueError(f'Unknown cache eviction policy: "{policy}"')
+        if quota_bytes is None and conf.settings is not None:
+            quota_bytes = conf.settings.CACHE_QUOTA_BYTES
+        protected: Set[str] = self.pinned_versions() | set(map(str, protected_versions or []))
+        rows: List[dict] = self.usage()
+        total_size: int = sum(row['size_bytes'] for row in rows)
+        order_key: str = 'last_access' if policy == LRU else 'created'
+        candidates: List[dict] = sorted(
+            (row for row in rows if row['version'] not in protected), key=lambda row: row[order_key])
+        min_time: float = time.time() - max_age_days * 24 * 60 * 60 if max_age_days is not None else None
+        removed: List[dict] = []
+        for row in candidates:
+            expired: bool = min_time is not None and row[order_key] < min_time
+            over_quota: bool = quota_bytes is not None and total_size > quota_bytes
+            if not expired and not over_quota:
+                break
+            removed.append(row)
+            total_size -= row['size_bytes']
+        if dry_run or len(removed) == 0:
+            return removed
+        with self._lock():
+            index: dict = self._load_index()
+            for row in removed:
+                shutil.rmtree(os.path.join(self.cache_dir, row['version'], row['paramset_name']), ignore_errors=True)
+                index['variables'].get(row['version'], {}).pop(row['paramset_name'], None)
+            self._save_index(index)
+            self._remove_unreferenced_blobs()
+        return removed
+
+    def _remove_unreferenced_blobs(self):
+        blobs_dir: str = os.path.join(self.cache_dir, BLOBS_DIR_NAME)
+        if not os.path.isdir(blobs_dir):
+            return
+        referenced: Set[str] = set()
+        for _, _, path in self._iter_paramsets_dirs():
+            for entry in os.scandir(path):
+                if entry.name.endswith(REF_EXTENSION):
+                    referenced.add(read_ref(entry.path))
+        for prefix_entry in os.scandir(blobs_dir):
+            if not prefix_entry.is_dir():
+                continue
+            for entry in os.scandir(prefix_entry.path):
+                # blobs being written have temporary names and are never removed
+                if entry.name not in referenced and not entry.name.endswith('.tmp') and \
+                        time.time() - entry.stat().st_mtime > _LOCK_TIMEOUT:
+                    os.remove(entry.path)
+
+
+def _resolve_cache_dir(path: str) -> str:
+    if os.path.basename(os.path.normpath(path)) != '_cache' and os.path.isdir(os.path.join(path, '_cache')):
+        return os.path.join(path, '_cache')
+    return path
+
+
+def main(argv: List[str] = None):
+    """Command line entry point for inspecting and pruning experiments cache"""
+    if conf.settings is None:
+        from experiments_utils import \
+            settings  # pylint: disable=import-outside-toplevel
+        conf.settings = settings
+    parser = argparse.ArgumentParser(description='Inspect and prune experiments cache directory')
+    parser.add_argument('cache_dir', help='cache directory ("_cache") or experiment directory containing it')
+    commands = parser.add_subparsers(dest='command', required=True)
+    usage_parser = commands.add_parser('usage', help='show cache usage by paramsets')
+    usage_parser.add_argument('--rescan', action='store_true', help='rebuild usage index by scanning cache tree')
+    prune_parser = commands.add_parser('prune', help='remove paramsets stores')
+    prune_parser.add_argument('--quota', type=_parse_size, default=None, help='max cache size, e.g. "50G"')
+    prune_parser.add_argument('--max-age-days', type=float, default=None)
+    prune_parser.add_argument('--policy', choices=(LRU, AGE), default=LRU)
+    prune_parser.add_argument('--dry-run', action='store_true')
+    for command in ('pin', 'unpin'):
+        commands.add_parser(command, help=f'{command} version').add_argument('version')
+    args = parser.parse_args(argv)
+
+    manager = CacheManager(_resolve_cache_dir(args.cache_dir))
+    if args.command == 'usage':
+        if args.rescan:
+            manager.consolidate(rescan=True)
+        rows: List[dict] = manager.usage()
+        by_version: Dict[str, List[dict]] = {}
+        for row in rows:
+            by_version.setdefault(row['version'], []).append(row)
+        for version, version_rows in sorted(by_version.items()):
+            pinned: str = ' (pinned)' if version_rows[0]['pinned'] else ''
+            print(f'{version}{pinned}: {len(version_rows)} paramsets, '
+                  f'{_format_size(sum(row["size_bytes"] for row in version_rows))}')
+        print(f'Total: {_format_size(sum(row["size_bytes"] for row in rows))}')
+    elif args.command == 'prune':
+        removed: List[dict] = manager.prune(
+            quota_bytes=args.quota, max_age_days=args.max_age_days, policy=args.policy, dry_run=args.dry_run)
+        for row in removed:
+            print(f'{"Would remove" if args.dry_run else "Removed"} {row["version"]}/{row["paramset_name"]} '
+                  f'({_format_size(row["size_bytes"])})')
+        print(f'Freed: {_format_size(sum(row["size_bytes"] for row in removed))}')
+    elif args.command == 'pin':
+        manager.pin(args.version)
+    elif args.command == 'unpin':
+        manager.unpin(args.version)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""Contains compression codecs applied to pickled store variables. Compressed payloads
+are recognized by their magic bytes, so variables saved with any codec could be read
+regardless of currently configured one.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import lzma
+import pickle
+import time
+from typing import IO, Any, Dict, List, Union
+
+import cloudpickle
+
+from .. import conf
+
+NONE: str = 'none'
+GZIP: str = 'gzip'
+LZMA: str = 'lzma'
+LZ4: str = 'lz4'
+ZSTD: str = 'zstd'
+
+
+class Codec:
+    """Base class for store codecs wrapping file objects with compressing writer
+    and decompressing reader.
+    """
+
+    name: str = None
+    magic: bytes = None
+
+    def __init__(self, level: int = None) -> None:
+        """
+        Args:
+            level (int, optional): compression level. Default is codec specific.
+        """
+        self.level: int = level
+
+    def writer(self, file: IO[bytes]) -> IO[bytes]:
+        """Returns file object compressing data written to it. It must be closed to flush
+        compressed data, underlying file stays open.
+        """
+        raise NotImplementedError()
+
+    def reader(self, file: IO[bytes]) -> IO[bytes]:
+        """Returns file object decompressing data read from given file.
+        """
+        raise NotImplementedError()
+
+    def compress(self, data: bytes) -> bytes:
+        buffer = io.BytesIO()
+        with self.writer(buffer) as writer:
+            writer.write(data)
+        return buffer.getvalue()
+
+    def decompress(self, data: bytes) -> bytes:
+        with self.reader(io.BytesIO(data)) as reader:
+            return reader.read()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(level={self.level})'
+
+
+class _NoneCodec(Codec):
+
+    name: str = NONE
+
+    def writer(self, file: IO[bytes]) -> IO[bytes]:
+        return _NonClosingWrapper(file)
+
+    def reader(self, file: IO[bytes]) -> IO[bytes]:
+        return _NonClosingWrapper(file)
+
+
+class _NonClosingWrapper(io.RawIOBase):
+
+    def __init__(self, file: IO[bytes]) -> None:
+        super().__init__()
+        self._file: IO[bytes] = file
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        return self._file.write(data)
+
+    def readinto(self, buffer) -> int:
+        return self._file.readinto(buffer)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._file.readline(size)
+
+
+class GzipCodec(Codec):
+    """Standard library zlib (DEFLATE) compression in gzip container"""
+
+    name: str = GZIP
+    magic: bytes = b'\x1f\x8b'
+
+    def writer(self, file: IO[bytes]) -> IO[bytes]:
+        return gzip.GzipFile(fileobj=file, mode='wb', compresslevel=self.level or 6, mtime=0)
+
+    def reader(self, file: IO[bytes]) -> IO[bytes]:
+        return gzip.GzipFile(fileobj=file, mode='rb')
+
+
+class LzmaCodec(Codec):
+    """Standard library LZMA (xz) compression - slow but with the best ratio"""
+
+    name: str = LZMA
+    magic: bytes = b'\xfd7zXZ\x00'
+
+    def writer(self, file: IO[bytes]) -> IO[bytes]:
+        return lzma.LZMAFile(file, mode='wb', preset=self.level if self.level is not None else 6)
+
+    def reader(self, file: IO[bytes]) -> IO[bytes]:
+        return lzma.LZMAFile(file, mode='rb')
+
+
+class Lz4Codec(Codec):
+    """Very fast LZ4 frame compression, requires `lz4` package"""
+
+    name: str = LZ4
+    magic: bytes = b'\x04\x22\x4d\x18'
+
+    def writer(self, file: IO[bytes]) -> IO[bytes]:
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+        return lz4.frame.LZ4FrameFile(file, mode='wb', compression_level=self.level or 0)
+
+    def reader(self, file: IO[bytes]) -> IO[bytes]:
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+        return lz4.frame.LZ4FrameFile(file, mode='rb')
+
+
+class ZstdCodec(Codec):
+    """Fast Zstandard compression with good ratio, requires `zstandard` package"""
+
+    name: str = ZSTD
+    magic: bytes = b'\x28\xb5\x2f\xfd'
+
+    def writer(self, file: IO[bytes]) -> IO[bytes]:
+        import zstandard  # pylint: disable=import-outside-toplevel
+        return zstandard.ZstdCompressor(level=self.level or 3).stream_writer(file, closefd=False)
+
+    def reader(self, file: IO[bytes]) -> IO[bytes]:
+        import zstandard  # pylint: disable=import-outside-toplevel
+        # unpickler needs `readline` which decompression reader does not implement
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(file, closefd=False))
+
+
+CODECS: Dict[str, type] = {
+    NONE: _NoneCodec,
+    GZIP: GzipCodec,
+    'zlib': GzipCodec,
+    LZMA: LzmaCodec,
+    LZ4: Lz4Codec,
+    ZSTD: ZstdCodec,
+}
+
+_MAGIC_LENGTH: int = max(len(codec.magic) for codec in CODECS.values() if codec.magic is not None)
+
+
+def get_codec(codec: Union[str, Codec, None]) -> Codec:
+    """
+    Args:
+        codec (Union[str, Codec, None]): codec name ("none", "gzip" (or "zlib"), "lzma", "lz4", "zstd")
+            or codec instance. None means codec set with `STORE_CODEC` setting.
+
+    Returns:
+        Codec: codec
+    """
+    if codec is None:
+        codec = conf.settings.STORE_CODEC
+    if isinstance(codec, Codec):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(f'Unknown store codec: "{codec}"')
+    return CODECS[codec]()
+
+
+def detect_codec(header: bytes) -> Codec:
+    """Returns codec which produced payload starting with given bytes. Uncompressed
+    pickles are recognized as "none" codec.
+    """
+    for codec_class in (GzipCodec, LzmaCodec, Lz4Codec, ZstdCodec):
+        if header.startswith(codec_class.magic):
+            return codec_class()
+    return _NoneCodec()
+
+
+def dump(value: Any, file: IO[bytes], codec: Codec):
+    """Pickles value to file compressing it on the fly."""
+    with codec.writer(file) as writer:
+        cloudpickle.dump(value, writer, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load(file: IO[bytes]) -> Any:
+    """Unpickles value from file saved with any codec."""
+    file = file if isinstance(file, io.BufferedReader) else io.BufferedReader(_NonClosingWrapper(file))
+    codec: Codec = detect_codec(file.peek(_MAGIC_LENGTH)[:_MAGIC_LENGTH])
+    with codec.reader(file) as reader:
+        return pickle.load(reader)
+
+
+def dumps(value: Any, codec: Codec) -> bytes:
+    buffer = io.BytesIO()
+    dump(value, buffer, codec)
+    return buffer.getvalue()
+
+
+def loads(data: bytes) -> Any:
+    return load(io.BufferedReader(io.BytesIO(data)))
+
+
+def compression_report(value: Any, codecs: List[Union[str, Codec]] = None):
+    """Measures pickled size and saving/loading time of given value with each codec.
+    Useful for choosing codec for large store variables.
+
+    Example:
+    ```python
+    from experiments_utils.storage.codecs import compression_report
+
+    print(compression_report(model))
+    #   codec    size_bytes  ratio  save_seconds  load_seconds
+    # 0  none      52428931   1.00      0.051         0.032
+    # 1  gzip      11036420   4.75      1.624         0.210
+    ...
+    ```
+
+    Args:
+        value (Any): value to measure
+        codecs (List[Union[str, Codec]], optional): codecs to compare. Default are all
+            codecs available in current environment.
+
+    Returns:
+        pd.DataFrame: report with row for each codec
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    if codecs is None:
+        codecs = [NONE, GZIP, LZMA, LZ4, ZSTD]
+    rows: List[dict] = []
+    uncompressed_size: int = None
+    for codec in codecs:
+        codec = get_codec(codec)
+        try:
+            start_time: float = time.perf_counter()
+            data: bytes = dumps(value, codec)
+            save_seconds: float = time.perf_counter() - start_time
+        except ImportError:
+            # optional codec package is not installed
+            continue
+        start_time = time.perf_counter()
+        loads(data)
+        load_seconds: float = time.perf_counter() - start_time
+        if uncompressed_size is None and codec.name == NONE:
+            uncompressed_size = len(data)
+        rows.append({
+            'codec': codec.name,
+            'size_bytes': len(data),
+            'save_seconds': save_seconds,
+            'load_seconds': load_seconds,
+        })
+    report = pd.DataFrame(rows, columns=['codec', 'size_bytes', 'save_seconds', 'load_seconds'])
+    if uncompressed_size is not None:
+        report.insert(2, 'ratio', uncompressed_size / report['size_bytes'])
+    return report
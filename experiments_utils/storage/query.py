@@ -0,0 +1,210 @@
+"""Contains API for reading store variables of many paramsets at once, e.g. in analysis notebooks
+"""
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from multiprocess.pool import Pool
+
+from .. import conf
+from ..store import get_cache_dir
+from .backends import StoreBackend, create_backend
+from .blobs import BLOBS_DIR_NAME
+from .usage import USAGE_DIR_NAME
+
+_SKIP = object()
+
+
+def _load_variable(arg: Tuple[str, str]) -> Tuple[str, bool, Any]:
+    """Returns paramset name, whether it has given variable and its value"""
+    path, name = arg
+    backend: StoreBackend = create_backend(path)
+    try:
+        return os.path.basename(path), True, backend.load(name)
+    except KeyError:
+        return os.path.basename(path), False, None
+    finally:
+        backend.close()
+
+
+class StoreQuery:
+    """Reads stores of experiment paramsets directly from cache directory, without creating
+    experiment context for each of them. Variables are loaded for all matching paramsets in
+    parallel.
+
+    Example:
+    ```python
+    from experiments_utils.storage.query import StoreQuery
+
+    query = StoreQuery('./experiments/my_experiment')
+    print(query.versions())
+    accuracies = query.load('1.0.0', 'accuracy', paramsets='iris.*')
+    df = query.load_frame('1.0.0', ['accuracy', 'training_time'])
+    ```
+    """
+
+    def __init__(
+        self,
+        current_dir: str,
+        n_jobs: int = 8,
+        use_processes: bool = False,
+        progress: Union[bool, Callable[[int, int], None]] = False
+    ) -> None:
+        """
+        Args:
+            current_dir (str): experiment directory (the one containing `_cache` directory, unless
+                `EXPERIMENT_CACHE_DIR` setting is set)
+            n_jobs (int, optional): number of threads (or processes) loading variables. Defaults to 8.
+            use_processes (bool, optional): whether to load variables in processes instead of threads.
+                Useful when unpickling is CPU bound, but loaded values have to be pickled again to be
+                sent back. Defaults to False.
+            progress (Union[bool, Callable[[int, int], None]], optional): if True, loading progress
+                is logged. It could also be function called with number of loaded and all paramsets.
+                Defaults to False.
+        """
+        if conf.settings is None:
+            from experiments_utils import \
+                settings  # pylint: disable=import-outside-toplevel
+            conf.settings = settings
+        self._cache_dir: str = get_cache_dir(current_dir)
+        self.n_jobs: int = n_jobs
+        self.use_processes: bool = use_processes
+        self._progress: Union[bool, Callable[[int, int], None]] = progress
+        self._logger: logging.Logger = logging.getLogger('store_query')
+
+    def versions(self) -> List[str]:
+        """
+        Returns:
+            List[str]: versions of experiment having stores in cache
+        """
+        if not os.path.isdir(self._cache_dir):
+            return []
+        return sorted(
+            entry.name for entry in os.scandir(self._cache_dir)
+            if entry.is_dir() and entry.name not in (BLOBS_DIR_NAME, USAGE_DIR_NAME)
+        )
+
+    def paramsets(self, version: str, pattern: Union[str, Iterable[str]] = None) -> List[str]:
+        """
+        Args:
+            version (str): experiment version
+            pattern (Union[str, Iterable[str]], optional): glob pattern (e.g. "iris.*") or list
+                of paramsets names to return. Defaults to None (all paramsets).
+
+        Returns:
+            List[str]: names of paramsets having stores in given version
+        """
+        version_dir: str = f'{self._cache_dir}/{version}'
+        if not os.path.isdir(version_dir):
+            return []
+        names: List[str] = sorted(entry.name for entry in os.scandir(version_dir) if entry.is_dir())
+        if pattern is None:
+            return names
+        if isinstance(pattern, str):
+            return fnmatch.filter(names, pattern)
+        selected = set(pattern)
+        return [name for name in names if name in selected]
+
+    def variables(self, version: str, paramset_name: str, include_hidden: bool = False) -> List[str]:
+        """
+        Args:
+            version (str): experiment version
+            paramset_name (str): paramset name
+            include_hidden (bool, optional): whether to include internal variables (with names
+                starting with "__", e.g. paramset result or cached step results). Defaults to False.
+
+        Returns:
+            List[str]: names of variables stored by given paramset
+        """
+        backend: StoreBackend = create_backend(f'{self._cache_dir}/{version}/{paramset_name}')
+        try:
+            names: List[str] = backend.list()
+        finally:
+            backend.close()
+        if include_hidden:
+            return names
+        return [name for name in names if not name.startswith('__')]
+
+    def _report_progress(self, loaded: int, total: int):
+        if callable(self._progress):
+            self._progress(loaded, total)
+        elif self._progress and (loaded == total or loaded % max(total // 20, 1) == 0):
+            self._logger.info(f'Loaded {loaded}/{total} paramsets')
+
+    def load(
+        self,
+        version: str,
+        variable: str,
+        paramsets: Union[str, Iterable[str]] = None,
+        default: Any = _SKIP
+    ) -> Dict[str, Any]:
+        """Loads variable of all matching paramsets.
+
+        Args:
+            version (str): experiment version
+            variable (str): variable name
+            paramsets (Union[str, Iterable[str]], optional): glob pattern or list of paramsets names.
+                Defaults to None (all paramsets).
+            default (Any, optional): value returned for paramsets which don't have given variable.
+                Default is to omit such paramsets.
+
+        Returns:
+            Dict[str, Any]: variable values by paramsets names
+        """
+        paramsets_names: List[str] = self.paramsets(version, paramsets)
+        args: List[Tuple[str, str]] = [
+            (f'{self._cache_dir}/{version}/{paramset_name}', variable) for paramset_name in paramsets_names
+        ]
+        values: Dict[str, Any] = {}
+        if len(args) == 0:
+            return values
+        if self.use_processes:
+            with Pool(self.n_jobs) as pool:
+                self._collect(pool.imap_unordered(_load_variable, args), len(args), values)
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                self._collect(executor.map(_load_variable, args), len(args), values)
+        # keep paramsets order regardless of loading order, missing values are taken
+        # from default here, as sentinel object doesn't survive pickling to other process
+        return {
+            paramset_name: values[paramset_name] if paramset_name in values else default
+            for paramset_name in paramsets_names
+            if paramset_name in values or default is not _SKIP
+        }
+
+    def _collect(self, results: Iterable[Tuple[str, bool, Any]], total: int, values: Dict[str, Any]):
+        for i, (paramset_name, found, value) in enumerate(results, start=1):
+            if found:
+                values[paramset_name] = value
+            self._report_progress(i, total)
+
+    def load_frame(
+        self,
+        version: str,
+        variables: List[str],
+        paramsets: Union[str, Iterable[str]] = None,
+    ):
+        """Loads scalar variables of all matching paramsets into DataFrame.
+
+        Args:
+            version (str): experiment version
+            variables (List[str]): variables names
+            paramsets (Union[str, Iterable[str]], optional): glob pattern or list of paramsets names.
+                Defaults to None (all paramsets).
+
+        Returns:
+            pd.DataFrame: dataframe indexed by paramsets names with column for each variable,
+                missing values are NaN
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        columns: Dict[str, Dict[str, Any]] = {
+            variable: self.load(version, variable, paramsets=paramsets) for variable in variables
+        }
+        df = pd.DataFrame(columns, columns=variables, index=self.paramsets(version, paramsets))
+        df.index.name = 'paramset_name'
+        return df
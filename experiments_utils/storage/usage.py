@@ -0,0 +1,96 @@
+"""Contains incremental tracking of store variables size and last access time. Each process
+appends its store operations to its own log file in `_cache/_usage` directory, logs are
+consolidated into usage index only when cache usage is inspected or pruned.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import IO
+
+from .. import conf
+
+USAGE_DIR_NAME: str = '_usage'
+LOG_EXTENSION: str = '.log'
+
+WRITE: str = 'write'
+READ: str = 'read'
+DELETE: str = 'delete'
+
+
+class _UsageLog:
+
+    def __init__(self, usage_dir: str) -> None:
+        os.makedirs(usage_dir, exist_ok=True)
+        self.pid: int = os.getpid()
+        file_name: str = f'{socket.gethostname()}-{self.pid}{LOG_EXTENSION}'
+        self._file: IO[str] = open(
+            os.path.join(usage_dir, file_name), 'a', encoding='utf-8', newline='\n')
+        self._lock: threading.Lock = threading.Lock()
+
+    def write(self, record: list):
+        line: str = f'{json.dumps(record)}\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+# open usage logs of current process by usage directory
+_logs: dict = {}
+_logs_lock: threading.Lock = threading.Lock()
+
+
+def _get_log(usage_dir: str) -> _UsageLog:
+    log: _UsageLog = _logs.get(usage_dir)
+    if log is not None and log.pid == os.getpid():
+        return log
+    with _logs_lock:
+        log = _logs.get(usage_dir)
+        # log files are not shared with forked processes
+        if log is None or log.pid != os.getpid():
+            log = _logs[usage_dir] = _UsageLog(usage_dir)
+        return log
+
+
+def get_usage_dir(cache_dir: str) -> str:
+    return os.path.join(cache_dir, USAGE_DIR_NAME)
+
+
+def is_tracking_enabled() -> bool:
+    """
+    Returns:
+        bool: True if store operations are logged, either because of `CACHE_USAGE_TRACKING`
+            setting or because `CACHE_QUOTA_BYTES` is set and cache is pruned after each run
+    """
+    if conf.settings is None:
+        return False
+    return conf.settings.CACHE_USAGE_TRACKING or conf.settings.CACHE_QUOTA_BYTES is not None
+
+
+def record(store_path: str, name: str, operation: str, size: int = None):
+    """Records store operation in usage log of current process.
+
+    Args:
+        store_path (str): paramset store directory (`_cache/{version}/{paramset}`)
+        name (str): variable name
+        operation (str): "write", "read" or "delete"
+        size (int, optional): size of written variable in bytes. Defaults to None.
+    """
+    if not is_tracking_enabled():
+        return
+    version_dir, paramset_name = os.path.split(os.path.normpath(store_path))
+    cache_dir, version = os.path.split(version_dir)
+    try:
+        _get_log(get_usage_dir(cache_dir)).write(
+            [operation, version, paramset_name, name, size, time.time()]
+        )
+    except OSError:
+        # usage tracking must never break experiment
+        pass
@@ -0,0 +1,141 @@
+"""Contains background writer persisting store variables without blocking experiment code
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from .. import conf
+from .backends import StoreBackend
+
+_NOT_PENDING = object()
+
+
+class _WriteBehindWriter:
+    """Background thread saving store variables. Writes are queued in order of their first
+    assignment, and assigning the same variable again before it's written only replaces
+    the queued value, so only the last one is saved. Writes and their errors are tracked
+    by store paths, so that paramsets running in threads of the same process could be
+    flushed separately.
+    """
+
+    def __init__(self) -> None:
+        self._pid: int = os.getpid()
+        self._condition: threading.Condition = threading.Condition()
+        # (store path, variable name) -> (backend, value)
+        self._pending: OrderedDict[Tuple[str, str], Tuple[StoreBackend, Any]] = OrderedDict()
+        self._in_progress: Tuple[Tuple[str, str], Any] = None
+        # store path -> errors raised while saving its variables
+        self._errors: Dict[str, List[Exception]] = {}
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name='store_writer', daemon=True)
+        self._thread.start()
+
+    def schedule(self, backend: StoreBackend, name: str, value: Any):
+        key: Tuple[str, str] = (backend.path, name)
+        with self._condition:
+            # limit memory held by values waiting to be written
+            while key not in self._pending and len(self._pending) >= conf.settings.STORE_WRITE_BEHIND_MAX_PENDING:
+                self._condition.wait()
+            self._pending[key] = (backend, value)
+            self._condition.notify_all()
+
+    def get_pending(self, path: str, name: str) -> Any:
+        key: Tuple[str, str] = (path, name)
+        with self._condition:
+            if key in self._pending:
+                return self._pending[key][1]
+            if self._in_progress is not None and self._in_progress[0] == key:
+                return self._in_progress[1]
+        return _NOT_PENDING
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while len(self._pending) == 0:
+                    self._condition.wait()
+                key, (backend, value) = self._pending.popitem(last=False)
+                self._in_progress = (key, value)
+                self._condition.notify_all()
+            try:
+                backend.save(key[1], value)
+            except Exception as error:
+                logging.getLogger('store').error(
+                    f'Failed to save store variable "{key[1]}" in "{key[0]}": {error}')
+                with self._condition:
+                    self._errors.setdefault(key[0], []).append(error)
+            with self._condition:
+                self._in_progress = None
+                self._condition.notify_all()
+
+    def _is_writing(self, path: str) -> bool:
+        if path is None:
+            return len(self._pending) > 0 or self._in_progress is not None
+        if self._in_progress is not None and self._in_progress[0][0] == path:
+            return True
+        return any(pending_path == path for pending_path, _ in self._pending)
+
+    def flush(self, path: str = None):
+        with self._condition:
+            while self._is_writing(path):
+                self._condition.wait()
+            if path is None:
+                errors: List[Exception] = [error for errors in self._errors.values() for error in errors]
+                self._errors = {}
+            else:
+                errors = self._errors.pop(path, [])
+        if len(errors) > 0:
+            raise errors[0]
+
+
+_writer: _WriteBehindWriter = None
+_writer_lock: threading.Lock = threading.Lock()
+
+
+def _get_writer() -> _WriteBehindWriter:
+    global _writer  # pylint: disable=global-statement
+    with _writer_lock:
+        # writer thread doesn't survive fork, so each process needs its own one
+        if _writer is None or _writer._pid != os.getpid():
+            if _writer is None:
+                atexit.register(flush_stores)
+            _writer = _WriteBehindWriter()
+        return _writer
+
+
+def schedule_write(backend: StoreBackend, name: str, value: Any):
+    """Queues saving variable with given backend in background thread.
+
+    Args:
+        backend (StoreBackend): store backend
+        name (str): variable name
+        value (Any): variable value
+    """
+    _get_writer().schedule(backend, name, value)
+
+
+def get_pending_write(path: str, name: str) -> Any:
+    """Returns value of variable which is queued to be written or `_NOT_PENDING`.
+    """
+    if _writer is None or _writer._pid != os.getpid():
+        return _NOT_PENDING
+    return _writer.get_pending(path, name)
+
+
+def flush_stores(path: str = None):
+    """Blocks until variables queued by write-behind stores in current process are saved.
+    It's called automatically at the end of each paramset for its store.
+
+    Args:
+        path (str, optional): paramset store directory to flush. Defaults to None (all stores).
+
+    Raises:
+        Exception: first error raised while saving queued variables of flushed stores
+    """
+    if _writer is None or _writer._pid != os.getpid():
+        return
+    _writer.flush(path)
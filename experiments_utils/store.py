@@ -1,12 +1,63 @@
 import os
+import threading
+import weakref
+from contextlib import contextmanager
 from logging import getLogger
-from typing import Any
-
-import cloudpickle
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Union
 
 from experiments_utils import conf
 
 from .context import ExperimentContext
+from .storage.backends import StoreBackend, create_backend
+from .storage.cache import _MISSING, VariablesCache
+from .storage.codecs import Codec, get_codec
+from .storage.write_behind import (_NOT_PENDING, flush_stores,
+                                   get_pending_write, schedule_write)
+
+
+def get_cache_dir(current_dir: str) -> str:
+    """Returns path of the `_cache` directory containing stores of all
+    experiment versions and paramsets.
+
+    Args:
+        current_dir (str): current working directory of the experiment
+
+    Returns:
+        str: path of the cache directory
+    """
+    if conf.settings.EXPERIMENT_CACHE_DIR is None:
+        return f"{current_dir}/_cache"
+    return f"{conf.settings.EXPERIMENT_CACHE_DIR}/_cache"
+
+
+def get_store_path(context: ExperimentContext) -> str:
+    """Returns directory of store of the context paramset (`_cache/{version}/{paramset}`)"""
+    return f"{get_cache_dir(context.current_dir)}/{context.version}/{context.paramset_name}"
+
+
+# backends of stores created in current process by their paths, closed when paramset finishes
+_open_backends: Dict[str, weakref.WeakSet] = {}
+_open_backends_lock: threading.Lock = threading.Lock()
+
+
+def _register_backend(backend: StoreBackend):
+    with _open_backends_lock:
+        _open_backends.setdefault(backend.path, weakref.WeakSet()).add(backend)
+
+
+def close_stores(path: str):
+    """Closes backends (e.g. SQLite connections) of all stores of given paramset created
+    in current process. It's called automatically at the end of each paramset. Stores used
+    afterwards reopen their backends when needed.
+
+    Args:
+        path (str): paramset store directory
+    """
+    with _open_backends_lock:
+        backends: weakref.WeakSet = _open_backends.pop(path, None)
+    for backend in list(backends or ()):
+        backend.close()
 
 
 class Store(object):
@@ -38,25 +89,48 @@ class Store(object):
     s.model, s.training_time = train_my_mode()
     print(s.training_time) # 1
     ```
+
+    When `STORE_WRITE_BEHIND` setting is enabled, assignments return immediately and
+    values are saved by a background thread (latest value of repeatedly assigned variable
+    is saved only once). Pending writes are flushed at the end of each paramset or with
+    `experiments_utils.storage.write_behind.flush_stores()`. Assigned values should not
+    be mutated in place afterwards, as mutation may be saved as well.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        codec: Union[str, Codec] = None,
+        codecs: Dict[str, Union[str, Codec]] = None
+    ) -> None:
         """Constructor can only be used inside experiment or step functions.
         If you want to use Store outside experiment or step - use store_factory()
         function
+
+        Args:
+            codec (Union[str, Codec], optional): compression codec of pickled variables: "none",
+                "gzip" (or "zlib"), "lzma", "lz4" or "zstd". Default is `STORE_CODEC` setting.
+            codecs (Dict[str, Union[str, Codec]], optional): codecs of specific variables,
+                overriding `codec`. Defaults to None.
         """
-        context: ExperimentContext = ExperimentContext.__GLOBAL_CONTEXT__
-        object.__setattr__(self, "__variables__", {})
+        context: ExperimentContext = ExperimentContext.get_instance()
+        object.__setattr__(self, "__variables__", VariablesCache(conf.settings.STORE_CACHE_MAX_BYTES))
 
-        if conf.settings.EXPERIMENT_CACHE_DIR is None:
-            params_file_path = f"{context.current_dir}/_cache/{context.version}/{context.paramset_name}"
-        else:
-            params_file_path = f"{conf.settings.EXPERIMENT_CACHE_DIR}/_cache/{context.version}/{context.paramset_name}"
+        params_file_path = get_store_path(context)
         object.__setattr__(self, "__params_base_dir_path", params_file_path)
+        backend: StoreBackend = create_backend(params_file_path)
+        if codec is not None:
+            backend.codec = get_codec(codec)
+        backend.variable_codecs = {
+            name: get_codec(variable_codec) for name, variable_codec in (codecs or {}).items()
+        }
+        object.__setattr__(self, "__backend__", backend)
+        _register_backend(backend)
 
     def __getattribute__(self, name: str) -> Any:
         if name == "__variables__":
             return object.__getattribute__(self, "__variables__")
+        if name == "__backend__":
+            return object.__getattribute__(self, "__backend__")
         if name == "_Store__retrieve_variable":
             return object.__getattribute__(self, "_Store__retrieve_variable")
         if name == "_Store__save_variable":
@@ -76,30 +150,119 @@ class Store(object):
         self.__variables__[name] = value
 
     def __save_variable(self, name: str, value: Any):
-        os.makedirs(
-            object.__getattribute__(self, "__params_base_dir_path"), exist_ok=True
-        )
-        path = (
-            f'{object.__getattribute__(self, "__params_base_dir_path")}/{name}.pickle'
-        )
-        with open(path, "wb+") as params_file:
-            cloudpickle.dump(value, params_file)
+        backend: StoreBackend = self.__backend__
+        if conf.settings.STORE_WRITE_BEHIND and not backend.in_transaction:
+            schedule_write(backend, name, value)
+        else:
+            backend.save(name, value)
 
     def __retrieve_variable(self, name: str) -> Any:
         # try to retrieve from memory
-        if name in self.__variables__:
-            return self.__variables__[name]
-        var_file_path = (
-            f'{object.__getattribute__(self, "__params_base_dir_path")}/{name}.pickle'
-        )
-        if os.path.exists(var_file_path):
-            with open(var_file_path, "rb") as var_file:
-                value = cloudpickle.load(var_file)
-                # store in memory
-                self.__variables__[name] = value
-                return value
-        else:
-            raise NameError(f"name '{name}' is not defined")
+        value = self.__variables__.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        # variable may be assigned with other store instance and still waiting to be written
+        value = get_pending_write(self.__backend__.path, name)
+        if value is not _NOT_PENDING:
+            return value
+        try:
+            value = self.__backend__.load(name)
+        except KeyError:
+            raise NameError(f"name '{name}' is not defined") from None
+        # store in memory
+        self.__variables__[name] = value
+        return value
+
+
+@contextmanager
+def store_transaction(store: Store) -> Iterator[Store]:
+    """Groups multiple store writes, so that they are persisted together or not
+    at all if exception is raised inside `with` block.
+
+    Only SQLite backend (`STORE_BACKEND = "sqlite"`) commits them all-or-nothing also in case
+    of a crash. File backends hold writes back until the end of the block and replace each
+    file atomically, but process killed while files are being written leaves only some of
+    them updated.
+
+    Example:
+    ```python
+    from experiments_utils.store import store_transaction
+
+    s = Store()
+    with store_transaction(s):
+        s.model = model
+        s.scores = scores
+    ```
+
+    Args:
+        store (Store): store
+
+    Yields:
+        Store: the same store
+    """
+    variables: VariablesCache = object.__getattribute__(store, "__variables__")
+    previous_variables: OrderedDict = variables.snapshot()
+    # writes queued before transaction must not override values written inside it
+    flush_stores(object.__getattribute__(store, "__backend__").path)
+    try:
+        with object.__getattribute__(store, "__backend__").transaction():
+            yield store
+    except BaseException:
+        # values assigned inside failed transaction were not persisted
+        variables.restore(previous_variables)
+        raise
+
+
+def get_cache_stats(store: Store) -> Dict[str, int]:
+    """Returns statistics of store in-memory cache. Its size is limited with
+    `STORE_CACHE_MAX_BYTES` setting.
+
+    Args:
+        store (Store): store
+
+    Returns:
+        Dict[str, int]: cache hits, misses, evictions, number of cached variables and their estimated size
+    """
+    return object.__getattribute__(store, "__variables__").stats()
+
+
+def list_variables(store: Store) -> List[str]:
+    """
+    Args:
+        store (Store): store
+
+    Returns:
+        List[str]: names of all variables saved in store
+    """
+    return object.__getattribute__(store, "__backend__").list()
+
+
+def has_variable(store: Store, name: str) -> bool:
+    """
+    Args:
+        store (Store): store
+        name (str): variable name
+
+    Returns:
+        bool: whether variable is saved in store
+    """
+    return name in object.__getattribute__(store, "__variables__") or \
+        object.__getattribute__(store, "__backend__").exists(name)
+
+
+def delete_variable(store: Store, name: str):
+    """Removes variable from store.
+
+    Args:
+        store (Store): store
+        name (str): variable name
+    """
+    if isinstance(store, _ReadOnlyStore):
+        raise Exception("Store is read-only")
+    # queued write would otherwise restore deleted variable
+    flush_stores(object.__getattribute__(store, "__backend__").path)
+    object.__getattribute__(store, "__variables__").pop(name, None)
+    object.__getattribute__(store, "__backend__").delete(name)
 
 
 class _ReadOnlyStore(Store):
@@ -11,4 +11,9 @@ setup(
         'multiprocess==0.70.13',
         'dill==0.3.8',
     ],
+    entry_points={
+        'console_scripts': [
+            'experiments-cache=experiments_utils.storage.cache_gc:main',
+        ],
+    },
 )
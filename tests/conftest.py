@@ -0,0 +1,35 @@
+import logging
+
+import pytest
+
+from experiments_utils import conf, settings
+from experiments_utils.context import ExperimentContext
+
+
+@pytest.fixture(autouse=True)
+def experiment_settings():
+    """Sets default settings module, as done by `Experiment.run`"""
+    previous_settings = conf.settings
+    conf.settings = settings
+    yield settings
+    conf.settings = previous_settings
+
+
+@pytest.fixture
+def paramset_context(tmp_path):
+    """Sets context of paramset "p0" of experiment located in temporary directory, so that
+    stores could be created like inside experiment function.
+    """
+    context = ExperimentContext(
+        name='experiment',
+        paramsets_names=['p0'],
+        paramset_name='p0',
+        current_dir=str(tmp_path),
+        version='1',
+        logs_dir=str(tmp_path / 'logs'),
+        logger=logging.getLogger('experiment'),
+    )
+    previous_context = ExperimentContext.__GLOBAL_CONTEXT__
+    ExperimentContext.__GLOBAL_CONTEXT__ = context
+    yield context
+    ExperimentContext.__GLOBAL_CONTEXT__ = previous_context
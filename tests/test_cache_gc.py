@@ -0,0 +1,60 @@
+import os
+
+from experiments_utils.storage.cache_gc import CacheManager
+from experiments_utils.storage.usage import get_usage_dir
+from experiments_utils.store import Store, get_cache_dir
+
+
+def test_usage_is_not_logged_by_default(paramset_context):
+    cache_dir = get_cache_dir(paramset_context.current_dir)
+    store = Store()
+    store.scores = [1, 2, 3]
+    store.scores
+
+    assert not os.path.exists(get_usage_dir(cache_dir))
+
+
+def test_usage_without_tracking_reflects_current_files(paramset_context):
+    manager = CacheManager(get_cache_dir(paramset_context.current_dir))
+    store = Store()
+    store.scores = [1, 2, 3]
+    assert [row['variables'] for row in manager.usage()] == [1]
+
+    store.model = 'model'
+
+    assert [row['variables'] for row in manager.usage()] == [2]
+
+
+def test_tracking_logs_store_operations(paramset_context, experiment_settings, monkeypatch):
+    monkeypatch.setattr(experiment_settings, 'CACHE_USAGE_TRACKING', True)
+    manager = CacheManager(get_cache_dir(paramset_context.current_dir))
+    store = Store()
+    store.scores = [1, 2, 3]
+    created = manager.usage()[0]['last_access']
+
+    store.scores
+
+    assert os.listdir(get_usage_dir(manager.cache_dir))
+    assert manager.usage()[0]['last_access'] >= created
+    removed = manager.prune(quota_bytes=0)
+    assert [row['paramset_name'] for row in removed] == ['p0']
+    assert manager.usage() == []
+
+
+def test_quota_enables_tracking_without_rescanning(paramset_context, experiment_settings, monkeypatch):
+    monkeypatch.setattr(experiment_settings, 'CACHE_QUOTA_BYTES', 1024 ** 3)
+    manager = CacheManager(get_cache_dir(paramset_context.current_dir))
+    store = Store()
+    store.scores = [1, 2, 3]
+    assert [row['variables'] for row in manager.usage()] == [1]
+    scans = []
+    original_scan = CacheManager._scan
+    monkeypatch.setattr(CacheManager, '_scan', lambda self: scans.append(1) or original_scan(self))
+
+    store.model = 'model'
+
+    assert [row['variables'] for row in manager.usage()] == [2]
+    assert manager.prune() == []
+    assert scans == []
+    manager.consolidate(rescan=True)
+    assert scans == [1]
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from experiments_utils.checkpoint import CHECKPOINT_PREFIX, StepCheckpoint
+from experiments_utils.context import ExperimentContext
+from experiments_utils.events.emitter import EventEmitter
+from experiments_utils.step import Step
+from experiments_utils.store import get_store_path
+
+
+@pytest.fixture
+def step_context(paramset_context, monkeypatch):
+    monkeypatch.setattr(
+        ExperimentContext, '__EVENT_EMITTER__', EventEmitter(event_queue=None, subscribed_event_types=frozenset()))
+    return paramset_context
+
+
+def list_checkpoint_parts(context):
+    checkpoint = StepCheckpoint(get_store_path(context), 'parts')
+    try:
+        return [name for name in checkpoint._backend.list() if name.startswith(CHECKPOINT_PREFIX)]
+    finally:
+        checkpoint.close()
+
+
+def test_failed_step_is_resumed_from_checkpoint(step_context):
+    started_epochs = []
+
+    def train(epochs: int, fail_at: int = None):
+        checkpoint = train_step.checkpoint()
+        state = checkpoint.state or {'epoch': 0, 'weights': np.zeros(4)}
+        started_epochs.append(state['epoch'])
+        for epoch in range(state['epoch'], epochs):
+            if epoch == fail_at:
+                raise RuntimeError('failed')
+            state['weights'][epoch] += 1
+            state['epoch'] = epoch + 1
+            # previous checkpoint would be skipped if it's still being written
+            checkpoint.save(state, force=True)
+        return state['weights']
+
+    train_step = Step(train, 'train')
+    with pytest.raises(RuntimeError):
+        train_step(4, fail_at=2)
+
+    assert train_step(4).tolist() == [1, 1, 1, 1]
+    assert started_epochs == [0, 2]
+    assert list_checkpoint_parts(step_context) == []
+
+
+def test_only_changed_array_chunks_are_written(step_context, experiment_settings, monkeypatch):
+    monkeypatch.setattr(experiment_settings, 'STEP_CHECKPOINT_CHUNK_BYTES', 80)
+    checkpoint = StepCheckpoint(get_store_path(step_context), 'train')
+    saved_names = []
+    save = checkpoint._backend.save
+    monkeypatch.setattr(checkpoint._backend, 'save', lambda name, value: saved_names.append(name) or save(name, value))
+    state = {'weights': np.zeros((10, 10))}
+    checkpoint.save(state)
+    checkpoint.wait()
+    saved_names.clear()
+
+    state['weights'][3] = 1
+    checkpoint.save(state)
+    checkpoint.close()
+
+    # single changed chunk and manifest
+    assert len(saved_names) == 2
+    restored = StepCheckpoint(get_store_path(step_context), 'train')
+    assert restored.restored and restored.iteration == 2
+    np.testing.assert_array_equal(restored.state['weights'], state['weights'])
+    restored.close()
+
+
+def test_incomplete_checkpoint_is_not_restored(step_context):
+    checkpoint = StepCheckpoint(get_store_path(step_context), 'train')
+    checkpoint.save({'epoch': 1, 'weights': np.ones(3)})
+    checkpoint.close()
+    part = next(iter(checkpoint._parts))
+    checkpoint._backend.delete(checkpoint._part_name(part))
+
+    restored = StepCheckpoint(get_store_path(step_context), 'train')
+
+    assert not restored.restored and restored.state is None
+    restored.close()
+
+
+def test_clear_keeps_checkpoints_of_steps_sharing_prefix(step_context):
+    checkpoint = StepCheckpoint(get_store_path(step_context), 'train')
+    other_checkpoint = StepCheckpoint(get_store_path(step_context), 'train__x')
+    checkpoint.save({'epoch': 1})
+    other_checkpoint.save({'epoch': 2})
+    other_checkpoint.close()
+
+    checkpoint.clear()
+    checkpoint.close()
+
+    restored = StepCheckpoint(get_store_path(step_context), 'train__x')
+    assert restored.restored and restored.state == {'epoch': 2}
+    restored.close()
@@ -0,0 +1,96 @@
+import logging
+import pickle
+import time
+
+from experiments_utils.events import (EventTypes, ExperimentEvent, ParamsetStartEvent,
+                                      ParamsetSuccessEvent, StepStartEvent)
+from experiments_utils.events.handler import EventHandler
+from experiments_utils.experiment import Experiment
+from experiments_utils.pool import WorkerPool
+from experiments_utils.step import Step
+
+
+class CustomEvent(ExperimentEvent):
+    """Event subclass without `__slots__`, keeping its attributes in `__dict__`"""
+
+    def __init__(self, experiment_name: str, payload: dict) -> None:
+        super().__init__('CUSTOM_EVENT', experiment_name)
+        self.payload = payload
+
+
+def test_pickled_event_keeps_slots_values():
+    event = StepStartEvent('experiment', 'paramset', 'step', event_type=EventTypes.STEP_START.value)
+
+    restored = pickle.loads(pickle.dumps(event))
+
+    assert restored.experiment_name == 'experiment'
+    assert restored.paramset_name == 'paramset'
+    assert restored.step_name == 'step'
+    assert restored.event_type == EventTypes.STEP_START.value
+    assert restored.timestamp_ns == event.timestamp_ns
+
+
+def test_pickled_event_keeps_subclass_attributes():
+    event = CustomEvent('experiment', {'accuracy': 0.9})
+
+    restored = pickle.loads(pickle.dumps(event))
+
+    assert restored.event_type == 'CUSTOM_EVENT'
+    assert restored.experiment_name == 'experiment'
+    assert restored.payload == {'accuracy': 0.9}
+
+
+def test_offloaded_listener_keeps_order_across_event_types():
+    handler = EventHandler(logging.getLogger('test'))
+    received = []
+
+    def listener(event):
+        # slow listener, so that later events are queued while it's running
+        time.sleep(0.001)
+        received.append((event.event_type, event.paramset_name))
+
+    handler.add_event_listener(EventTypes.EXPERIMENT_PARAMSET_START, listener, offload=True)
+    handler.add_event_listener(EventTypes.EXPERIMENT_PARAMSET_SUCCESS, listener, offload=True)
+    expected = []
+    for i in range(20):
+        paramset_name = f'p{i}'
+        handler._handle_event(ParamsetStartEvent('experiment', paramset_name))
+        handler._handle_event(ParamsetSuccessEvent('experiment', paramset_name, result=i))
+        expected += [
+            (EventTypes.EXPERIMENT_PARAMSET_START.value, paramset_name),
+            (EventTypes.EXPERIMENT_PARAMSET_SUCCESS.value, paramset_name),
+        ]
+    handler.wait_for_offloaded_listeners()
+
+    assert received == expected
+
+
+def test_step_events_of_paramsets_running_in_threads_are_delivered(tmp_path, experiment_settings, monkeypatch):
+    monkeypatch.setattr(experiment_settings, 'EVENTS_BATCH_SIZE', 64)
+    monkeypatch.setattr(experiment_settings, 'EVENTS_FLUSH_INTERVAL', 1.0)
+
+    def evaluate(delay: float):
+        time.sleep(delay)
+
+    evaluate_step = Step(evaluate, 'evaluate')
+
+    def run_paramset(delay: float):
+        # paramsets started later replace emitter of the earlier ones if it's shared
+        evaluate_step(delay)
+
+    experiment = Experiment(
+        run_paramset,
+        name='threads_experiment',
+        paramsets=[(f'p{i}', {'delay': 0.05 * (5 - i)}) for i in range(5)],
+        _file_=str(tmp_path / 'experiment.py'),
+        pool=WorkerPool(n_jobs=5, use_threads=True),
+    )
+    steps_paramsets = []
+    experiment.add_event_listener(
+        EventTypes.STEP_SUCCESS, lambda event: steps_paramsets.append(event.paramset_name))
+    try:
+        experiment.run()
+    finally:
+        experiment.pool.close()
+
+    assert sorted(steps_paramsets) == [f"p{i}" for i in range(5)]
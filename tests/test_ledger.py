@@ -0,0 +1,47 @@
+import os
+import sys
+import threading
+
+from experiments_utils.events import ParamsetSuccessEvent
+from experiments_utils.experiment import Experiment
+from experiments_utils.ledger import RunLedger
+from experiments_utils.pool import WorkerPool
+from experiments_utils.state import ExperimentState
+from experiments_utils.store import get_cache_dir
+
+
+def square(x: int):
+    return x * x
+
+
+def test_ledger_is_written_only_by_resumed_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, 'stdout', sys.__stdout__)
+    experiment = Experiment(
+        square,
+        name='ledger_experiment',
+        paramsets=[('p0', {'x': 2})],
+        _file_=str(tmp_path / 'experiment.py'),
+        version='1',
+        pool=WorkerPool(n_jobs=1, use_threads=True),
+    )
+    ledger_path = os.path.join(get_cache_dir(experiment.dir_path), '1', RunLedger.FILE_NAME)
+    try:
+        assert experiment.run() == {'p0': 4}
+        assert not os.path.exists(ledger_path)
+
+        assert experiment.run(resume=True) == {'p0': 4}
+        assert os.path.exists(ledger_path)
+    finally:
+        experiment.pool.close()
+
+
+def test_unpicklable_result_is_recorded_without_result(tmp_path, paramset_context):
+    state = ExperimentState('experiment', '1', ['p0'])
+    ledger = RunLedger(str(tmp_path), '1')
+
+    ledger.record_success(
+        state.get_paramset_state('p0'), ParamsetSuccessEvent('experiment', 'p0', result=threading.Lock()))
+
+    assert list(ledger.completed_paramsets()) == ['p0']
+    restored_state = ExperimentState('experiment', '1', ['p0'])
+    assert ledger.restore(restored_state, ['p0']) == {'p0': None}
@@ -0,0 +1,38 @@
+import pytest
+
+from experiments_utils.context import ExperimentContext
+from experiments_utils.storage.query import StoreQuery
+from experiments_utils.store import Store
+
+
+@pytest.fixture
+def stores(paramset_context):
+    """Stores of 4 paramsets, only even ones having "loss" variable"""
+    for i in range(4):
+        ExperimentContext.__GLOBAL_CONTEXT__._paramset_name = f'p{i}'
+        store = Store()
+        store.accuracy = i / 10
+        if i % 2 == 0:
+            store.loss = i
+    return paramset_context.current_dir
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_load_skips_paramsets_without_variable(stores, use_processes):
+    query = StoreQuery(stores, n_jobs=2, use_processes=use_processes)
+
+    assert query.load('1', 'accuracy') == {'p0': 0.0, 'p1': 0.1, 'p2': 0.2, 'p3': 0.3}
+    assert query.load('1', 'loss') == {'p0': 0, 'p2': 2}
+    assert query.load('1', 'loss', default=None) == {'p0': 0, 'p1': None, 'p2': 2, 'p3': None}
+    assert query.load('1', 'loss', paramsets='p[12]') == {'p2': 2}
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_load_frame_has_nan_for_missing_variables(stores, use_processes):
+    query = StoreQuery(stores, n_jobs=2, use_processes=use_processes)
+
+    df = query.load_frame('1', ['accuracy', 'loss'])
+
+    assert list(df.index) == ['p0', 'p1', 'p2', 'p3']
+    assert df['accuracy'].tolist() == [0.0, 0.1, 0.2, 0.3]
+    assert df['loss'].isna().tolist() == [False, True, False, True]
@@ -0,0 +1,23 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+from experiments_utils.helpers.shared_memory import MEMMAP, SHARED_MEMORY, SharedArray, SharedData
+
+
+@pytest.mark.parametrize('backend', [SHARED_MEMORY, MEMMAP])
+def test_dataframe_round_trip_keeps_extension_dtypes(backend):
+    df = pd.DataFrame({
+        'value': [1.5, 2.5, 3.5],
+        'label': pd.Categorical(['a', 'b', 'a']),
+        'count': pd.array([1, None, 3], dtype='Int64'),
+        'time': pd.date_range('2024-01-01', periods=3, tz='Europe/Warsaw'),
+    }, index=pd.Index([10, 20, 30], name='id'))
+
+    with SharedData(backend=backend) as shared:
+        handle = pickle.loads(pickle.dumps(shared.share(df)))
+        assert isinstance(handle.columns['value'], SharedArray)
+        result = handle.get()
+
+        pd.testing.assert_frame_equal(result, df)
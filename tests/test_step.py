@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+from experiments_utils.step import Step
+
+CACHE_KEY_SCRIPT = '''
+import sys
+sys.path.insert(0, {root!r})
+from experiments_utils.step import Step
+
+def train(features, params):
+    return None
+
+step = Step(train, 'train', cache=True)
+print(step._get_cache_key({{'sepal', 'petal', 'width', 'length'}}, params={{'tags': frozenset('abcdef')}}))
+'''
+
+
+def _get_cache_key_in_new_process(hash_seed: int) -> str:
+    root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output: bytes = subprocess.check_output(
+        [sys.executable, '-c', CACHE_KEY_SCRIPT.format(root=root)],
+        env={**os.environ, 'PYTHONHASHSEED': str(hash_seed)}
+    )
+    return output.decode('utf-8').strip()
+
+
+def test_cache_key_is_the_same_in_each_process():
+    keys = {_get_cache_key_in_new_process(hash_seed) for hash_seed in range(5)}
+
+    assert len(keys) == 1
+    assert keys.pop().startswith('__step__train__')
+
+
+def test_cache_key_depends_on_arguments():
+    def train(features):
+        return None
+
+    step = Step(train, 'train', cache=True)
+
+    assert step._get_cache_key({'a', 'b'}) == step._get_cache_key({'b', 'a'})
+    assert step._get_cache_key({'a', 'b'}) != step._get_cache_key({'a', 'c'})
+    assert step._get_cache_key({'a', 'b'}) != step._get_cache_key(('set', ('a', 'b')))
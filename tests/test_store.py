@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from experiments_utils.storage.backends import PickleFilesBackend, SQLiteBackend
+from experiments_utils.store import Store, close_stores, get_store_path, store_transaction
+
+
+@pytest.fixture
+def sqlite_backend(experiment_settings, monkeypatch):
+    monkeypatch.setattr(experiment_settings, 'STORE_BACKEND', 'sqlite')
+
+
+def test_close_stores_closes_sqlite_connections(paramset_context, sqlite_backend):
+    store = Store()
+    store.accuracy = 0.9
+    backend = object.__getattribute__(store, '__backend__')
+    assert backend._connection is not None
+
+    close_stores(get_store_path(paramset_context))
+
+    assert backend._connection is None
+    # closed store reopens its backend when used again
+    assert Store().accuracy == 0.9
+
+
+@pytest.mark.parametrize('backend_name', ['pickle', 'sqlite', 'blobs'])
+def test_failed_transaction_persists_nothing(paramset_context, experiment_settings, monkeypatch, backend_name):
+    monkeypatch.setattr(experiment_settings, 'STORE_BACKEND', backend_name)
+    store = Store()
+    store.model = 'old model'
+
+    with pytest.raises(RuntimeError):
+        with store_transaction(store):
+            store.model = 'new model'
+            store.scores = [1, 2, 3]
+            raise RuntimeError('failed')
+
+    other_store = Store()
+    assert other_store.model == 'old model'
+    with pytest.raises(NameError):
+        other_store.scores
+
+
+def test_arrays_are_loaded_writable_by_default(paramset_context):
+    np = pytest.importorskip('numpy')
+    Store().weights = np.zeros((512, 512))
+
+    weights = Store().weights
+    weights[0, 0] = 1.0
+
+    assert weights.flags.writeable
+
+
+def test_large_arrays_are_memory_mapped_when_enabled(paramset_context, experiment_settings, monkeypatch):
+    np = pytest.importorskip('numpy')
+    monkeypatch.setattr(experiment_settings, 'STORE_MEMMAP_MIN_BYTES', 1024)
+    Store().weights = np.arange(1024, dtype='float64')
+
+    weights = Store().weights
+
+    assert isinstance(weights, np.memmap)
+    assert not weights.flags.writeable
+    assert np.array_equal(weights, np.arange(1024, dtype='float64'))
+
+
+def test_pickle_backend_sees_variables_changed_by_other_backend(tmp_path):
+    path = str(tmp_path / 'p0')
+    backend = PickleFilesBackend(path)
+    other_backend = PickleFilesBackend(path)
+    assert not backend.exists('model')
+
+    other_backend.save('model', 'model')
+
+    assert backend.exists('model')
+    assert backend.load('model') == 'model'
+    other_backend.delete('model')
+    with pytest.raises(KeyError):
+        backend.load('model')
+
+
+def test_sqlite_transaction_is_not_joined_by_other_threads(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'p0'))
+    writer = threading.Thread(target=backend.save, args=('other', 'value'))
+
+    with pytest.raises(RuntimeError):
+        with backend.transaction():
+            backend.save('model', 'model')
+            writer.start()
+            # writer would save its variable inside this transaction if it was not blocked
+            time.sleep(0.1)
+            raise RuntimeError('failed')
+    writer.join()
+
+    assert backend.list() == ['other']
+    backend.close()
@@ -0,0 +1,293 @@
+import gc
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.api.types import is_numeric_dtype
+
+from experiments_utils.experiment import Experiment
+from experiments_utils.pool import WorkerPool
+from experiments_utils.results import tables as tables_module
+from experiments_utils.results.formats import CsvFormat, get_format
+from experiments_utils.results.tables import Tables, mean_aggregate_tables
+
+
+@pytest.fixture
+def tables_dir(tmp_path):
+    def configure(**kwargs):
+        Tables.configure(str(tmp_path), **kwargs)
+        return tmp_path
+    yield configure
+    tables_module.flush_tables()
+    Tables.configure(str(tmp_path))
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read().splitlines()
+
+
+def test_append_writes_header_once_and_rows_in_batches(tables_dir):
+    directory = tables_dir(append_batch_size=2)
+    table = Tables.get('results')
+
+    table.append({'fold': 0, 'accuracy': 0.5})
+    # placeholder of empty table
+    assert read_lines(directory / 'results.csv') == ['']
+    table.append({'fold': 1, 'accuracy': 0.75})
+    table.append({'fold': 2})
+    table.flush()
+
+    assert read_lines(directory / 'results.csv') == ['fold,accuracy', '0,0.5', '1,0.75', '2,']
+    assert Tables.get('results').as_pandas()['fold'].tolist() == [0, 1, 2]
+
+
+def test_append_rejects_unknown_columns(tables_dir):
+    tables_dir()
+    table = Tables.get('results')
+    table.append({'fold': 0})
+
+    with pytest.raises(ValueError):
+        table.append({'fold': 1, 'accuracy': 0.5})
+
+
+def test_rows_of_discarded_tables_are_not_lost(tables_dir):
+    directory = tables_dir(append_batch_size=10)
+
+    for i in range(3):
+        Tables.get('results').append({'fold': i})
+    gc.collect()
+    tables_module.flush_tables()
+
+    assert read_lines(directory / 'results.csv') == ['fold', '0', '1', '2']
+
+
+def test_appended_values_are_not_truncated_to_column_dtype(tables_dir):
+    tables_dir(storage_format='npz')
+    table = Tables.get('results')
+    table.set_df(pd.DataFrame({'a': [1, 2]}))
+
+    table.append({'a': 0.75}, flush=True)
+
+    assert table.as_pandas()['a'].tolist() == [1, 2, 0.75]
+    assert Tables.get('results').as_pandas()['a'].tolist() == [1, 2, 0.75]
+
+
+def test_edited_rows_are_not_truncated_to_column_dtype(tables_dir):
+    tables_dir()
+    table = Tables.get('results')
+    table.set_df(pd.DataFrame({'a': [1, 2]}))
+
+    table.rows[0]['a'] = 2.5
+
+    assert table.as_pandas()['a'].tolist() == [2.5, 2]
+
+
+def test_dtypes_are_restored_when_values_fit(tables_dir):
+    tables_dir(storage_format='npz')
+    table = Tables.get('results')
+    table.set_df(pd.DataFrame({
+        'a': np.array([1, 2], dtype=np.int32),
+        'b': pd.Series([1, None], dtype='Int64'),
+        'c': pd.Categorical(['x', 'y']),
+    }))
+
+    table.append({'a': 3, 'b': None, 'c': 'x'}, flush=True)
+    table.append({'a': 4, 'b': 5, 'c': 'z'}, flush=True)
+
+    df = Tables.get('results').as_pandas()
+    assert df['a'].dtype == np.int32
+    assert df['b'].dtype == 'Int64'
+    assert df['b'].isna().tolist() == [False, True, True, False]
+    # new category can't be restored without losing value
+    assert df['c'].tolist() == ['x', 'y', 'x', 'z']
+
+
+@pytest.mark.skipif(int(pd.__version__.split('.')[0]) < 3, reason='copy-on-write is optional before pandas 3.0')
+def test_as_pandas_changes_are_not_visible_in_table(tables_dir):
+    tables_dir()
+    table = Tables.get('results')
+    table.set_df(pd.DataFrame({'a': [1, 2]}))
+
+    df = table.as_pandas()
+    df.loc[0, 'a'] = 10
+    df['a'] *= 2
+
+    assert table.as_pandas()['a'].tolist() == [1, 2]
+
+
+def append_fold_row(fold: int):
+    Tables.get('folds').append({'fold': fold})
+
+
+def test_rows_appended_in_pool_workers_are_written_after_paramset(tables_dir, monkeypatch):
+    # experiment logger writing to pytest capture stream couldn't be sent to workers
+    monkeypatch.setattr(sys, 'stdout', sys.__stdout__)
+    directory = tables_dir(append_batch_size=100, multi_writer=True)
+    experiment = Experiment(
+        append_fold_row,
+        name='tables_experiment',
+        paramsets=[(f'fold_{fold}', {'fold': fold}) for fold in range(4)],
+        _file_=str(directory / 'experiment.py'),
+        n_jobs=2,
+        pool=WorkerPool(n_jobs=2, use_threads=False),
+    )
+    try:
+        experiment.run()
+    finally:
+        experiment.pool.close()
+
+    assert sorted(Tables.get('folds').as_pandas()['fold'].tolist()) == [0, 1, 2, 3]
+
+
+def test_each_shard_batch_is_complete_file(tables_dir):
+    directory = tables_dir(multi_writer=True)
+    table = Tables.get('results')
+
+    table.append({'fold': 0, 'accuracy': 0.5})
+    table.append({'fold': 1, 'accuracy': 0.75})
+
+    shards = sorted((directory / 'results.shards').iterdir())
+    assert [read_lines(shard) for shard in shards] == [['fold,accuracy', '0,0.5'], ['fold,accuracy', '1,0.75']]
+
+
+@pytest.mark.parametrize('storage_format', ['csv', 'npz'])
+def test_compact_keeps_rows_of_running_writers(tables_dir, storage_format):
+    directory = tables_dir(multi_writer=True, storage_format=storage_format)
+    writer = Tables.get('results')
+    writer.append({'fold': 0})
+
+    Tables.get('results').compact()
+    writer.append({'fold': 1})
+
+    assert len(list((directory / 'results.shards').iterdir())) == 1
+    assert Tables.get('results').as_pandas()['fold'].tolist() == [0, 1]
+
+
+def test_save_keeps_shards_written_after_table_was_loaded(tables_dir):
+    directory = tables_dir(multi_writer=True)
+    Tables.get('results').append({'fold': 0})
+    table = Tables.get('results')
+    assert table.as_pandas()['fold'].tolist() == [0]
+    Tables.get('results').append({'fold': 1})
+
+    table.set_df(pd.DataFrame({'fold': [10]}))
+
+    assert read_lines(directory / 'results.csv') == ['fold', '10']
+    assert Tables.get('results').as_pandas()['fold'].tolist() == [10, 1]
+
+
+def reference_mean_aggregate(frames, cv_fold_column):
+    df = pd.concat(frames).reset_index(drop=True)
+    aggregated = {
+        column: df[column].mean() if is_numeric_dtype(df[column]) else df[column].mode()[0]
+        for column in df.columns if column != cv_fold_column
+    }
+    agg_df = pd.DataFrame(pd.Series(aggregated)).T.reset_index(drop=True)
+    for column in df.select_dtypes(include=[np.number]):
+        agg_df[f'{column} (std)'] = df[column].std()
+    return agg_df
+
+
+@pytest.mark.parametrize('storage_format', ['csv', 'npz'])
+def test_mean_aggregate_tables_reads_tables_one_at_a_time(tables_dir, storage_format):
+    directory = tables_dir(storage_format=storage_format)
+    frames = [
+        pd.DataFrame({
+            'fold': [0, 1, 2],
+            'accuracy': [0.5, 0.75, np.nan],
+            'model': ['svm', 'svm', 'knn'],
+            'passed': [True, False, True],
+            'early_stopped': [False, False, True],
+        }),
+        pd.DataFrame({
+            'fold': [0, 1],
+            'accuracy': [1.0, 0.25],
+            'model': ['knn', 'knn'],
+            'passed': [True, True],
+        }),
+    ]
+    for i, df in enumerate(frames):
+        Tables.get('runs', f'run_{i}').set_df(df)
+    expected = reference_mean_aggregate(frames, cv_fold_column='fold')
+
+    tables = Tables.query('runs', 'run_*')
+    result = Tables.get('aggregated')
+    mean_aggregate_tables(tables, result, cv_fold_column='fold', add_std_columns=True)
+    paths_result = Tables.get('aggregated_paths')
+    mean_aggregate_tables(
+        sorted(str(path) for path in (directory / 'runs').iterdir()), paths_result,
+        cv_fold_column='fold', add_std_columns=True)
+
+    assert not any(table._loaded for table in tables)
+    for aggregated in (result.as_pandas(), paths_result.as_pandas()):
+        assert aggregated.columns.tolist() == expected.columns.tolist()
+        assert aggregated.iloc[0].tolist() == pytest.approx(expected.iloc[0].tolist(), nan_ok=True)
+
+
+def test_append_reads_only_header_of_existing_table(tables_dir, monkeypatch):
+    directory = tables_dir()
+    Tables.get('results').set_df(pd.DataFrame({'fold': range(100), 'accuracy': 0.5}))
+    reads = []
+    read = CsvFormat.read
+    monkeypatch.setattr(CsvFormat, 'read', lambda self, path: reads.append(path) or read(self, path))
+
+    for fold in range(100, 103):
+        Tables.get('results').append({'fold': fold, 'accuracy': 0.75})
+    with pytest.raises(ValueError):
+        Tables.get('results').append({'fold': 103, 'loss': 0.1})
+    tables_module.flush_tables()
+
+    assert reads == []
+    assert read_lines(directory / 'results.csv')[-3:] == ['100,0.75', '101,0.75', '102,0.75']
+    table = Tables.get('results')
+    table.append({'fold': 103, 'accuracy': 1.0})
+    assert table.as_pandas()['fold'].tolist() == list(range(104))
+
+
+@pytest.mark.parametrize('storage_format', ['csv', 'npz'])
+def test_multi_writer_append_only_writes_new_shard(tables_dir, monkeypatch, storage_format):
+    tables_dir(multi_writer=True, storage_format=storage_format)
+    table_format = type(get_format(storage_format))
+    reads = []
+    read = table_format.read
+    monkeypatch.setattr(table_format, 'read', lambda self, path: reads.append(path) or read(self, path))
+
+    for fold in range(20):
+        Tables.get('results').append({'fold': fold})
+    with pytest.raises(ValueError):
+        Tables.get('results').append({'loss': 0.1})
+
+    assert reads == []
+    assert Tables.get('results').as_pandas()['fold'].tolist() == list(range(20))
+
+
+def test_flush_tables_while_threads_append(tables_dir):
+    tables_dir(append_batch_size=7, multi_writer=True)
+    stop = threading.Event()
+
+    def append_rows(thread: int):
+        table = Tables.get('results')
+        for i in range(200):
+            table.append({'thread': thread, 'i': i})
+
+    def flush_repeatedly():
+        while not stop.is_set():
+            tables_module.flush_tables()
+
+    flusher = threading.Thread(target=flush_repeatedly)
+    flusher.start()
+    appenders = [threading.Thread(target=append_rows, args=(thread,)) for thread in range(8)]
+    for appender in appenders:
+        appender.start()
+    for appender in appenders:
+        appender.join()
+    stop.set()
+    flusher.join()
+    tables_module.flush_tables()
+
+    df = Tables.get('results').as_pandas()
+    assert len(df) == 8 * 200
+    assert not df.duplicated().any()
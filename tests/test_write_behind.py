@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from experiments_utils.storage.backends import StoreBackend
+from experiments_utils.storage.write_behind import (_NOT_PENDING, flush_stores, get_pending_write,
+                                                    schedule_write)
+from experiments_utils.store import Store
+
+
+class MemoryBackend(StoreBackend):
+
+    def __init__(self, path: str, error: Exception = None, release: threading.Event = None) -> None:
+        super().__init__(path)
+        self.values = {}
+        self._error = error
+        self._release = release
+
+    def save(self, name, value):
+        if self._release is not None:
+            self._release.wait()
+        if self._error is not None:
+            raise self._error
+        self.values[name] = value
+
+
+def test_flush_raises_only_errors_of_flushed_store():
+    failing_backend = MemoryBackend('/cache/1/failing', error=OSError('disk full'))
+    backend = MemoryBackend('/cache/1/working')
+    schedule_write(failing_backend, 'model', 1)
+    schedule_write(backend, 'model', 2)
+
+    flush_stores(backend.path)
+    assert backend.values == {'model': 2}
+    with pytest.raises(OSError, match='disk full'):
+        flush_stores(failing_backend.path)
+    # error is raised only once
+    flush_stores(failing_backend.path)
+
+
+def test_flush_waits_only_for_writes_of_flushed_store():
+    release = threading.Event()
+    blocked_backend = MemoryBackend('/cache/1/blocked', release=release)
+    backend = MemoryBackend('/cache/1/working')
+    schedule_write(backend, 'scores', [1, 2])
+    schedule_write(blocked_backend, 'model', 'model')
+    try:
+        flush_stores(backend.path)
+        assert backend.values == {'scores': [1, 2]}
+        assert get_pending_write(blocked_backend.path, 'model') == 'model'
+    finally:
+        release.set()
+    flush_stores()
+    assert blocked_backend.values == {'model': 'model'}
+    assert get_pending_write(blocked_backend.path, 'model') is _NOT_PENDING
+
+
+def test_write_behind_store_reads_pending_values(paramset_context, experiment_settings, monkeypatch):
+    monkeypatch.setattr(experiment_settings, 'STORE_WRITE_BEHIND', True)
+    store = Store()
+    for epoch in range(10):
+        store.epoch = epoch
+
+    assert Store().epoch == 9
+    flush_stores()
+    monkeypatch.setattr(experiment_settings, 'STORE_WRITE_BEHIND', False)
+    assert Store().epoch == 9